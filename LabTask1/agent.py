@@ -1,17 +1,24 @@
+from world import AgentWorld
+
+
 class Agent:
-    def __init__(self, environment):
+    """One agent of an AgentWorld; on its own it gets a world of one."""
+
+    def __init__(self, environment, world=None, index=0):
         self.environment = environment
-        self.position = [0, 0] 
-    def move(self, direction): 
-        if direction == "up":
-            self.position[1] += 10
-        elif direction == "down":
-            self.position[1] -= 10
-        elif direction == "left":
-            self.position[0] -= 10
-        elif direction == "right":
-            self.position[0] += 10
+        self.world = world if world is not None else AgentWorld(environment, 1)
+        self.index = index
+
+    @property
+    def position(self):
+        return self.world.positions[self.index]
+
+    @position.setter
+    def position(self, position):
+        self.world.positions[self.index] = position
+
+    def move(self, direction):
+        self.world.move_one(self.index, direction)
 
-        self.position = self.environment.limit_position(self.position)
     def status(self):
-        return self.position
\ No newline at end of file
+        return self.position.tolist()
@@ -0,0 +1,98 @@
+# bench.py
+import os
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")  # Never open a window
+
+import argparse
+import time
+import numpy as np
+import pygame
+from agent import Agent
+from environment import Environment
+from world import DIRECTIONS, AgentWorld, WorldRenderer
+
+
+def per_agent_tick(agents, directions):
+    """Reference tick: one Python-level move per agent."""
+    for agent, direction in zip(agents, directions):
+        agent.move(DIRECTIONS[direction])
+
+
+def bench_ticks(args):
+    """Compare agents moved per second by separate Agent objects and by one AgentWorld."""
+    env = Environment(args.width, args.height)
+    rng = np.random.default_rng(args.seed)
+    print(f"{'agents':>8} {'engine':>7} {'tick (ms)':>10} {'agents/s':>12}")
+    for count in args.agents:
+        directions = rng.integers(len(DIRECTIONS), size=(args.ticks, count))
+        world = AgentWorld(env, count)
+        start = time.perf_counter()
+        for tick in range(args.ticks):
+            world.move(directions[tick])
+        batched = (time.perf_counter() - start) / args.ticks
+        if count <= args.loop_limit:
+            agents = [Agent(env) for _ in range(count)]
+            start = time.perf_counter()
+            for tick in range(args.ticks):
+                per_agent_tick(agents, directions[tick].tolist())
+            looped = (time.perf_counter() - start) / args.ticks
+            same = np.array_equal(world.positions, np.array([agent.status() for agent in agents]))
+            print(f"{count:>8} {'loop':>7} {looped * 1000:>10.3f} {count / looped:>12.0f}")
+            if not same:
+                print(f"{count:>8} positions differ from the per-agent loop")
+        print(f"{count:>8} {'world':>7} {batched * 1000:>10.3f} {count / batched:>12.0f}")
+
+
+def bench_draw(args):
+    """Compare one pygame.draw.rect per agent with the single surfarray blit."""
+    pygame.init()
+    screen = pygame.display.set_mode((args.width, args.height))
+    env = Environment(args.width, args.height)
+    rng = np.random.default_rng(args.seed)
+    renderer = WorldRenderer(screen, rect_limit=0)
+    print(f"{'agents':>8} {'engine':>7} {'frame (ms)':>11}")
+    for count in args.agents:
+        world = AgentWorld(env, count, positions=np.column_stack([
+            rng.integers(args.width, size=count), rng.integers(args.height, size=count)]))
+        width, height = renderer.size
+        start = time.perf_counter()
+        for _ in range(args.frames):
+            screen.fill((255, 255, 255))
+            for x, y in world.positions.tolist():
+                pygame.draw.rect(screen, (0, 0, 255), (x, y, width, height))
+        rects = (time.perf_counter() - start) / args.frames
+        reference = pygame.surfarray.array2d(screen)
+        start = time.perf_counter()
+        for _ in range(args.frames):
+            renderer.draw(world)
+        blit = (time.perf_counter() - start) / args.frames
+        same = np.array_equal(reference, pygame.surfarray.array2d(screen))
+        print(f"{count:>8} {'rects':>7} {rects * 1000:>11.3f}")
+        print(f"{count:>8} {'blit':>7} {blit * 1000:>11.3f}{'' if same else '  pixels differ'}")
+    pygame.quit()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks for the LabTask1 agent world.")
+    parser.add_argument("--width", type=int, default=600)
+    parser.add_argument("--height", type=int, default=400)
+    parser.add_argument("--seed", type=int, default=0)
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    ticks = subparsers.add_parser("ticks", help="agents moved per second, per-agent loop versus batched world")
+    ticks.add_argument("--agents", type=int, nargs="+", default=[1, 100, 10000, 100000])
+    ticks.add_argument("--ticks", type=int, default=100)
+    ticks.add_argument("--loop-limit", type=int, default=100000, help="largest count to run the loop on")
+    ticks.set_defaults(run=bench_ticks)
+
+    draw = subparsers.add_parser("draw", help="frame time of a rect per agent versus one blit")
+    draw.add_argument("--agents", type=int, nargs="+", default=[1, 100, 10000, 100000])
+    draw.add_argument("--frames", type=int, default=20)
+    draw.set_defaults(run=bench_draw)
+
+    args = parser.parse_args()
+    args.run(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -13,4 +13,11 @@ class Environment:
         elif position[1] >= self.height:
             position[1] = 0   
              
-        return position
\ No newline at end of file
+        return position
+    def limit_positions(self, positions):
+        # limit_position for a (count, 2) NumPy array, in place
+        for axis, extent in enumerate((self.width, self.height)):
+            column = positions[:, axis]
+            column[column < 0] = extent - 1
+            column[column >= extent] = 0
+        return positions
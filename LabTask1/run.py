@@ -1,21 +1,67 @@
+import argparse
+import os
+import time
+from array import array
+import numpy as np
 import pygame
 from agent import Agent
 from environment import Environment
+from world import AgentWorld, WorldRenderer
 
-def main():
-    pygame.init()
-    WIDTH, HEIGHT = 600, 400
-    screen = pygame.display.set_mode((WIDTH, HEIGHT))
-    pygame.display.set_caption("Agent-Environment Simulation")
+NUM_AGENTS = 1  # The first agent follows the arrow keys, the others walk randomly
+STEP_RATE = 30  # Simulation steps per second; each moves an agent by 10 px
+FRAME_RATE = 60  # Rendered frames per second in the window
+MAX_FRAME_TIME = 0.25  # Longest stall caught up on, so a slow frame cannot snowball into ever more steps
+WIDTH, HEIGHT = 600, 400
 
-    
-    env = Environment(width=600, height=400)  
-    agent = Agent(environment=env)
+KEY_DIRECTIONS = [(pygame.K_UP, "up"), (pygame.K_DOWN, "down"), (pygame.K_LEFT, "left"), (pygame.K_RIGHT, "right")]
+
+
+def read_input():
+    """Sample the arrow keys once and return the directions held down."""
+    keys = pygame.key.get_pressed()
+    return [direction for key, direction in KEY_DIRECTIONS if keys[key]]
+
+
+def step(world, agent, directions, rng):
+    """Advance the simulation by one fixed step."""
+    for direction in directions:
+        agent.move(direction)
+    world.random_walk(rng, first=1)
+
+
+def draw(screen, renderer, world, agent, font):
+    renderer.draw(world)  # Clears the screen and draws every agent
+    position = agent.status()
+    position_text = font.render(f"Position: ({position[0]}, {position[1]})", True, (0, 0, 0))
+    screen.blit(position_text, (10, 10))
+
+
+def report(name, durations):
+    """Print the rate and the mean, median and 99th percentile duration of a run of steps or frames."""
+    if not durations:
+        return
+    times = np.frombuffer(durations, dtype=np.float64) * 1000
+    p50, p99 = np.percentile(times, [50, 99])
+    print(f"{name}: {len(times)} at {len(times) / (times.sum() / 1000):.0f}/s, "
+          f"mean {times.mean():.3f} ms, p50 {p50:.3f} ms, p99 {p99:.3f} ms")
 
-    agent.size = (20, 20)
 
- 
+def run_window(world, agent, rng, step_rate, frame_rate):
+    """Step the simulation at a fixed rate and render as often as frame_rate allows.
+
+    Elapsed wall time is collected in an accumulator and spent in whole
+    steps, so the agents move at the same speed whatever the frame rate.
+    """
+    screen = pygame.display.set_mode((WIDTH, HEIGHT))
+    pygame.display.set_caption("Agent-Environment Simulation")
     font = pygame.font.Font(None, 36)
+    renderer = WorldRenderer(screen, size=agent.size)
+    clock = pygame.time.Clock()
+    step_time = 1 / step_rate
+    step_times, frame_times = array("d"), array("d")
+    accumulator = 0.0
+    previous = time.perf_counter()
 
     running = True
     while running:
@@ -23,31 +69,73 @@ def main():
             if event.type == pygame.QUIT:
                 running = False
 
-  
-        keys = pygame.key.get_pressed()
-        if keys[pygame.K_UP]:
-            agent.move("up")
-        if keys[pygame.K_DOWN]:
-            agent.move("down")
-        if keys[pygame.K_LEFT]:
-            agent.move("left")
-        if keys[pygame.K_RIGHT]:
-            agent.move("right")
+        now = time.perf_counter()
+        accumulator += min(now - previous, MAX_FRAME_TIME)
+        previous = now
+        while accumulator >= step_time:
+            start = time.perf_counter()
+            step(world, agent, read_input(), rng)
+            step_times.append(time.perf_counter() - start)
+            accumulator -= step_time
 
-        
-        screen.fill((255, 255, 255))
+        start = time.perf_counter()
+        draw(screen, renderer, world, agent, font)
+        pygame.display.flip()
+        frame_times.append(time.perf_counter() - start)
+        clock.tick(frame_rate)
 
-     
-        position = agent.status()
-        rect_position = (position[0], position[1], agent.size[0], agent.size[1])
-        pygame.draw.rect(screen, (0, 0, 255), rect_position)
+    report("steps", step_times)
+    report("frames", frame_times)
 
-        position_text = font.render(f"Position: ({position[0]}, {position[1]})", True, (0, 0, 0))
-        screen.blit(position_text, (10, 10))
 
-        pygame.display.flip()
+def run_headless(world, agent, rng, steps, render):
+    """Run steps back to back with no window, frame cap or input, and report how fast they went.
+
+    With render, every step is also drawn to an off-screen surface.
+    """
+    screen = pygame.Surface((WIDTH, HEIGHT)) if render else None
+    font = pygame.font.Font(None, 36) if render else None
+    renderer = WorldRenderer(screen, size=agent.size) if render else None
+    step_times, frame_times = array("d"), array("d")
+    started = time.perf_counter()
+    for _ in range(steps):
+        start = time.perf_counter()
+        step(world, agent, [], rng)
+        step_times.append(time.perf_counter() - start)
+        if render:
+            start = time.perf_counter()
+            draw(screen, renderer, world, agent, font)
+            frame_times.append(time.perf_counter() - start)
+    elapsed = time.perf_counter() - started
+    print(f"{steps} steps of {len(world)} agents in {elapsed:.3f} s ({steps / elapsed:.0f} steps/s overall)")
+    report("steps", step_times)
+    report("frames", frame_times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Agent-environment simulation.")
+    parser.add_argument("--agents", type=int, default=NUM_AGENTS)
+    parser.add_argument("--step-rate", type=float, default=STEP_RATE, help="simulation steps per second")
+    parser.add_argument("--fps", type=float, default=FRAME_RATE, help="frame cap of the window")
+    parser.add_argument("--headless", action="store_true", help="run uncapped without a window and print stats")
+    parser.add_argument("--steps", type=int, default=10000, help="steps of a headless run")
+    parser.add_argument("--render", action="store_true", help="also draw each headless step off screen")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    if args.headless:
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    pygame.init()
+    env = Environment(width=WIDTH, height=HEIGHT)
+    world = AgentWorld(env, args.agents)
+    agent = Agent(environment=env, world=world, index=0)
+    agent.size = (20, 20)
+    rng = np.random.default_rng(args.seed)
 
-        pygame.time.Clock().tick(30)
+    if args.headless:
+        run_headless(world, agent, rng, args.steps, args.render)
+    else:
+        run_window(world, agent, rng, args.step_rate, args.fps)
 
     pygame.quit()
 
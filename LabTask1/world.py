@@ -0,0 +1,94 @@
+import numpy as np
+import pygame
+
+DIRECTIONS = ["up", "down", "left", "right"]
+# Step of each direction, in the same order; "up" adds to y like Agent.move always has
+DIRECTION_VECTORS = np.array([(0, 10), (0, -10), (-10, 0), (10, 0)], dtype=np.int32)
+AGENT_SIZE = (20, 20)
+RECT_LIMIT = 200  # Below this many agents, one draw.rect each is cheaper than building the pixel array
+AGENT_COLOR = (0, 0, 255)
+BACKGROUND_COLOR = (255, 255, 255)
+
+
+class AgentWorld:
+    """Positions of many agents in one (count, 2) array, moved and wrapped together."""
+
+    def __init__(self, environment, count, positions=None):
+        self.environment = environment
+        self.positions = np.zeros((count, 2), dtype=np.int32)
+        if positions is not None:
+            self.positions[:] = positions
+
+    def __len__(self):
+        return len(self.positions)
+
+    def move(self, directions):
+        """Move every agent one step; directions holds an index into DIRECTIONS per agent."""
+        self.positions += DIRECTION_VECTORS[directions]
+        self.environment.limit_positions(self.positions)
+
+    def move_all(self, direction):
+        """Move every agent one step in the same direction."""
+        self.positions += DIRECTION_VECTORS[DIRECTIONS.index(direction)]
+        self.environment.limit_positions(self.positions)
+
+    def move_one(self, index, direction):
+        """Move a single agent, wrapping it exactly like Environment.limit_position."""
+        row = self.positions[index]
+        row += DIRECTION_VECTORS[DIRECTIONS.index(direction)]
+        self.environment.limit_position(row)
+
+    def random_walk(self, rng, first=0):
+        """Move every agent from index first on one step in a random direction."""
+        positions = self.positions[first:]
+        positions += DIRECTION_VECTORS[rng.integers(len(DIRECTIONS), size=len(positions))]
+        self.environment.limit_positions(positions)
+
+
+class WorldRenderer:
+    """Draws every agent of a world with one surfarray blit.
+
+    Agent corners are marked in a pixel mask, which is grown into
+    size-by-size squares with two running-sum passes, so the cost depends
+    on the screen size rather than on the number of agents. Squares are
+    clipped at the right and bottom edges, as pygame.draw.rect would.
+    Worlds smaller than rect_limit are drawn with a rect per agent.
+    """
+
+    def __init__(self, screen, size=AGENT_SIZE, color=AGENT_COLOR, background=BACKGROUND_COLOR,
+                 rect_limit=RECT_LIMIT):
+        self.screen = screen
+        self.size = size
+        self.rect_limit = rect_limit
+        self.rgb = (color, background)
+        self.color = screen.map_rgb(color)
+        self.background = screen.map_rgb(background)
+        self.marks = np.zeros(screen.get_size(), dtype=np.int32)  # Indexed [x, y] like surfarray
+
+    def fill_mask(self, positions):
+        """Return a boolean [x, y] mask of the pixels covered by agents at positions."""
+        marks = self.marks
+        marks.fill(0)
+        width, height = marks.shape
+        inside = (positions[:, 0] < width) & (positions[:, 1] < height)
+        marks[positions[inside, 0], positions[inside, 1]] = 1
+        width_extent, height_extent = self.size
+        # A pixel is covered when a corner lies within the extent pixels ending at it
+        if width_extent > 1:
+            marks = np.cumsum(marks, axis=0, dtype=np.int32)
+            marks[width_extent:] -= marks[:-width_extent].copy()
+        if height_extent > 1:
+            marks = np.cumsum(marks, axis=1, dtype=np.int32)
+            marks[:, height_extent:] -= marks[:, :-height_extent].copy()
+        return marks > 0
+
+    def draw(self, world):
+        """Paint the background and every agent onto the screen."""
+        if len(world) < self.rect_limit:
+            color, background = self.rgb
+            self.screen.fill(background)
+            for x, y in world.positions.tolist():
+                pygame.draw.rect(self.screen, color, (x, y, *self.size))
+            return
+        pixels = np.where(self.fill_mask(world.positions), self.color, self.background).astype(np.uint32)
+        pygame.surfarray.blit_array(self.screen, pixels)
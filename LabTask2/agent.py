@@ -1,9 +1,12 @@
 import pygame
-from collections import deque
-import heapq
+import jps
+import search
+import tour
+from dstar_lite import DStarLite
+from path_cache import PathCache
 
 class Agent(pygame.sprite.Sprite):
-    def __init__(self, environment, grid_size, algorithm="UCS"):
+    def __init__(self, environment, grid_size, algorithm="UCS", planner="nearest"):
         super().__init__()
         self.image = pygame.Surface((grid_size, grid_size))
         self.image.fill((0, 0, 255))  # Agent color is blue
@@ -16,8 +19,19 @@ class Agent(pygame.sprite.Sprite):
         self.completed_tasks = []
         self.path = []  # List of positions to follow
         self.moving = False  # Flag to indicate if the agent is moving
-        self.algorithm = algorithm  # Either "UCS" or "A*"
+        self.algorithm = algorithm  # "UCS", "A*" or "JPS" (jump point search)
         self.total_path_cost = 0  # Tracks the total path cost
+        self.heuristic_weight = 1.0  # Values above 1 trade optimality for fewer expansions in A*
+        self.nodes_expanded = 0  # Nodes expanded by the most recent search
+        self.total_nodes_expanded = 0  # Nodes expanded by every search so far
+        self.planner = planner  # Either "nearest" (greedy) or "tour" (planned visit order)
+        self.distance_cache = tour.DistanceCache(environment)
+        self.tour = []  # Remaining tasks in planned visiting order
+        self.incremental_replanning = True  # Repair paths with D* Lite instead of searching again
+        self.replanner = None  # D* Lite search towards the end of the current path
+        self.cache_paths = True  # Answer repeated queries from the path cache and existing distance fields
+        self.path_cache = PathCache(environment)
+        self.jump_grid = None  # Row bitsets for jump point search, built on first use
 
     def move(self):
         """Move the agent along the path and update the path cost."""
@@ -25,7 +39,7 @@ class Agent(pygame.sprite.Sprite):
             next_position = self.path.pop(0)
             self.position = list(next_position)
             self.rect.topleft = (self.position[0] * self.grid_size, self.position[1] * self.grid_size)
-            self.total_path_cost += 1  # Increment cost for each move
+            self.total_path_cost += self.environment.cost(*next_position)  # Add the cost of the entered cell
             self.check_task_completion()
         else:
             self.moving = False  # Stop moving when path is exhausted
@@ -38,78 +52,153 @@ class Agent(pygame.sprite.Sprite):
             self.task_completed += 1
             self.completed_tasks.append(task_number)
 
+    def find_next_task(self):
+        """Head for the next task using the configured planner."""
+        if self.planner == "nearest":
+            self.find_nearest_task()
+        elif self.planner == "tour":
+            self.follow_tour()
+        else:
+            raise ValueError("Unsupported planner: " + self.planner)
+
     def find_nearest_task(self):
-        """Find the nearest task based on the chosen algorithm (UCS or A*)."""
-        nearest_task = None
-        shortest_path = None
-        for task_position in self.environment.task_locations.keys():
-            path = self.find_path_to(task_position)
-            if path:
-                if not shortest_path or len(path) < len(shortest_path):
-                    shortest_path = path
-                    nearest_task = task_position
+        """Find the nearest task with a single multi-goal search (UCS or A*)."""
+        shortest_path = self.find_path_to_nearest(self.environment.task_locations.keys())
         if shortest_path:
             self.path = shortest_path[1:]  # Exclude the current position
             self.moving = True
+            self.replanner = None
 
-    def find_path_to(self, target):
-        """Find a path to the target position using UCS or A*."""
+    def plan_tour(self):
+        """Plan the visiting order of every remaining task from cached distance fields."""
+        if self.distance_cache.environment is not self.environment:
+            self.distance_cache = tour.DistanceCache(self.environment)
+        expanded_before = self.distance_cache.nodes_expanded
+        self.tour = tour.plan_tour(self.distance_cache, tuple(self.position), list(self.environment.task_locations))
+        self.nodes_expanded = self.distance_cache.nodes_expanded - expanded_before
+        self.total_nodes_expanded += self.nodes_expanded
+
+    def follow_tour(self):
+        """Head for the next task of the planned tour, reading its path from the cache."""
+        while self.tour and self.tour[0] not in self.environment.task_locations:
+            self.tour.pop(0)  # Completed on the way to an earlier task
+        if not self.tour:
+            self.plan_tour()
+        if self.tour:
+            path = self.distance_cache.path(tuple(self.position), self.tour[0])
+            if path is None:
+                self.tour.pop(0)  # Walled off since the tour was planned
+                return
+            self.path = path[1:]  # Exclude the current position
+            self.moving = True
+            self.replanner = None
+
+    def repair_path(self):
+        """Repair the current path after barriers were added or removed.
+
+        With incremental replanning, the first repair on a path runs a full
+        D* Lite search towards its end; later repairs on the same path only
+        re-expand the nodes affected by the new changes.
+        """
+        if not self.path:
+            return
+        goal = self.path[-1]
+        if not self.incremental_replanning:
+            path = self.find_path_to(goal)
+        else:
+            if (self.replanner is None or self.replanner.goal != search.cell_id(goal, self.environment.columns)
+                    or self.replanner.cost_edits != self.environment.cell_costs.edits):
+                self.replanner = DStarLite(self.environment, tuple(self.position), goal)
+            else:
+                self.replanner.move_to(tuple(self.position))
+            path = self.replanner.replan()
+            self.nodes_expanded = self.replanner.nodes_expanded
+            self.total_nodes_expanded += self.nodes_expanded
+        if path:
+            self.path = path[1:]  # Exclude the current position
+        else:
+            self.path = []  # The goal is walled off; pick another task
+            self.moving = False
+
+    def find_path_to_nearest(self, goals):
+        """Find a path to the closest of several goals using UCS, A* or JPS.
+
+        Queries answered by the path cache expand no nodes.
+        """
+        goals = tuple(goals)
+        start = tuple(self.position)
+        variant = (self.algorithm, self.heuristic_weight)
+        if self.cache_paths:
+            if self.path_cache.environment is not self.environment:
+                self.path_cache = PathCache(self.environment, self.path_cache.max_size)
+            fields = self.distance_cache if self.distance_cache.environment is self.environment else None
+            found, path = self.path_cache.get(start, goals, variant, fields)
+            if found:
+                self.nodes_expanded = 0
+                return None if path is None else list(path)
         if self.algorithm == "UCS":
-            return self.ucs_path_to(target)
+            path = self.ucs_path_to_nearest(goals)
         elif self.algorithm == "A*":
-            return self.astar_path_to(target)
+            path = self.astar_path_to_nearest(goals)
+        elif self.algorithm == "JPS":
+            path = self.jps_path_to_nearest(goals)
         else:
             raise ValueError("Unsupported algorithm: " + self.algorithm)
+        if self.cache_paths:
+            optimal = self.algorithm != "A*" or self.heuristic_weight <= 1
+            self.path_cache.put(start, goals, variant, path, optimal)
+        return path
+
+    def find_path_to(self, target):
+        """Find a path to the target position using UCS, A* or JPS."""
+        return self.find_path_to_nearest([target])
 
     def ucs_path_to(self, target):
-        """Use Uniform Cost Search (UCS) to find the shortest path to the target."""
-        start = tuple(self.position)
-        goal = target
-        queue = deque([[start]])
-        visited = set()
-        visited.add(start)
-
-        while queue:
-            path = queue.popleft()
-            x, y = path[-1]
-
-            if (x, y) == goal:
-                return path
-
-            neighbors = self.get_neighbors(x, y)
-            for neighbor in neighbors:
-                if neighbor not in visited:
-                    visited.add(neighbor)
-                    new_path = list(path)
-                    new_path.append(neighbor)
-                    queue.append(new_path)
-        return None  # No path found
+        """Use Uniform Cost Search (UCS) to find the cheapest path to the target."""
+        return self.ucs_path_to_nearest([target])
 
     def astar_path_to(self, target):
-        """Use A* Search to find the shortest path to the target."""
+        """Use A* Search to find the cheapest path to the target."""
+        return self.astar_path_to_nearest([target])
+
+    def ucs_path_to_nearest(self, goals):
+        """Expand once from the agent with UCS and stop at the nearest goal.
+
+        Goals at the same cost are resolved in the order they are given,
+        which matches running ``ucs_path_to`` once per goal. Uniform grids
+        use breadth-first search; weighted grids fall back to Dijkstra.
+        """
         start = tuple(self.position)
-        goal = target
-        open_set = []
-        heapq.heappush(open_set, (0, [start]))  # Priority queue with (cost, path)
-        visited = set()
-        visited.add(start)
-
-        while open_set:
-            _, path = heapq.heappop(open_set)
-            x, y = path[-1]
-
-            if (x, y) == goal:
-                return path
-
-            neighbors = self.get_neighbors(x, y)
-            for neighbor in neighbors:
-                if neighbor not in visited:
-                    visited.add(neighbor)
-                    new_path = list(path)
-                    new_path.append(neighbor)
-                    cost = len(new_path) + self.heuristic(neighbor, goal)
-                    heapq.heappush(open_set, (cost, new_path))
-        return None  # No path found
+        if not self.environment.has_uniform_costs():
+            return self.record_search(search.astar_search(self.environment, start, goals, weight=0))
+        return self.record_search(search.breadth_first_search(self.environment, start, goals))
+
+    def astar_path_to_nearest(self, goals):
+        """Expand once from the agent with A* and stop at the nearest goal.
+
+        The heuristic is the Manhattan distance to the closest goal, which
+        stays admissible and consistent for several goals at once.
+        """
+        result = search.astar_search(self.environment, tuple(self.position), goals, self.heuristic_weight)
+        return self.record_search(result)
+
+    def jps_path_to_nearest(self, goals):
+        """Jump point search from the agent to the nearest goal.
+
+        Only cells where the path may turn are expanded, which pays off on
+        large open maps. Weighted grids fall back to A*.
+        """
+        if not self.environment.has_uniform_costs():
+            return self.astar_path_to_nearest(goals)
+        if self.jump_grid is None or self.jump_grid.environment is not self.environment:
+            self.jump_grid = jps.JumpGrid(self.environment)
+        return self.record_search(jps.jump_point_search(self.jump_grid, tuple(self.position), goals))
+
+    def record_search(self, result):
+        """Store the expansion count of a search and return its path."""
+        path, self.nodes_expanded = result
+        self.total_nodes_expanded += self.nodes_expanded
+        return path
 
     def get_neighbors(self, x, y):
         """Get walkable neighboring positions."""
@@ -126,3 +215,4 @@ class Agent(pygame.sprite.Sprite):
         px, py = position
         gx, gy = goal
         return abs(px - gx) + abs(py - gy)
+
@@ -0,0 +1,426 @@
+# bench.py
+import argparse
+import random
+import time
+import tracemalloc
+from collections import deque
+from headless import run_episode
+import pygame
+import jps
+import search
+from fleet import Fleet, spread_starts
+from agent import Agent
+from environment import Environment
+from renderer import (BARRIER_COLOR, BUTTON_COLOR, BUTTON_HOVER_COLOR, BUTTON_TEXT_COLOR, GRID_LINE_COLOR,
+                      TASK_COLOR, TEXT_COLOR, GridRenderer)
+
+MAX_LAYOUTS = 100  # Barrier layouts drawn before giving up on connecting the corners
+
+
+def make_environment(columns, rows, barrier_density, seed, max_cell_cost=1, use_grid=False, num_tasks=0):
+    """Build a seeded environment of the given size in which the two corners are connected.
+
+    Layouts that wall a corner off are drawn again from the same seeded
+    random stream, so corner-to-corner queries always search a real path.
+    """
+    random.seed(seed)
+    num_barriers = int(columns * rows * barrier_density)
+    for _ in range(MAX_LAYOUTS):
+        environment = Environment(columns, rows, 1, num_tasks=num_tasks, num_barriers=num_barriers,
+                                  max_cell_cost=max_cell_cost, use_grid=use_grid)
+        environment.barrier_locations.discard((0, 0))
+        environment.barrier_locations.discard((columns - 1, rows - 1))
+        distances, _ = search.distance_field(environment, (columns - 1, rows - 1))
+        if distances[0] != search.UNVISITED:
+            return environment
+    raise ValueError(f"No {columns}x{rows} layout at barrier density {barrier_density} connected the corners "
+                     f"in {MAX_LAYOUTS} tries")
+
+
+def copying_bfs(agent, target):
+    """Reference UCS that copies the whole path into every frontier entry."""
+    start = tuple(agent.position)
+    queue = deque([[start]])
+    visited = {start}
+    while queue:
+        path = queue.popleft()
+        if path[-1] == target:
+            return path
+        for neighbor in agent.get_neighbors(*path[-1]):
+            if neighbor not in visited:
+                visited.add(neighbor)
+                queue.append(path + [neighbor])
+    return None
+
+
+def measure(query):
+    """Return (seconds, peak bytes, result) for one call of query."""
+    start = time.perf_counter()
+    result = query()
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    query()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak, result
+
+
+def bench_paths(args):
+    """Report wall time and peak memory of corner-to-corner searches by grid size."""
+    print(f"{'grid':>11} {'engine':>8} {'length':>7} {'time (s)':>9} {'peak (MB)':>10}")
+    for size in args.sizes:
+        environment = make_environment(size, size, args.density, args.seed, use_grid=args.grid)
+        agent = Agent(environment, 1)
+        target = (size - 1, size - 1)
+        engines = [("UCS", lambda: agent.ucs_path_to(target)), ("A*", lambda: agent.astar_path_to(target))]
+        if size <= args.copy_limit:
+            engines.append(("copying", lambda: copying_bfs(agent, target)))
+        for name, query in engines:
+            elapsed, peak, path = measure(query)
+            length = len(path) - 1 if path else "-"
+            print(f"{size:>5}x{size:<5} {name:>8} {length:>7} {elapsed:>9.3f} {peak / 2**20:>10.1f}")
+
+
+def path_cost(environment, path):
+    """Sum the entry costs along a path, excluding the starting cell."""
+    return sum(environment.cost(x, y) for x, y in path[1:])
+
+
+def bench_astar(args):
+    """Compare nodes expanded, path cost and time of UCS, A* and weighted A*."""
+    print(f"{'grid':>11} {'costs':>5} {'engine':>8} {'cost':>7} {'expanded':>9} {'time (s)':>9}")
+    for size in args.sizes:
+        for max_cell_cost in args.max_cell_costs:
+            environment = make_environment(size, size, args.density, args.seed, max_cell_cost, args.grid)
+            agent = Agent(environment, 1)
+            target = (size - 1, size - 1)
+            engines = [("UCS", "UCS", 1.0), ("A*", "A*", 1.0)]
+            engines += [(f"A* w={weight:g}", "A*", weight) for weight in args.weights]
+            for name, algorithm, weight in engines:
+                agent.algorithm = algorithm
+                agent.heuristic_weight = weight
+                start = time.perf_counter()
+                path = agent.find_path_to(target)
+                elapsed = time.perf_counter() - start
+                cost = path_cost(environment, path) if path else "-"
+                print(f"{size:>5}x{size:<5} {max_cell_cost:>5} {name:>8} {cost:>7} "
+                      f"{agent.nodes_expanded:>9} {elapsed:>9.3f}")
+
+
+def bench_tour(args):
+    """Compare greedy nearest-task replanning with tours planned from the distance cache."""
+    print(f"{'grid':>11} {'tasks':>5} {'planner':>8} {'cost':>7} {'done':>5} {'expanded':>9} {'time (s)':>9}")
+    for size in args.sizes:
+        for num_tasks in args.tasks:
+            for planner in ("nearest", "tour"):
+                environment = make_environment(size, size, args.density, args.seed, args.max_cell_cost,
+                                               args.grid, num_tasks)
+                agent = Agent(environment, 1, algorithm=args.algorithm, planner=planner)
+                start = time.perf_counter()
+                run_episode(agent)
+                elapsed = time.perf_counter() - start
+                print(f"{size:>5}x{size:<5} {num_tasks:>5} {planner:>8} {agent.total_path_cost:>7} "
+                      f"{agent.task_completed:>5} {agent.total_nodes_expanded:>9} {elapsed:>9.3f}")
+
+
+def bench_replan(args):
+    """Compare D* Lite path repair with full replanning under small barrier edits."""
+    print(f"{'grid':>11} {'replanning':>11} {'cost':>7} {'expanded':>9} {'time (s)':>9}")
+    for size in args.sizes:
+        for incremental in (False, True):
+            environment = make_environment(size, size, args.density, args.seed, use_grid=args.grid)
+            agent = Agent(environment, 1, algorithm="A*")
+            agent.incremental_replanning = incremental
+            agent.path = (agent.find_path_to((size - 1, size - 1)) or [None])[1:]
+            agent.repair_path()  # Builds the D* Lite tables before the edits start
+            agent.total_nodes_expanded = 0
+            edits = random.Random(args.seed)
+            elapsed = 0
+            for _ in range(args.edits):
+                if not agent.path:
+                    break
+                for _ in range(args.steps):
+                    if len(agent.path) > 1:
+                        agent.move()
+                # Drop a barrier on the upcoming path, plus one elsewhere on the map
+                ahead = agent.path[:-1]  # Never block the goal itself
+                if ahead:
+                    environment.add_barrier(*ahead[min(len(ahead) - 1, edits.randint(0, 9))])
+                cell = (edits.randrange(size), edits.randrange(size))
+                if cell != tuple(agent.position):
+                    environment.add_barrier(*cell)
+                start = time.perf_counter()
+                agent.repair_path()
+                elapsed += time.perf_counter() - start
+            while agent.path:
+                agent.move()
+            name = "incremental" if incremental else "full"
+            print(f"{size:>5}x{size:<5} {name:>11} {agent.total_path_cost:>7} "
+                  f"{agent.total_nodes_expanded:>9} {elapsed:>9.3f}")
+
+
+def replay_episodes(agent, repeats):
+    """Run the same tasks several times from the start, like restarting the simulation."""
+    tasks = dict(agent.environment.task_locations)
+    for _ in range(repeats):
+        agent.environment.task_locations = dict(tasks)
+        agent.position = [0, 0]
+        run_episode(agent)
+
+
+def wait_for_walled_task(agent, ticks):
+    """Ask for the next task every tick while the only task left is walled off, like run.py does."""
+    environment = agent.environment
+    x, y = next(iter(environment.task_locations))
+    for nx, ny in ((x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)):
+        environment.add_barrier(nx, ny)
+    for _ in range(ticks):
+        agent.find_next_task()
+
+
+def greedy_after_tour(agent, repeats):
+    """Plan a tour (building one distance field per task), then finish greedily."""
+    agent.plan_tour()
+    agent.planner = "nearest"
+    run_episode(agent)
+
+
+def bench_cache(args):
+    """Compare searches with and without the path cache on workloads that repeat queries."""
+    scenarios = {"replay": replay_episodes, "walled": wait_for_walled_task, "tour": greedy_after_tour}
+    print(f"{'grid':>11} {'scenario':>8} {'cache':>5} {'cost':>7} {'expanded':>9} {'hit rate':>8} {'time (s)':>9}")
+    for size in args.sizes:
+        for name in args.scenarios:
+            for cached in (False, True):
+                tasks = 1 if name == "walled" else args.tasks
+                environment = make_environment(size, size, args.density, args.seed, num_tasks=tasks)
+                agent = Agent(environment, 1, algorithm=args.algorithm)
+                agent.cache_paths = cached
+                start = time.perf_counter()
+                if name == "episode":
+                    run_episode(agent)
+                else:
+                    scenarios[name](agent, args.repeats)
+                elapsed = time.perf_counter() - start
+                hit_rate = f"{agent.path_cache.hit_rate():.1%}" if cached else "-"
+                print(f"{size:>5}x{size:<5} {name:>8} {'on' if cached else 'off':>5} {agent.total_path_cost:>7} "
+                      f"{agent.total_nodes_expanded:>9} {hit_rate:>8} {elapsed:>9.3f}")
+
+
+def bench_jps(args):
+    """Compare nodes expanded and latency of UCS, A* and jump point search from 20x15 up to 2000x2000."""
+    print(f"{'grid':>11} {'engine':>6} {'length':>7} {'expanded':>9} {'time (s)':>9}")
+    for columns, rows in args.sizes:
+        environment = make_environment(columns, rows, args.density, args.seed)
+        agent = Agent(environment, 1)
+        agent.cache_paths = False
+        start = time.perf_counter()
+        agent.jump_grid = jps.JumpGrid(environment)
+        print(f"{columns:>5}x{rows:<5} {'build':>6} {'':>7} {'':>9} {time.perf_counter() - start:>9.3f}")
+        target = (columns - 1, rows - 1)
+        engines = ["JPS", "A*"] + (["UCS"] if columns * rows <= args.ucs_limit else [])
+        for algorithm in engines:
+            agent.algorithm = algorithm
+            start = time.perf_counter()
+            path = agent.find_path_to(target)
+            elapsed = time.perf_counter() - start
+            length = len(path) - 1 if path else "-"
+            print(f"{columns:>5}x{rows:<5} {algorithm:>6} {length:>7} {agent.nodes_expanded:>9} {elapsed:>9.3f}")
+
+
+def bench_fleet(args):
+    """Report tick rate and task throughput of a fleet as the agent count grows."""
+    print(f"{'grid':>11} {'agents':>6} {'tasks':>6} {'per tick':>8} {'ticks/s':>8} {'plans':>6} "
+          f"{'failed':>6} {'expanded':>9} {'conflicts':>9}")
+    for count in args.agents:
+        environment = make_environment(args.size, args.size, args.density, args.seed, use_grid=args.grid,
+                                       num_tasks=args.tasks)
+        start = time.perf_counter()
+        fleet = Fleet(environment, spread_starts(environment, count), respawn=True)
+        conflicts = 0
+        for _ in range(args.ticks):
+            previous = list(fleet.positions)
+            fleet.step()
+            conflicts += fleet.conflicts(previous)
+        elapsed = time.perf_counter() - start
+        print(f"{args.size:>5}x{args.size:<5} {count:>6} {fleet.tasks_completed:>6} "
+              f"{fleet.tasks_completed / args.ticks:>8.2f} {args.ticks / elapsed:>8.0f} {fleet.plans:>6} "
+              f"{fleet.failed_plans:>6} {fleet.nodes_expanded:>9} {conflicts:>9}")
+
+
+def grid_shape(text):
+    """Parse COLUMNSxROWS."""
+    columns, rows = text.lower().split("x")
+    return int(columns), int(rows)
+
+
+def draw_full_frame(screen, environment, agent, font, grid_size, width, status, buttons, mouse_pos):
+    """Reference frame that redraws every cell, barrier, task and label and flips the whole display."""
+    screen.fill((255, 255, 255))
+    for x in range(environment.columns):
+        for y in range(environment.rows):
+            rect = pygame.Rect(x * grid_size, y * grid_size, grid_size, grid_size)
+            pygame.draw.rect(screen, GRID_LINE_COLOR, rect, 1)
+    for (bx, by) in environment.barrier_locations:
+        pygame.draw.rect(screen, BARRIER_COLOR, pygame.Rect(bx * grid_size, by * grid_size, grid_size, grid_size))
+    for (tx, ty), task_number in environment.task_locations.items():
+        task_rect = pygame.Rect(tx * grid_size, ty * grid_size, grid_size, grid_size)
+        pygame.draw.rect(screen, TASK_COLOR, task_rect)
+        task_num_surface = font.render(str(task_number), True, (255, 255, 255))
+        screen.blit(task_num_surface, task_num_surface.get_rect(center=task_rect.center))
+    screen.blit(agent.image, agent.rect)
+    for line, text in enumerate(status):
+        screen.blit(font.render(text, True, TEXT_COLOR), (width + 10, 20 + 30 * line))
+    for rect, label, visible in buttons:
+        if visible:
+            pygame.draw.rect(screen, BUTTON_HOVER_COLOR if rect.collidepoint(mouse_pos) else BUTTON_COLOR, rect)
+            text = font.render(label, True, BUTTON_TEXT_COLOR)
+            screen.blit(text, text.get_rect(center=rect.center))
+    pygame.draw.line(screen, (0, 0, 0), (width, 0), (width, environment.rows * grid_size))
+    pygame.display.flip()
+
+
+def bench_render(args):
+    """Compare full redraws with the dirty-rect renderer while an agent runs, on growing grids."""
+    pygame.init()
+    font = pygame.font.Font(None, 24)
+    print(f"{'grid':>11} {'cell':>4} {'full (ms)':>9} {'dirty (ms)':>10} {'speedup':>7} {'area':>6} {'equal':>6}")
+    for columns, rows in args.sizes:
+        grid_size = max(1, min(args.width // columns, args.height // rows))
+        width, height = columns * grid_size, rows * grid_size
+        screen = pygame.display.set_mode((width + args.status_width, height))
+        reference = pygame.Surface(screen.get_size())
+        random.seed(args.seed)
+        environment = Environment(width, height, grid_size, num_tasks=args.tasks,
+                                  num_barriers=int(columns * rows * args.density))
+        agent = Agent(environment, grid_size, algorithm="A*")
+        renderer = GridRenderer(screen, environment, agent, font, grid_size, width, height)
+        button = pygame.Rect(width + 100, height // 2, 100, 50)
+        edits = random.Random(args.seed)
+        full_time = dirty_time = 0.0
+        area = 0
+        equal = True
+        for frame in range(args.frames):
+            # One simulation step per frame, with an occasional barrier edit
+            if agent.moving:
+                agent.move()
+            elif environment.task_locations:
+                agent.find_next_task()
+            if frame % args.edit_every == 0:
+                cell = (edits.randrange(columns), edits.randrange(rows))
+                if cell != tuple(agent.position) and environment.add_barrier(*cell):
+                    agent.repair_path()
+            status = [f"Algorithm: {agent.algorithm}", f"Tasks Completed: {agent.task_completed}",
+                      f"Position: {agent.position}", f"Completed Tasks: {agent.completed_tasks}",
+                      f"Total Path Cost: {agent.total_path_cost}", f"Nodes Expanded: {agent.total_nodes_expanded}"]
+            buttons = [(button, "Toggle", True)]
+            start = time.perf_counter()
+            dirty = renderer.draw(status, buttons, (0, 0))
+            dirty_time += time.perf_counter() - start
+            area += sum(rect.width * rect.height for rect in dirty)
+            start = time.perf_counter()
+            draw_full_frame(reference, environment, agent, font, grid_size, width, status, buttons, (0, 0))
+            full_time += time.perf_counter() - start
+            if frame % args.check_every == 0 or frame == args.frames - 1:
+                equal = equal and pygame.image.tobytes(screen, "RGB") == pygame.image.tobytes(reference, "RGB")
+        full_ms, dirty_ms = full_time / args.frames * 1000, dirty_time / args.frames * 1000
+        covered = area / (args.frames * screen.get_width() * screen.get_height())
+        print(f"{columns:>5}x{rows:<5} {grid_size:>4} {full_ms:>9.3f} {dirty_ms:>10.3f} "
+              f"{full_ms / dirty_ms:>6.0f}x {covered:>6.1%} {'yes' if equal else 'NO':>6}")
+    pygame.quit()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks for the LabTask2 search engines.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    paths = subparsers.add_parser("paths", help="peak memory and wall time against grid size")
+    paths.add_argument("--sizes", type=int, nargs="+", default=[50, 100, 200, 500, 1000])
+    paths.add_argument("--density", type=float, default=0.2, help="fraction of cells that are barriers")
+    paths.add_argument("--copy-limit", type=int, default=200,
+                       help="largest grid to run the path-copying reference on")
+    paths.add_argument("--seed", type=int, default=0)
+    paths.add_argument("--grid", action="store_true", help="use the NumPy occupancy grid backend")
+    paths.set_defaults(run=bench_paths)
+
+    astar = subparsers.add_parser("astar", help="nodes expanded per query on uniform and weighted grids")
+    astar.add_argument("--sizes", type=int, nargs="+", default=[50, 200, 500])
+    astar.add_argument("--density", type=float, default=0.2, help="fraction of cells that are barriers")
+    astar.add_argument("--max-cell-costs", type=int, nargs="+", default=[1, 5],
+                       help="cells cost 1..N to enter; 1 is a uniform grid")
+    astar.add_argument("--weights", type=float, nargs="+", default=[1.5, 3.0])
+    astar.add_argument("--seed", type=int, default=0)
+    astar.add_argument("--grid", action="store_true", help="use the NumPy occupancy grid backend")
+    astar.set_defaults(run=bench_astar)
+
+    tour = subparsers.add_parser("tour", help="total path cost of greedy replanning versus planned tours")
+    tour.add_argument("--sizes", type=int, nargs="+", default=[50, 200])
+    tour.add_argument("--tasks", type=int, nargs="+", default=[8, 50])
+    tour.add_argument("--density", type=float, default=0.2, help="fraction of cells that are barriers")
+    tour.add_argument("--max-cell-cost", type=int, default=1, help="cells cost 1..N to enter")
+    tour.add_argument("--algorithm", choices=["UCS", "A*", "JPS"], default="A*",
+                      help="search used by the greedy planner")
+    tour.add_argument("--seed", type=int, default=0)
+    tour.add_argument("--grid", action="store_true", help="use the NumPy occupancy grid backend")
+    tour.set_defaults(run=bench_tour)
+
+    replan = subparsers.add_parser("replan", help="D* Lite path repair versus full replanning")
+    replan.add_argument("--sizes", type=int, nargs="+", default=[100, 300])
+    replan.add_argument("--edits", type=int, default=50, help="barrier edits during the run")
+    replan.add_argument("--steps", type=int, default=5, help="agent moves between edits")
+    replan.add_argument("--density", type=float, default=0.2, help="fraction of cells that are barriers")
+    replan.add_argument("--seed", type=int, default=0)
+    replan.add_argument("--grid", action="store_true", help="use the NumPy occupancy grid backend")
+    replan.set_defaults(run=bench_replan)
+
+    render = subparsers.add_parser("render", help="frame time of full redraws versus dirty-rect rendering")
+    render.add_argument("--sizes", type=grid_shape, nargs="+", default=[(20, 15), (100, 75), (200, 150), (400, 300)],
+                        help="grids as COLUMNSxROWS, drawn with the largest cells that fit the window")
+    render.add_argument("--width", type=int, default=800, help="pixels available for the grid")
+    render.add_argument("--height", type=int, default=600)
+    render.add_argument("--status-width", type=int, default=300)
+    render.add_argument("--frames", type=int, default=300)
+    render.add_argument("--tasks", type=int, default=5)
+    render.add_argument("--density", type=float, default=0.1, help="fraction of cells that are barriers")
+    render.add_argument("--edit-every", type=int, default=10, help="frames between barrier edits")
+    render.add_argument("--check-every", type=int, default=25, help="frames between pixel comparisons")
+    render.add_argument("--seed", type=int, default=0)
+    render.set_defaults(run=bench_render)
+
+    cache = subparsers.add_parser("cache", help="searches saved by the path cache")
+    cache.add_argument("--sizes", type=int, nargs="+", default=[50, 200])
+    cache.add_argument("--scenarios", nargs="+", choices=["episode", "replay", "walled", "tour"],
+                       default=["episode", "replay", "walled", "tour"],
+                       help="one episode, the same tasks replayed, polling a walled-off task, greedy after a tour")
+    cache.add_argument("--repeats", type=int, default=5, help="replays, or ticks spent polling the walled task")
+    cache.add_argument("--tasks", type=int, default=10)
+    cache.add_argument("--algorithm", choices=["UCS", "A*", "JPS"], default="A*")
+    cache.add_argument("--density", type=float, default=0.2, help="fraction of cells that are barriers")
+    cache.add_argument("--seed", type=int, default=0)
+    cache.set_defaults(run=bench_cache)
+
+    jump = subparsers.add_parser("jps", help="jump point search against UCS and A* on large uniform grids")
+    jump.add_argument("--sizes", type=grid_shape, nargs="+",
+                      default=[(20, 15), (100, 100), (500, 500), (1000, 1000), (2000, 2000)],
+                      help="grids as COLUMNSxROWS")
+    jump.add_argument("--density", type=float, default=0.2, help="fraction of cells that are barriers")
+    jump.add_argument("--ucs-limit", type=int, default=1000000, help="largest cell count to also run UCS on")
+    jump.add_argument("--seed", type=int, default=0)
+    jump.set_defaults(run=bench_jps)
+
+    fleet = subparsers.add_parser("fleet", help="throughput of many agents sharing one map")
+    fleet.add_argument("--agents", type=int, nargs="+", default=[1, 5, 10, 25, 50])
+    fleet.add_argument("--size", type=int, default=50)
+    fleet.add_argument("--tasks", type=int, default=50, help="open tasks; each completed task is replaced")
+    fleet.add_argument("--ticks", type=int, default=500)
+    fleet.add_argument("--density", type=float, default=0.2, help="fraction of cells that are barriers")
+    fleet.add_argument("--seed", type=int, default=0)
+    fleet.add_argument("--grid", action="store_true", help="use the NumPy occupancy grid backend")
+    fleet.set_defaults(run=bench_fleet)
+
+    args = parser.parse_args()
+    args.run(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+from array import array
+import heapq
+import math
+import search
+
+
+class DStarLite:
+    """Incremental planner that repairs a path to a fixed goal as barriers change.
+
+    Searches backwards from the goal (D* Lite, optimized version) and keeps
+    its g/rhs tables between calls. After the agent moves (``move_to``) or
+    cells are toggled through ``Environment.add_barrier``/``remove_barrier``,
+    ``replan`` only re-expands the nodes whose distance actually changed.
+    """
+
+    def __init__(self, environment, start, goal):
+        self.environment = environment
+        self.columns = environment.columns
+        self.rows = environment.rows
+        self.start = search.cell_id(start, self.columns)
+        self.goal = search.cell_id(goal, self.columns)
+        self.version = len(environment.barrier_changes)  # Changes already reflected in the tables
+        self.cost_edits = environment.cell_costs.edits  # Cost edits are not tracked per cell; callers start over
+        self.key_modifier = 0  # km: grows by the heuristic distance every time the start moves
+        size = self.columns * self.rows
+        self.g = array("d", [math.inf]) * size
+        self.rhs = array("d", [math.inf]) * size
+        self.queued = {}  # cell -> key of its live heap entry; other entries are stale
+        self.open_set = []
+        self.nodes_expanded = 0  # Nodes expanded by the most recent replan
+        self.refresh_costs()
+        self.rhs[self.goal] = 0
+        self.push(self.goal)
+
+    def refresh_costs(self):
+        """Rebuild the neighbor and cost lookups from the environment."""
+        self.neighbors = search.neighbor_function(self.environment)
+        self.step_cost = search.cost_function(self.environment)
+        self.min_step = min(1, self.environment.min_cost())
+
+    def heuristic(self, cell):
+        """Manhattan distance from the current start, scaled by the cheapest step."""
+        dx = abs(cell % self.columns - self.start % self.columns)
+        dy = abs(cell // self.columns - self.start // self.columns)
+        return self.min_step * (dx + dy)
+
+    def calculate_key(self, cell):
+        best = min(self.g[cell], self.rhs[cell])
+        return (best + self.heuristic(cell) + self.key_modifier, best)
+
+    def push(self, cell):
+        key = self.calculate_key(cell)
+        self.queued[cell] = key
+        heapq.heappush(self.open_set, (key, cell))
+
+    def top_key(self):
+        """Return the smallest live key, dropping stale heap entries on the way."""
+        while self.open_set:
+            key, cell = self.open_set[0]
+            if self.queued.get(cell) == key:
+                return key
+            heapq.heappop(self.open_set)
+        return (math.inf, math.inf)
+
+    def update_vertex(self, cell):
+        """Recompute rhs of a cell from its successors and requeue it if inconsistent."""
+        if cell != self.goal:
+            best = math.inf
+            for neighbor in self.neighbors(cell):
+                cost = (self.step_cost(neighbor) if self.step_cost else 1) + self.g[neighbor]
+                if cost < best:
+                    best = cost
+            self.rhs[cell] = best
+        if self.g[cell] != self.rhs[cell]:
+            self.push(cell)
+        else:
+            self.queued.pop(cell, None)
+
+    def adjacent(self, cell):
+        """List in-bounds neighbor ids of a cell, walkable or not."""
+        x, y = cell % self.columns, cell // self.columns
+        return [
+            (y + dy) * self.columns + x + dx
+            for _, (dx, dy) in search.DIRECTIONS
+            if 0 <= x + dx < self.columns and 0 <= y + dy < self.rows
+        ]
+
+    def compute_shortest_path(self):
+        """Expand inconsistent nodes until the start's distance is settled.
+
+        A start standing on a barrier is nobody's successor, so its rhs is
+        recomputed from its walkable neighbors whenever one of them is
+        expanded, the way a forward search would leave the cell.
+        """
+        expanded = 0
+        entrances = ()
+        if self.environment.is_barrier(*search.cell_position(self.start, self.columns)):
+            entrances = set(self.adjacent(self.start))
+            self.update_vertex(self.start)
+        while self.top_key() < self.calculate_key(self.start) or self.rhs[self.start] != self.g[self.start]:
+            old_key, cell = heapq.heappop(self.open_set)
+            new_key = self.calculate_key(cell)
+            if old_key < new_key:
+                self.push(cell)  # The start moved since this key was computed
+                continue
+            del self.queued[cell]
+            expanded += 1
+            if self.g[cell] > self.rhs[cell]:
+                self.g[cell] = self.rhs[cell]
+            else:
+                self.g[cell] = math.inf
+                self.update_vertex(cell)
+            for neighbor in self.neighbors(cell):
+                self.update_vertex(neighbor)
+            if cell in entrances:
+                self.update_vertex(self.start)
+        return expanded
+
+    def move_to(self, start):
+        """Move the search start to the agent's new position."""
+        start = search.cell_id(start, self.columns)
+        self.key_modifier += self.heuristic(start)
+        self.start = start
+
+    def apply_changes(self):
+        """Update the nodes around every cell toggled since the last replan."""
+        changes = self.environment.barrier_changes[self.version:]
+        self.version = len(self.environment.barrier_changes)
+        if not changes:
+            return
+        self.refresh_costs()
+        for position in changes:
+            cell = search.cell_id(position, self.columns)
+            if self.environment.is_barrier(*position):
+                self.g[cell] = self.rhs[cell] = math.inf
+                self.queued.pop(cell, None)
+            else:
+                self.update_vertex(cell)
+            for neighbor in self.adjacent(cell):
+                if not self.environment.is_barrier(*search.cell_position(neighbor, self.columns)):
+                    self.update_vertex(neighbor)
+
+    def replan(self):
+        """Bring the tables up to date and return the (x, y) path from start to goal, or None."""
+        self.apply_changes()
+        self.nodes_expanded = self.compute_shortest_path()
+        if self.g[self.start] == math.inf:
+            return None
+        cell = self.start
+        path = [search.cell_position(cell, self.columns)]
+        while cell != self.goal:
+            best, following = math.inf, None
+            for neighbor in self.neighbors(cell):
+                cost = (self.step_cost(neighbor) if self.step_cost else 1) + self.g[neighbor]
+                if cost < best:
+                    best, following = cost, neighbor
+            if following is None:
+                return None
+            cell = following
+            path.append(search.cell_position(cell, self.columns))
+        return path
@@ -1,7 +1,43 @@
 import random
+from grid import BarrierView, CostView, OccupancyGrid
+
+
+class CostDict(dict):
+    """Dict of (x, y) to entry cost that counts its edits, so caches notice cost changes."""
+
+    edits = 0  # A class default, since unpickling sets items before the instance dict is restored
+
+    def __setitem__(self, position, cost):
+        super().__setitem__(position, cost)
+        self.edits += 1
+
+    def __delitem__(self, position):
+        super().__delitem__(position)
+        self.edits += 1
+
+    def pop(self, *args):
+        self.edits += 1
+        return super().pop(*args)
+
+    def popitem(self):
+        self.edits += 1
+        return super().popitem()
+
+    def setdefault(self, position, cost=None):
+        self.edits += 1
+        return super().setdefault(position, cost)
+
+    def update(self, *args, **kwargs):
+        super().update(*args, **kwargs)
+        self.edits += 1
+
+    def clear(self):
+        super().clear()
+        self.edits += 1
+
 
 class Environment:
-    def __init__(self, width, height, grid_size, num_tasks, num_barriers):
+    def __init__(self, width, height, grid_size, num_tasks, num_barriers, max_cell_cost=1, use_grid=False):
         self.width = width
         self.height = height
         self.grid_size = grid_size
@@ -9,6 +45,14 @@ class Environment:
         self.rows = height // grid_size
         self.task_locations = self.generate_tasks(num_tasks)
         self.barrier_locations = self.generate_random_locations(num_barriers, exclude=set(self.task_locations.keys()))
+        self.cell_costs = CostDict(self.generate_cell_costs(max_cell_cost))  # Cells not listed cost 1 to enter
+        self.barrier_changes = []  # Cells toggled by add_barrier/remove_barrier, in order
+        self.grid = None
+        if use_grid:
+            # Keep barriers and costs in NumPy arrays; the set/dict API becomes a view over them
+            self.grid = OccupancyGrid(self.columns, self.rows, self.barrier_locations, self.cell_costs)
+            self.barrier_locations = BarrierView(self.grid)
+            self.cell_costs = CostView(self.grid)
 
     def generate_tasks(self, count):
         """Generate task locations with unique task numbers."""
@@ -30,10 +74,61 @@ class Environment:
                 locations.add(location)
         return locations
 
+    def generate_cell_costs(self, max_cell_cost):
+        """Generate random entry costs from 1 to max_cell_cost for every open cell."""
+        if max_cell_cost <= 1:
+            return {}
+        return {
+            (x, y): random.randint(1, max_cell_cost)
+            for y in range(self.rows)
+            for x in range(self.columns)
+            if (x, y) not in self.barrier_locations
+        }
+
+    def add_barrier(self, x, y):
+        """Turn (x, y) into a barrier during a run. Returns False if it cannot be blocked."""
+        if not self.is_within_bounds(x, y) or (x, y) in self.task_locations or self.is_barrier(x, y):
+            return False
+        self.barrier_locations.add((x, y))
+        self.barrier_changes.append((x, y))
+        return True
+
+    def remove_barrier(self, x, y):
+        """Clear the barrier at (x, y) during a run. Returns False if there is none."""
+        if not self.is_within_bounds(x, y) or not self.is_barrier(x, y):
+            return False
+        self.barrier_locations.discard((x, y))
+        self.barrier_changes.append((x, y))
+        return True
+
+    def version(self):
+        """Return a count of the barrier and cost edits so far; caches compare it to notice any change."""
+        return len(self.barrier_changes) + self.cell_costs.edits
+
     def is_within_bounds(self, x, y):
         """Check if (x, y) is within the grid boundaries."""
         return 0 <= x < self.columns and 0 <= y < self.rows
 
     def is_barrier(self, x, y):
         """Check if (x, y) is a barrier."""
+        if self.grid is not None:
+            return self.is_within_bounds(x, y) and not self.grid.walkable[y, x]
         return (x, y) in self.barrier_locations
+
+    def cost(self, x, y):
+        """Return the cost of moving into (x, y)."""
+        if self.grid is not None:
+            return self.grid.cost_table[y * self.columns + x]
+        return self.cell_costs.get((x, y), 1)
+
+    def has_uniform_costs(self):
+        """Check whether every cell costs 1 to enter."""
+        if self.grid is not None:
+            return self.grid.is_uniform()
+        return not self.cell_costs
+
+    def min_cost(self):
+        """Return the cheapest entry cost of any cell."""
+        if self.grid is not None:
+            return self.grid.min_cost()
+        return min(1, min(self.cell_costs.values(), default=1))
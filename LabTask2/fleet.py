@@ -0,0 +1,252 @@
+import heapq
+import search
+from tour import DistanceCache
+
+MAX_DELAY = 20  # Ticks a plan may lose to waiting and detours before the agent gives up until the next tick
+
+
+class Fleet:
+    """Many agents sharing one environment, moving one cell per tick without colliding.
+
+    Idle agents bid for open tasks by path distance, read from one distance
+    field per task that every agent shares. The cheapest (agent, task) pair
+    wins first, like a sequential auction. Each winner then plans a
+    space-time path with cooperative A*: agents plan one at a time and
+    reserve the (cell, tick) pairs and moves of their paths, and later
+    plans may neither enter a reserved cell at the same tick nor swap
+    places with another agent. An agent that has arrived keeps its cell
+    until it plans again.
+
+    Agent state is kept in parallel lists indexed by agent, so a tick
+    advances every agent, completes tasks and frees stale reservations in
+    a few passes. Moves take one tick whatever a cell costs, so only
+    uniform-cost grids are supported.
+    """
+
+    def __init__(self, environment, starts, respawn=False, max_delay=MAX_DELAY):
+        if not environment.has_uniform_costs():
+            raise ValueError("Fleet planning needs a grid where every cell costs 1")
+        self.environment = environment
+        self.columns = environment.columns
+        self.size = environment.columns * environment.rows
+        self.neighbors = None  # Walkable neighbor ids of every cell id, rebuilt when barriers change
+        self.distances = DistanceCache(environment)
+        self.respawn = respawn  # Replace every completed task with a new one at a random cell
+        self.max_delay = max_delay
+        self.version = None
+        self.time = 0
+        self.next_task_number = max(environment.task_locations.values(), default=0) + 1
+
+        # One entry per agent
+        self.positions = [search.cell_id(start, self.columns) for start in starts]
+        if len(set(self.positions)) != len(self.positions):
+            raise ValueError("Agents must start on different cells")
+        self.paths = [None] * len(starts)  # Cell ids from the tick the plan was made on, or None when idle
+        self.departures = [0] * len(starts)  # Tick each path starts at
+        self.tasks = [None] * len(starts)  # Cell id of the task each agent is heading for
+
+        # Reservations
+        self.reserved = set()  # tick * size + cell of every planned (cell, tick)
+        self.moves = set()  # (tick, from cell, to cell) of every planned step
+        self.expiry = {}  # tick -> (vertex keys, moves) reserved for it, freed once the tick has passed
+        self.latest = {}  # cell -> last tick it is reserved for
+        self.parked = {cell: 0 for cell in self.positions}  # cell -> tick from which an agent stays there
+
+        self.tasks_completed = 0
+        self.plans = 0
+        self.failed_plans = 0  # Plans that found no conflict-free path in time; the agent retries later
+        self.nodes_expanded = 0
+        self.build_neighbors()
+        self.dispatch()
+
+    def __len__(self):
+        return len(self.positions)
+
+    def build_neighbors(self):
+        neighbors = search.neighbor_function(self.environment)
+        self.neighbors = [neighbors(cell) + [cell] for cell in range(self.size)]  # Waiting is a move too
+        self.version = len(self.environment.barrier_changes)
+
+    def agent_positions(self):
+        """Return the (x, y) position of every agent."""
+        return [search.cell_position(cell, self.columns) for cell in self.positions]
+
+    def step(self):
+        """Advance every agent by one tick, complete the tasks they reached and hand out new ones."""
+        if self.version != len(self.environment.barrier_changes):
+            self.replan_all()
+        self.time += 1
+        time = self.time
+        finished = []
+        for agent, path in enumerate(self.paths):
+            if path is None:
+                continue
+            offset = time - self.departures[agent]
+            if offset < len(path) - 1:
+                self.positions[agent] = path[offset]
+                continue
+            self.positions[agent] = path[-1]
+            if self.tasks[agent] == path[-1]:
+                finished.append(agent)
+            self.paths[agent] = None
+            self.tasks[agent] = None
+
+        tasks = self.environment.task_locations
+        for agent in finished:
+            if tasks.pop(search.cell_position(self.positions[agent], self.columns), None) is not None:
+                self.tasks_completed += 1
+                self.distances.fields.pop(search.cell_position(self.positions[agent], self.columns), None)
+        if self.respawn:
+            for _ in finished:
+                self.spawn_task()
+
+        for tick in [tick for tick in self.expiry if tick < time]:
+            vertices, moves = self.expiry.pop(tick)
+            self.reserved.difference_update(vertices)
+            self.moves.difference_update(moves)
+        self.dispatch()
+
+    def spawn_task(self):
+        """Add a task on a random cell that is free of barriers, tasks and agents."""
+        environment = self.environment
+        taken = set(environment.task_locations) | set(environment.barrier_locations)
+        taken.update(search.cell_position(cell, self.columns) for cell in self.parked)
+        taken.update(search.cell_position(cell, self.columns) for cell in self.positions)
+        if len(taken) >= self.size:
+            return
+        location = environment.generate_random_locations(1, exclude=taken).pop()
+        environment.task_locations[location] = self.next_task_number
+        self.next_task_number += 1
+
+    def dispatch(self):
+        """Auction the open tasks to idle agents and plan a path for every winner."""
+        idle = [agent for agent, path in enumerate(self.paths) if path is None]
+        claimed = set(self.tasks)
+        open_tasks = [(number, location) for location, number in self.environment.task_locations.items()
+                      if search.cell_id(location, self.columns) not in claimed]
+        if not idle or not open_tasks:
+            return
+        bids = []
+        for number, location in open_tasks:
+            field = self.distances.field(location)
+            for agent in idle:
+                distance = search.field_distance(self.environment, field,
+                                                 search.cell_position(self.positions[agent], self.columns))
+                if distance != search.UNVISITED:
+                    bids.append((distance, number, agent, search.cell_id(location, self.columns)))
+        bids.sort()
+        bidding = set(idle)
+        for _, _, agent, task in bids:
+            if agent not in bidding or task in claimed:
+                continue
+            bidding.discard(agent)  # One plan per agent and tick, even if it fails
+            if self.plan(agent, task):
+                claimed.add(task)
+
+    def plan(self, agent, goal):
+        """Find and reserve a conflict-free path for agent to goal, starting now. Returns False on failure."""
+        start = self.positions[agent]
+        del self.parked[start]  # The agent's own cell must not block it
+        path = self.space_time_astar(start, goal)
+        self.plans += 1
+        if path is None:
+            self.failed_plans += 1
+            self.parked[start] = self.time
+            return False
+        self.reserve(path)
+        self.paths[agent] = path
+        self.departures[agent] = self.time
+        self.tasks[agent] = goal
+        return True
+
+    def space_time_astar(self, start, goal):
+        """Search over (cell, tick) states from start at the current tick, with waiting as a move.
+
+        The goal's distance field is an exact heuristic when no one is in
+        the way. The goal only counts as reached once no other plan enters
+        it later, since the agent stays there. Gives up after max_delay
+        ticks more than the unobstructed distance and returns None.
+        """
+        field = self.distances.field(search.cell_position(goal, self.columns))
+        distance = search.field_distance(self.environment, field, search.cell_position(start, self.columns))
+        if distance == search.UNVISITED:
+            return None
+        size = self.size
+        reserved, moves, parked, neighbors = self.reserved, self.moves, self.parked, self.neighbors
+        deadline = self.time + distance + self.max_delay
+        settles = self.latest.get(goal, -1) + 1  # First tick the goal is no longer reserved by anyone
+        if goal in parked:
+            return None  # Another agent stays there
+        key = self.time * size + start
+        came_from = {key: key}
+        open_set = [(self.time + distance, distance, key)]
+        while open_set:
+            _, h, key = heapq.heappop(open_set)
+            tick, cell = divmod(key, size)
+            if cell == goal and tick >= settles:
+                path = [cell]
+                while came_from[key] != key:
+                    key = came_from[key]
+                    path.append(key % size)
+                path.reverse()
+                return path
+            self.nodes_expanded += 1
+            tick += 1
+            for neighbor in neighbors[cell]:
+                next_key = tick * size + neighbor
+                if next_key in came_from or next_key in reserved or (tick, neighbor, cell) in moves:
+                    continue
+                since = parked.get(neighbor)
+                if since is not None and since <= tick:
+                    continue
+                h = field[neighbor]
+                if tick + h > deadline:
+                    continue
+                came_from[next_key] = key
+                heapq.heappush(open_set, (tick + h, h, next_key))
+        return None
+
+    def reserve(self, path):
+        """Reserve every (cell, tick) and move of a path planned now, and park its end."""
+        size = self.size
+        for offset, cell in enumerate(path):
+            tick = self.time + offset
+            vertices, moves = self.expiry.setdefault(tick, ([], []))
+            vertices.append(tick * size + cell)
+            self.reserved.add(tick * size + cell)
+            if offset:
+                move = (tick, path[offset - 1], cell)
+                moves.append(move)
+                self.moves.add(move)
+            if self.latest.get(cell, -1) < tick:
+                self.latest[cell] = tick
+        self.parked[path[-1]] = self.time + len(path) - 1
+
+    def replan_all(self):
+        """Drop every reservation after a barrier edit and plan each busy agent again from where it is."""
+        self.build_neighbors()
+        self.reserved.clear()
+        self.moves.clear()
+        self.expiry.clear()
+        self.latest.clear()
+        self.parked = {cell: self.time for cell in self.positions}
+        for agent, goal in enumerate(self.tasks):
+            self.paths[agent] = None
+            self.tasks[agent] = None
+            if goal is not None:
+                self.plan(agent, goal)
+
+    def conflicts(self, previous):
+        """Count agents sharing a cell, or swapping cells, compared with the previous positions."""
+        count = len(self.positions) - len(set(self.positions))
+        moved = {(before, after) for before, after in zip(previous, self.positions) if before != after}
+        count += sum((after, before) in moved for before, after in moved)
+        return count
+
+
+def spread_starts(environment, count):
+    """Pick distinct random open cells without tasks for count agents."""
+    taken = set(environment.task_locations) | set(environment.barrier_locations)
+    if count > environment.columns * environment.rows - len(taken):
+        raise ValueError(f"No room for {count} agents")
+    return sorted(environment.generate_random_locations(count, exclude=taken))
@@ -0,0 +1,159 @@
+from collections.abc import MutableMapping, MutableSet
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is only needed for Environment(use_grid=True)
+    np = None
+
+# Bit k of a direction mask is set when the neighbor in DIRECTION_STEPS[k] is walkable
+DIRECTION_STEPS = [(0, -1), (0, 1), (-1, 0), (1, 0)]  # Up, down, left, right
+
+
+class OccupancyGrid:
+    """NumPy occupancy and cost arrays with a precomputed neighbor table.
+
+    ``walkable`` and ``costs`` are (rows, columns) arrays. ``direction_mask``
+    holds one walkability bit per direction for every cell, and
+    ``neighbor_table[cell_id]`` lists the walkable neighbor ids of a cell in
+    up/down/left/right order, so search loops avoid per-call bounds checks
+    and tuple hashing. ``cost_table`` mirrors ``costs`` as a flat list for
+    the same reason.
+    """
+
+    def __init__(self, columns, rows, barriers=(), cell_costs=None):
+        if np is None:
+            raise ImportError("OccupancyGrid requires numpy (pip install numpy)")
+        self.columns = columns
+        self.rows = rows
+        self.walkable = np.ones((rows, columns), dtype=bool)
+        self.costs = np.ones((rows, columns), dtype=np.int32)
+        for x, y in barriers:
+            self.walkable[y, x] = False
+        for (x, y), cost in (cell_costs or {}).items():
+            self.costs[y, x] = cost
+        self.barrier_count = int(np.count_nonzero(~self.walkable))
+        self.non_unit_costs = int(np.count_nonzero(self.costs != 1))
+        self.cost_table = self.costs.ravel().tolist()
+        self.cost_edits = 0  # Calls to set_cost, so caches notice cost changes
+        self.rebuild_neighbors()
+
+    def rebuild_neighbors(self):
+        """Recompute the direction mask and neighbor table from the walkable array."""
+        padded = np.zeros((self.rows + 2, self.columns + 2), dtype=bool)
+        padded[1:-1, 1:-1] = self.walkable
+        mask = np.zeros((self.rows, self.columns), dtype=np.uint8)
+        for bit, (dx, dy) in enumerate(DIRECTION_STEPS):
+            shifted = padded[1 + dy:self.rows + 1 + dy, 1 + dx:self.columns + 1 + dx]
+            mask |= shifted.astype(np.uint8) << bit
+        self.direction_mask = mask.ravel()
+
+        ids = np.arange(self.rows * self.columns).reshape(self.rows, self.columns)
+        columns = []
+        for bit, (dx, dy) in enumerate(DIRECTION_STEPS):
+            neighbor_ids = ids + dy * self.columns + dx
+            columns.append(np.where(mask & (1 << bit), neighbor_ids, -1).ravel())
+        table = np.stack(columns, axis=1).tolist()
+        self.neighbor_table = [[cell for cell in row if cell >= 0] for row in table]
+
+    def cell_neighbors(self, cell):
+        """List the walkable neighbor ids of a cell from its direction mask."""
+        x, y = cell % self.columns, cell // self.columns
+        mask = self.direction_mask[cell]
+        return [
+            (y + dy) * self.columns + x + dx
+            for bit, (dx, dy) in enumerate(DIRECTION_STEPS)
+            if mask & (1 << bit)
+        ]
+
+    def set_barrier(self, x, y, blocked):
+        """Block or open a cell and patch the neighbor table around it."""
+        if self.walkable[y, x] != blocked:
+            return  # Already in the requested state
+        self.walkable[y, x] = not blocked
+        self.barrier_count += 1 if blocked else -1
+        for bit, (dx, dy) in enumerate(DIRECTION_STEPS):
+            nx, ny = x - dx, y - dy  # The neighbor that sees this cell in direction bit
+            if 0 <= nx < self.columns and 0 <= ny < self.rows:
+                neighbor = ny * self.columns + nx
+                if blocked:
+                    self.direction_mask[neighbor] &= ~(1 << bit) & 0xFF
+                else:
+                    self.direction_mask[neighbor] |= 1 << bit
+                self.neighbor_table[neighbor] = self.cell_neighbors(neighbor)
+
+    def set_cost(self, x, y, cost):
+        """Set the cost of entering a cell."""
+        self.non_unit_costs += int(cost != 1) - int(self.costs[y, x] != 1)
+        self.costs[y, x] = cost
+        self.cost_table[y * self.columns + x] = cost
+        self.cost_edits += 1
+
+    def is_uniform(self):
+        """Check whether every cell costs 1 to enter."""
+        return self.non_unit_costs == 0
+
+    def min_cost(self):
+        """Return the cheapest entry cost of any cell."""
+        return int(self.costs.min())
+
+
+class BarrierView(MutableSet):
+    """Set of barrier (x, y) tuples backed by an OccupancyGrid."""
+
+    def __init__(self, grid):
+        self.grid = grid
+
+    def __contains__(self, position):
+        x, y = position
+        return 0 <= x < self.grid.columns and 0 <= y < self.grid.rows and not self.grid.walkable[y, x]
+
+    def __iter__(self):
+        ys, xs = np.nonzero(~self.grid.walkable)
+        return zip(xs.tolist(), ys.tolist())
+
+    def __len__(self):
+        return self.grid.barrier_count
+
+    def add(self, position):
+        self.grid.set_barrier(*position, True)
+
+    def discard(self, position):
+        if position in self:
+            self.grid.set_barrier(*position, False)
+
+    def __repr__(self):
+        return f"BarrierView({set(self)!r})"
+
+
+class CostView(MutableMapping):
+    """Mapping of (x, y) to entry cost for cells that do not cost 1, backed by an OccupancyGrid."""
+
+    def __init__(self, grid):
+        self.grid = grid
+
+    @property
+    def edits(self):
+        return self.grid.cost_edits
+
+    def __getitem__(self, position):
+        x, y = position
+        if not (0 <= x < self.grid.columns and 0 <= y < self.grid.rows) or self.grid.costs[y, x] == 1:
+            raise KeyError(position)
+        return int(self.grid.costs[y, x])
+
+    def __setitem__(self, position, cost):
+        self.grid.set_cost(*position, cost)
+
+    def __delitem__(self, position):
+        self[position]  # Raises KeyError for cells that already cost 1
+        self.grid.set_cost(*position, 1)
+
+    def __iter__(self):
+        ys, xs = np.nonzero(self.grid.costs != 1)
+        return zip(xs.tolist(), ys.tolist())
+
+    def __len__(self):
+        return self.grid.non_unit_costs
+
+    def __repr__(self):
+        return f"CostView({dict(self)!r})"
@@ -0,0 +1,139 @@
+# headless.py
+import os
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")  # Never open a window
+
+import argparse
+import csv
+import json
+import math
+import multiprocessing
+import random
+import sys
+import time
+from agent import Agent
+from environment import Environment
+
+METRICS = ["episode", "seed", "algorithm", "planner", "columns", "rows", "tasks", "tasks_completed",
+           "path_cost", "moves", "nodes_expanded", "searches", "cache_hit_rate", "search_time", "episode_time"]
+
+
+def run_episode(agent, max_moves=None):
+    """Move the agent until every reachable task is completed.
+
+    Returns (moves, searches, search_time) for the episode.
+    """
+    agent.check_task_completion()  # A task may sit on the starting cell
+    moves = searches = 0
+    search_time = 0.0
+    limit = math.inf if max_moves is None else max_moves
+    while agent.environment.task_locations and moves < limit:
+        start = time.perf_counter()
+        agent.find_next_task()
+        search_time += time.perf_counter() - start
+        searches += 1
+        if not agent.path:
+            break  # Nothing reachable is left
+        while agent.path and moves < limit:
+            agent.move()
+            moves += 1
+    return moves, searches, search_time
+
+
+def simulate(job):
+    """Run one seeded episode and return its metrics as a dict."""
+    episode, seed, algorithm, options = job
+    random.seed(seed)
+    environment = Environment(options["columns"], options["rows"], 1, num_tasks=options["tasks"],
+                              num_barriers=options["barriers"], max_cell_cost=options["max_cell_cost"],
+                              use_grid=options["grid"])
+    agent = Agent(environment, 1, algorithm=algorithm, planner=options["planner"])
+    num_tasks = len(environment.task_locations)
+    start = time.perf_counter()
+    moves, searches, search_time = run_episode(agent, options["max_moves"])
+    return {
+        "episode": episode,
+        "seed": seed,
+        "algorithm": algorithm,
+        "planner": options["planner"],
+        "columns": environment.columns,
+        "rows": environment.rows,
+        "tasks": num_tasks,
+        "tasks_completed": agent.task_completed,
+        "path_cost": agent.total_path_cost,
+        "moves": moves,
+        "nodes_expanded": agent.total_nodes_expanded,
+        "searches": searches,
+        "cache_hit_rate": round(agent.path_cache.hit_rate(), 4),
+        "search_time": round(search_time, 6),
+        "episode_time": round(time.perf_counter() - start, 6),
+    }
+
+
+def open_writer(path):
+    """Return (write_row, close) for a CSV or JSONL file chosen by extension; '-' is stdout."""
+    stream = sys.stdout if path == "-" else open(path, "w", newline="")
+    close = (lambda: None) if stream is sys.stdout else stream.close
+    if path.endswith(".csv"):
+        writer = csv.DictWriter(stream, fieldnames=METRICS)
+        writer.writeheader()
+        return writer.writerow, close
+    return (lambda row: stream.write(json.dumps(row) + "\n")), close
+
+
+def summarize(rows):
+    """Print mean metrics per algorithm to stderr."""
+    for algorithm in sorted({row["algorithm"] for row in rows}):
+        group = [row for row in rows if row["algorithm"] == algorithm]
+        means = {key: sum(row[key] for row in group) / len(group)
+                 for key in ("path_cost", "nodes_expanded", "search_time", "tasks_completed")}
+        print(f"{algorithm:>4}: {len(group)} episodes, mean cost {means['path_cost']:.1f}, "
+              f"nodes expanded {means['nodes_expanded']:.0f}, search time {means['search_time'] * 1000:.2f} ms, "
+              f"tasks completed {means['tasks_completed']:.2f}", file=sys.stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run seeded LabTask2 episodes without a display.")
+    parser.add_argument("--episodes", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0, help="episode i uses seed + i")
+    parser.add_argument("--algorithms", nargs="+", default=["UCS", "A*"])
+    parser.add_argument("--planner", choices=["nearest", "tour"], default="nearest")
+    parser.add_argument("--columns", type=int, default=20)
+    parser.add_argument("--rows", type=int, default=15)
+    parser.add_argument("--tasks", type=int, default=5)
+    parser.add_argument("--barriers", type=int, default=15)
+    parser.add_argument("--max-cell-cost", type=int, default=1, help="cells cost 1..N to enter")
+    parser.add_argument("--grid", action="store_true", help="use the NumPy occupancy grid backend")
+    parser.add_argument("--max-moves", type=int, default=None, help="stop an episode after this many moves")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="processes to fan out over")
+    parser.add_argument("--output", default="-", help="metrics file (.csv or .jsonl); '-' writes JSONL to stdout")
+    args = parser.parse_args()
+
+    options = {key: getattr(args, key) for key in
+               ("columns", "rows", "tasks", "barriers", "max_cell_cost", "grid", "planner", "max_moves")}
+    # Every algorithm replays the same seeds, so the episodes are directly comparable
+    jobs = [(episode, args.seed + episode, algorithm, options)
+            for episode in range(args.episodes) for algorithm in args.algorithms]
+    write_row, close = open_writer(args.output)
+    rows = []
+    start = time.perf_counter()
+    try:
+        if args.workers > 1:
+            with multiprocessing.Pool(args.workers) as pool:
+                results = pool.imap(simulate, jobs, chunksize=max(1, len(jobs) // (args.workers * 8)))
+                for row in results:
+                    write_row(row)
+                    rows.append(row)
+        else:
+            for row in map(simulate, jobs):
+                write_row(row)
+                rows.append(row)
+    finally:
+        close()
+    elapsed = time.perf_counter() - start
+    print(f"{len(rows)} episodes in {elapsed:.2f} s ({len(rows) / elapsed:.0f} episodes/s)", file=sys.stderr)
+    summarize(rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,209 @@
+import heapq
+import math
+
+
+def lowest_bit(bits):
+    """Index of the lowest set bit of a positive int."""
+    return (bits & -bits).bit_length() - 1
+
+
+class JumpGrid:
+    """Row bitsets of a uniform 4-connected grid, used by jump point search.
+
+    Bit x of open_rows[y] is set when (x, y) is walkable. A horizontal
+    scan moving right must stop at x when a cell above or below it is open
+    while the cell behind that one is blocked (a forced neighbor), so those
+    positions are precomputed per row in stops_right (and stops_left).
+    Scans then find the next wall or stop with a couple of big-int
+    operations instead of stepping cell by cell. Barrier edits are applied
+    from environment.barrier_changes, rebuilding only the touched rows.
+    """
+
+    def __init__(self, environment):
+        self.environment = environment
+        self.columns = environment.columns
+        self.rows = environment.rows
+        full = (1 << self.columns) - 1
+        self.open_rows = [full] * self.rows
+        for x, y in environment.barrier_locations:
+            self.open_rows[y] &= ~(1 << x)
+        self.blocked_rows = [0] * self.rows
+        self.stops_right = [0] * self.rows
+        self.stops_left = [0] * self.rows
+        self.rebuild_rows(range(self.rows))
+        self.version = len(environment.barrier_changes)
+
+    def rebuild_rows(self, rows):
+        """Recompute the derived bitsets of the given rows from open_rows."""
+        sentinel = 1 << self.columns  # A wall just past the right edge ends every scan
+        for y in rows:
+            self.blocked_rows[y] = ~self.open_rows[y] & (sentinel - 1) | sentinel
+            neighbors = [self.open_rows[row] for row in (y - 1, y + 1) if 0 <= row < self.rows]
+            # Open cells with a wall (or the edge) to their left, or to their right
+            self.stops_right[y] = 0
+            self.stops_left[y] = 0
+            for row in neighbors:
+                self.stops_right[y] |= row & ~(row << 1)
+                self.stops_left[y] |= row & ~(row >> 1)
+
+    def refresh(self):
+        """Apply barrier edits made since the grid was built or last refreshed."""
+        changes = self.environment.barrier_changes
+        if self.version == len(changes):
+            return
+        touched = set()
+        for x, y in changes[self.version:]:
+            if self.environment.is_barrier(x, y):
+                self.open_rows[y] &= ~(1 << x)
+            else:
+                self.open_rows[y] |= 1 << x
+            touched.update(row for row in (y - 1, y, y + 1) if 0 <= row < self.rows)
+        self.rebuild_rows(touched)
+        self.version = len(changes)
+
+    def is_open(self, x, y):
+        return 0 <= x < self.columns and 0 <= y < self.rows and self.open_rows[y] >> x & 1
+
+    def scan(self, x, y, dx, goal_bits):
+        """Jump from (x, y) along the row; return the x of the jump point reached, or None at a wall."""
+        stops = (self.stops_right[y] if dx > 0 else self.stops_left[y]) | goal_bits.get(y, 0)
+        blocked = self.blocked_rows[y]
+        if dx > 0:
+            wall = x + 1 + lowest_bit(blocked >> (x + 1))
+            ahead = stops >> (x + 1)
+            if ahead:
+                stop = x + 1 + lowest_bit(ahead)
+                if stop < wall:
+                    return stop
+            return None
+        mask = (1 << x) - 1  # Everything left of x
+        wall = (blocked & mask).bit_length() - 1
+        stop = (stops & mask).bit_length() - 1
+        return stop if stop > wall else None
+
+    def climb(self, x, y, dy, goal_bits):
+        """Jump from (x, y) along the column; return the y of the jump point reached, or None at a wall.
+
+        A cell is a jump point when a row scan from it in either direction
+        reaches one, so the search can turn there.
+        """
+        bit = 1 << x
+        y += dy
+        while 0 <= y < self.rows and self.open_rows[y] & bit:
+            if goal_bits.get(y, 0) & bit:
+                return y
+            if self.scan(x, y, 1, goal_bits) is not None or self.scan(x, y, -1, goal_bits) is not None:
+                return y
+            y += dy
+        return None
+
+
+def successor_directions(grid, x, y, direction):
+    """Directions to jump in from (x, y), given the direction it was reached in.
+
+    After a vertical step the search may go on or turn either way; after a
+    horizontal step it only goes on, unless a blocked cell behind forces a
+    turn. The start jumps in every direction.
+    """
+    if direction is None:
+        return [(0, -1), (0, 1), (-1, 0), (1, 0)]
+    dx, dy = direction
+    if dy:
+        return [(0, dy), (-1, 0), (1, 0)]
+    directions = [(dx, 0)]
+    for side in (-1, 1):
+        if grid.is_open(x, y + side) and not grid.is_open(x - dx, y + side):
+            directions.append((0, side))
+    return directions
+
+
+def jump_point_search(grid, start, goals):
+    """Run A* over jump points from start and return the path to the nearest goal.
+
+    Only valid on uniform-cost grids. Like search.astar_search, goals at
+    the same distance are resolved in the order they are given. The
+    expansion count covers jump points only; the cells between them are
+    skipped by row and column scans. Returns (path, nodes_expanded), with
+    path None when no goal is reachable.
+    """
+    grid.refresh()
+    rank = {}  # Reachable-looking goals and their position in the goal order (used for ties)
+    for index, goal in enumerate(goals):
+        if grid.is_open(*goal) or goal == start:
+            rank.setdefault(goal, index)
+    if not rank:
+        return None, 0
+    goal_cells = list(rank)
+    goal_bits = {}  # Row -> bitset of the goals in it, so scans stop on them
+    for gx, gy in goal_cells:
+        goal_bits[gy] = goal_bits.get(gy, 0) | 1 << gx
+
+    def heuristic(x, y):
+        return min(abs(x - gx) + abs(y - gy) for gx, gy in goal_cells)
+
+    came_from = {start: start}
+    g_score = {start: 0}
+    closed = set()
+    counter = 0  # Breaks ties in insertion order
+    h = heuristic(*start)
+    open_set = [(h, h, counter, start, None)]
+    best = None
+    expanded = 0
+
+    while open_set:
+        f, _, _, node, direction = heapq.heappop(open_set)
+        if node in closed:
+            continue  # Stale entry for a node that was reached more cheaply
+        if best is not None and f > g_score[best]:
+            break  # Nothing left can reach a goal any sooner
+        closed.add(node)
+
+        if node in rank:
+            if best is None or rank[node] < rank[best]:
+                best = node
+            if rank[best] == 0:
+                break  # No other goal can win a tie against the first one
+            continue
+
+        expanded += 1
+        x, y = node
+        g = g_score[node]
+        for dx, dy in successor_directions(grid, x, y, direction):
+            if dx:
+                jx = grid.scan(x, y, dx, goal_bits)
+                if jx is None:
+                    continue
+                successor = (jx, y)
+            else:
+                jy = grid.climb(x, y, dy, goal_bits)
+                if jy is None:
+                    continue
+                successor = (x, jy)
+            if successor in closed:
+                continue
+            new_g = g + abs(successor[0] - x) + abs(successor[1] - y)
+            if new_g < g_score.get(successor, math.inf):
+                g_score[successor] = new_g
+                came_from[successor] = node
+                counter += 1
+                h = heuristic(*successor)
+                heapq.heappush(open_set, (new_g + h, h, counter, successor, (dx, dy)))
+    if best is None:
+        return None, expanded
+    return expand_path(came_from, best), expanded
+
+
+def expand_path(came_from, goal):
+    """Rebuild the cell-by-cell path from the chain of jump points ending at goal."""
+    jump_points = [goal]
+    while came_from[jump_points[-1]] != jump_points[-1]:
+        jump_points.append(came_from[jump_points[-1]])
+    jump_points.reverse()
+    path = [jump_points[0]]
+    for (x, y), (nx, ny) in zip(jump_points, jump_points[1:]):
+        step_x = (nx > x) - (nx < x)
+        step_y = (ny > y) - (ny < y)
+        while (x, y) != (nx, ny):
+            x, y = x + step_x, y + step_y
+            path.append((x, y))
+    return path
@@ -0,0 +1,136 @@
+import math
+from collections import OrderedDict
+import search
+
+PATH_CACHE_SIZE = 1024  # Paths kept before the least recently used is dropped
+
+
+class PathCache:
+    """Bounded LRU cache of search results keyed by (start, goal, variant).
+
+    variant tells searches apart that may answer differently (algorithm and
+    heuristic weight). Each entry also keeps the goals it was searched
+    among: an optimal path to goal answers any later query from start whose
+    goals include goal and are all among those, so the smaller goal set
+    left after a task completes is a lookup. Goals found unreachable are
+    kept under goal None. For optimal searches every cell on a cached path
+    is indexed as well: the rest of the path from that cell is a cheapest
+    path to the same goal, and none of the other goals can be nearer from
+    there. Existing distance fields answer queries whose goals all have one.
+    Everything is dropped when barriers or cell costs change.
+    """
+
+    def __init__(self, environment, max_size=PATH_CACHE_SIZE):
+        self.environment = environment
+        self.max_size = max_size
+        self.version = environment.version()  # Barrier and cost edits the cached paths reflect
+        self.paths = OrderedDict()  # (start, goal, variant) -> (path tuple or None, goals searched among, optimal)
+        self.suffixes = {}  # (cell, goal, variant) -> (key of a cached optimal path through cell, offset of cell)
+        self.hits = 0  # Answered by a cached result for the query's start
+        self.suffix_hits = 0  # Answered by the tail of a cached path passing through the start
+        self.field_hits = 0  # Answered from distance fields of every goal
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.paths)
+
+    def get(self, start, goals, variant, distance_cache=None):
+        """Return (True, path) if the query can be answered without searching, else (False, None).
+
+        distance_cache is a tour.DistanceCache whose existing fields may be
+        used; no new field is computed.
+        """
+        if self.version != self.environment.version():
+            self.clear()  # Barriers or costs changed since the paths were found
+        goal_set = frozenset(goals)
+        for goal in (None, *goals):  # Goals in query order, so ties go to the first one like a search
+            key = (start, goal, variant)
+            entry = self.paths.get(key)
+            if entry is not None and answers(entry, goal_set):
+                self.paths.move_to_end(key)
+                self.hits += 1
+                return True, entry[0]
+            suffix = self.suffixes.get(key)
+            if suffix is not None and answers(self.paths[suffix[0]], goal_set):
+                owner, offset = suffix
+                self.paths.move_to_end(owner)
+                self.suffix_hits += 1
+                return True, self.paths[owner][0][offset:]
+        if distance_cache is not None:
+            path = self.field_path(start, goals, distance_cache)
+            if path is not False:
+                self.field_hits += 1
+                self.put(start, goals, variant, path, optimal=True)
+                return True, path
+        self.misses += 1
+        return False, None
+
+    def field_path(self, start, goals, distance_cache):
+        """Follow the field of the nearest goal (ties go to the first), or False if a goal has no field."""
+        fields = [distance_cache.cached_field(goal) for goal in goals]
+        if not goals or any(field is None for field in fields):
+            return False
+        best, nearest = math.inf, None
+        for field in fields:
+            distance = search.field_distance(self.environment, field, start)  # Also covers a blocked start
+            if distance != search.UNVISITED and distance < best:
+                best, nearest = distance, field
+        if nearest is None:
+            return None
+        return search.follow_distance_field(self.environment, nearest, start)
+
+    def put(self, start, goals, variant, path, optimal=False):
+        """Cache the answer of a search over goals; optimal paths also index every cell along them."""
+        goal_set = frozenset(goals)
+        if path is None:
+            optimal = True  # Every goal is unreachable whichever search says so
+        key = (start, None if path is None else path[-1], variant)
+        entry = self.paths.get(key)
+        if entry is not None:
+            self.paths.move_to_end(key)
+            if entry[2] and optimal:
+                # The goal is nearest (or unreachable) among the goals of both searches
+                self.paths[key] = (entry[0], entry[1] | goal_set, True)
+            if entry[2] or not optimal:
+                return
+        self.paths[key] = (None if path is None else tuple(path), goal_set, optimal)
+        if optimal and path:
+            for offset, cell in enumerate(path[1:], 1):
+                self.suffixes.setdefault((cell, path[-1], variant), (key, offset))
+        while len(self.paths) > self.max_size:
+            self.evict()
+
+    def evict(self):
+        """Drop the least recently used path and the suffix entries that point into it."""
+        key, (path, _, _) = self.paths.popitem(last=False)
+        _, goal, variant = key
+        for cell in path or ():
+            suffix_key = (cell, goal, variant)
+            if self.suffixes.get(suffix_key, (None,))[0] == key:
+                del self.suffixes[suffix_key]
+
+    def clear(self):
+        """Forget every cached path."""
+        self.paths.clear()
+        self.suffixes.clear()
+        self.version = self.environment.version()
+
+    def hit_rate(self):
+        """Return the fraction of queries answered without a search."""
+        hits = self.hits + self.suffix_hits + self.field_hits
+        queries = hits + self.misses
+        return hits / queries if queries else 0.0
+
+    def stats(self):
+        return (f"{self.hits} hits, {self.suffix_hits} suffix hits, {self.field_hits} field hits, "
+                f"{self.misses} misses ({self.hit_rate():.1%} hit rate), {len(self)} cached")
+
+
+def answers(entry, goals):
+    """Check whether a cached entry answers a query over a frozenset of goals.
+
+    Optimal paths and unreachable results answer any subset of the goals
+    they were searched among; other paths only the same goals.
+    """
+    _, searched, optimal = entry
+    return goals <= searched if optimal else goals == searched
@@ -0,0 +1,185 @@
+import pygame
+
+BACKGROUND_COLOR = (255, 255, 255)
+GRID_LINE_COLOR = (200, 200, 200)
+BARRIER_COLOR = (0, 0, 0)       # Barrier color is black
+TASK_COLOR = (255, 0, 0)        # Task color is red
+TASK_TEXT_COLOR = (255, 255, 255)
+TEXT_COLOR = (0, 0, 0)
+BUTTON_COLOR = (0, 200, 0)
+BUTTON_HOVER_COLOR = (0, 255, 0)
+BUTTON_TEXT_COLOR = (255, 255, 255)
+STATUS_LINE_HEIGHT = 30
+STATUS_TOP = 20
+
+
+class GridRenderer:
+    """Draws the grid, tasks, agent and status panel, repainting only what changed.
+
+    Grid lines, barriers and the panel separator are baked into a cached
+    background once; barriers toggled later are patched into it from
+    environment.barrier_changes. Every frame the renderer compares the
+    tasks, agent position, status lines and button states with what it
+    drew last time, restores the background under the rects that changed,
+    redraws what overlaps them and hands only those rects to
+    pygame.display.update. Text surfaces are rendered once and cached.
+    """
+
+    def __init__(self, screen, environment, agent, font, grid_size, width, height):
+        self.screen = screen
+        self.agent = agent
+        self.font = font
+        self.grid_size = grid_size
+        self.width = width  # Width of the grid area; the status panel is to its right
+        self.height = height
+        self.labels = {}  # (text, color) -> rendered surface, for task numbers and button labels
+        self.status_lines = []  # (text, surface) drawn on each status line
+        self.buttons = {}  # Button rect (as a tuple) -> (label, visible, hovered) last drawn
+        self.set_environment(environment)
+
+    def set_environment(self, environment):
+        """Draw a (possibly new) environment from scratch on the next frame."""
+        self.environment = environment
+        self.background = self.render_background()
+        self.barrier_version = len(environment.barrier_changes)
+        self.tasks = {}
+        self.agent_rect = None
+        self.status_lines = []
+        self.buttons = {}
+        self.full_redraw = True
+
+    def render_background(self):
+        """Pre-render the grid lines, barriers and panel separator."""
+        background = pygame.Surface(self.screen.get_size())
+        background.fill(BACKGROUND_COLOR)
+        for x in range(self.environment.columns):
+            for y in range(self.environment.rows):
+                self.paint_cell(background, x, y)
+        pygame.draw.line(background, (0, 0, 0), (self.width, 0), (self.width, self.height))
+        return background
+
+    def cell_rect(self, x, y):
+        return pygame.Rect(x * self.grid_size, y * self.grid_size, self.grid_size, self.grid_size)
+
+    def paint_cell(self, surface, x, y):
+        """Paint one cell of the background: a barrier, or an empty cell with its grid lines."""
+        rect = self.cell_rect(x, y)
+        if self.environment.is_barrier(x, y):
+            pygame.draw.rect(surface, BARRIER_COLOR, rect)
+        else:
+            pygame.draw.rect(surface, BACKGROUND_COLOR, rect)
+            pygame.draw.rect(surface, GRID_LINE_COLOR, rect, 1)  # Draw grid lines
+
+    def label(self, text, color):
+        """Return the cached surface of a short label."""
+        surface = self.labels.get((text, color))
+        if surface is None:
+            surface = self.font.render(text, True, color)
+            self.labels[(text, color)] = surface
+        return surface
+
+    def task_bounds(self, location, task_number):
+        """Return the area a task covers; on small cells its number spills into the neighbours."""
+        task_rect = self.cell_rect(*location)
+        task_num_surface = self.label(str(task_number), TASK_TEXT_COLOR)
+        return task_rect.union(task_num_surface.get_rect(center=task_rect.center))
+
+    def status_rect(self, line):
+        return pygame.Rect(self.width + 1, STATUS_TOP + line * STATUS_LINE_HEIGHT,
+                           self.screen.get_width() - self.width - 1, STATUS_LINE_HEIGHT)
+
+    def draw(self, status, buttons, mouse_pos):
+        """Bring the screen up to date and return the rects that were updated.
+
+        status is the list of status panel lines; buttons is a list of
+        (rect, label, visible) drawn with a hover highlight under the mouse.
+        """
+        dirty = []
+
+        # Barriers toggled since the last frame are patched into the background
+        changes = self.environment.barrier_changes
+        for x, y in changes[self.barrier_version:]:
+            self.paint_cell(self.background, x, y)
+            dirty.append(self.cell_rect(x, y))
+        self.barrier_version = len(changes)
+
+        # Tasks that appeared, disappeared or changed number
+        tasks = dict(self.environment.task_locations)
+        if tasks != self.tasks:
+            for location in self.tasks.keys() | tasks.keys():
+                before, after = self.tasks.get(location), tasks.get(location)
+                if before != after:
+                    dirty.extend(self.task_bounds(location, number) for number in (before, after) if number)
+            self.tasks = tasks
+
+        agent_rect = self.agent.rect.copy()
+        if agent_rect != self.agent_rect:
+            if self.agent_rect is not None:
+                dirty.append(self.agent_rect)
+            dirty.append(agent_rect)
+            self.agent_rect = agent_rect
+
+        # Status lines are only rendered again when their text changes
+        for line, text in enumerate(status):
+            if line >= len(self.status_lines) or self.status_lines[line][0] != text:
+                surface = self.font.render(text, True, TEXT_COLOR)
+                if line < len(self.status_lines):
+                    self.status_lines[line] = (text, surface)
+                else:
+                    self.status_lines.append((text, surface))
+                dirty.append(self.status_rect(line))
+
+        states = {}
+        for rect, label, visible in buttons:
+            key = tuple(rect)
+            states[key] = (label, visible, visible and rect.collidepoint(mouse_pos))
+            if states[key] != self.buttons.get(key):
+                dirty.append(pygame.Rect(rect))
+        self.buttons = states
+
+        if self.full_redraw:
+            dirty = [self.screen.get_rect()]
+            self.full_redraw = False
+        if not dirty:
+            return dirty
+
+        # A task that is redrawn can overlap neighbours (and the agent), so its whole area becomes dirty too
+        redrawn = set()
+        grown = True
+        while grown:
+            grown = False
+            for location, task_number in tasks.items():
+                bounds = self.task_bounds(location, task_number)
+                if location not in redrawn and bounds.collidelist(dirty) != -1:
+                    redrawn.add(location)
+                    dirty.append(bounds)
+                    grown = True
+
+        # Restore the background under every dirty rect, then redraw whatever overlaps one
+        for rect in dirty:
+            self.screen.blit(self.background, rect, rect)
+        for (x, y), task_number in tasks.items():
+            if (x, y) in redrawn:
+                task_rect = self.cell_rect(x, y)
+                pygame.draw.rect(self.screen, TASK_COLOR, task_rect)
+                # Draw task number
+                task_num_surface = self.label(str(task_number), TASK_TEXT_COLOR)
+                self.screen.blit(task_num_surface, task_num_surface.get_rect(center=task_rect.center))
+        if agent_rect.collidelist(dirty) != -1:
+            self.screen.blit(self.agent.image, agent_rect)
+        for line, (text, surface) in enumerate(self.status_lines):
+            rect = self.status_rect(line)
+            if rect.collidelist(dirty) != -1:
+                self.screen.blit(surface, (rect.x + 9, rect.y))
+        for rect, label, visible in buttons:
+            if visible and rect.collidelist(dirty) != -1:
+                hovered = self.buttons[tuple(rect)][2]
+                pygame.draw.rect(self.screen, BUTTON_HOVER_COLOR if hovered else BUTTON_COLOR, rect)
+                text = self.label(label, BUTTON_TEXT_COLOR)
+                self.screen.blit(text, text.get_rect(center=rect.center))
+        # The panel separator stays on top of task numbers spilling over the right edge
+        if pygame.Rect(self.width, 0, 1, self.height).collidelist(dirty) != -1:
+            pygame.draw.line(self.screen, (0, 0, 0), (self.width, 0), (self.width, self.height))
+
+        pygame.display.update(dirty)
+        return dirty
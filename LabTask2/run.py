@@ -1,21 +1,18 @@
 # run.py
 import pygame
 import sys
+import time
 from agent import Agent
 from environment import Environment
+from renderer import GridRenderer
 
 # Constants
 WINDOW_WIDTH, WINDOW_HEIGHT = 800, 600
 GRID_SIZE = 40
 STATUS_WIDTH = 300
-BACKGROUND_COLOR = (255, 255, 255)
-BARRIER_COLOR = (0, 0, 0)       # Barrier color is black
-TASK_COLOR = (255, 0, 0)        # Task color is red
-TEXT_COLOR = (0, 0, 0)
-BUTTON_COLOR = (0, 200, 0)
-BUTTON_HOVER_COLOR = (0, 255, 0)
-BUTTON_TEXT_COLOR = (255, 255, 255)
 MOVEMENT_DELAY = 200  # Milliseconds between movements
+ALGORITHMS = ["UCS", "A*", "JPS"]  # Cycled through by the toggle button
+PLANNER = "nearest"  # "nearest" picks the closest task each time, "tour" plans the whole visit order
 
 def main():
     pygame.init()
@@ -31,9 +28,8 @@ def main():
     # Initialize environment and agent
     environment = Environment(WINDOW_WIDTH, WINDOW_HEIGHT, GRID_SIZE, num_tasks=5, num_barriers=15)
     algorithm = "UCS"  # Start with UCS by default
-    agent = Agent(environment, GRID_SIZE, algorithm=algorithm)
-    all_sprites = pygame.sprite.Group()
-    all_sprites.add(agent)
+    agent = Agent(environment, GRID_SIZE, algorithm=algorithm, planner=PLANNER)
+    renderer = GridRenderer(screen, environment, agent, font, GRID_SIZE, WINDOW_WIDTH, WINDOW_HEIGHT)
 
     # Start button positioned on the right side (status panel)
     button_width, button_height = 100, 50
@@ -47,6 +43,8 @@ def main():
 
     # Variables for movement delay
     last_move_time = pygame.time.get_ticks()
+    frames = 0
+    frame_time = 0.0  # Seconds spent drawing, for the mean frame time printed on exit
 
     # Main loop
     running = True
@@ -58,105 +56,65 @@ def main():
             if event.type == pygame.QUIT:
                 running = False
 
-            if event.type == pygame.MOUSEBUTTONDOWN:
+            if event.type == pygame.MOUSEBUTTONDOWN and event.button == 3 and event.pos[0] < WINDOW_WIDTH:
+                # Right click toggles a barrier; the agent repairs its path around it
+                cell = (event.pos[0] // GRID_SIZE, event.pos[1] // GRID_SIZE)
+                if cell != tuple(agent.position):
+                    if environment.is_barrier(*cell):
+                        environment.remove_barrier(*cell)
+                    else:
+                        environment.add_barrier(*cell)
+                    agent.repair_path()
+            elif event.type == pygame.MOUSEBUTTONDOWN:
                 if not simulation_started and button_rect.collidepoint(event.pos):
                     # Start the simulation
                     simulation_started = True
                     agent.total_path_cost = 0
+                    agent.total_nodes_expanded = 0
                     if environment.task_locations:
-                        agent.find_nearest_task()
+                        agent.find_next_task()
                 elif toggle_button_rect.collidepoint(event.pos):
-                    # Toggle algorithm between UCS and A*
-                    algorithm = "A*" if algorithm == "UCS" else "UCS"
+                    # Cycle through UCS, A* and JPS
+                    algorithm = ALGORITHMS[(ALGORITHMS.index(algorithm) + 1) % len(ALGORITHMS)]
                     agent.algorithm = algorithm
                     agent.total_path_cost = 0
+                    agent.total_nodes_expanded = 0
                     simulation_started = False  # Reset simulation on toggle
                     agent.position = [0, 0]  # Reset agent's position
                     agent.rect.topleft = (0, 0)
                     agent.task_completed = 0
                     agent.completed_tasks = []
+                    agent.tour = []
                     environment.task_locations = environment.generate_tasks(5)  # Reset tasks
 
-        # Clear the screen
-        screen.fill(BACKGROUND_COLOR)
-
-        # Draw grid and barriers
-        for x in range(environment.columns):
-            for y in range(environment.rows):
-                rect = pygame.Rect(x * GRID_SIZE, y * GRID_SIZE, GRID_SIZE, GRID_SIZE)
-                pygame.draw.rect(screen, (200, 200, 200), rect, 1)  # Draw grid lines
-
-        # Draw barriers
-        for (bx, by) in environment.barrier_locations:
-            barrier_rect = pygame.Rect(bx * GRID_SIZE, by * GRID_SIZE, GRID_SIZE, GRID_SIZE)
-            pygame.draw.rect(screen, BARRIER_COLOR, barrier_rect)
-
-        # Draw tasks with numbers
-        for (tx, ty), task_number in environment.task_locations.items():
-            task_rect = pygame.Rect(tx * GRID_SIZE, ty * GRID_SIZE, GRID_SIZE, GRID_SIZE)
-            pygame.draw.rect(screen, TASK_COLOR, task_rect)
-            # Draw task number
-            task_num_surface = font.render(str(task_number), True, (255, 255, 255))
-            task_num_rect = task_num_surface.get_rect(center=task_rect.center)
-            screen.blit(task_num_surface, task_num_rect)
-
-        # Draw agent
-        all_sprites.draw(screen)
-
-        # Display status panel
-        status_x = WINDOW_WIDTH + 10
-        algorithm_text = f"Algorithm: {algorithm}"
-        task_status_text = f"Tasks Completed: {agent.task_completed}"
-        position_text = f"Position: {agent.position}"
-        completed_tasks_text = f"Completed Tasks: {agent.completed_tasks}"
-        path_cost_text = f"Total Path Cost: {agent.total_path_cost}"
-
-        algorithm_surface = font.render(algorithm_text, True, TEXT_COLOR)
-        status_surface = font.render(task_status_text, True, TEXT_COLOR)
-        position_surface = font.render(position_text, True, TEXT_COLOR)
-        completed_tasks_surface = font.render(completed_tasks_text, True, TEXT_COLOR)
-        path_cost_surface = font.render(path_cost_text, True, TEXT_COLOR)
-
-        screen.blit(algorithm_surface, (status_x, 20))
-        screen.blit(status_surface, (status_x, 50))
-        screen.blit(position_surface, (status_x, 80))
-        screen.blit(completed_tasks_surface, (status_x, 110))
-        screen.blit(path_cost_surface, (status_x, 140))
-
-        # Draw the start button if simulation hasn't started
-        if not simulation_started:
-            mouse_pos = pygame.mouse.get_pos()
-            button_color = BUTTON_HOVER_COLOR if button_rect.collidepoint(mouse_pos) else BUTTON_COLOR
-            pygame.draw.rect(screen, button_color, button_rect)
-            button_text = font.render("Start", True, BUTTON_TEXT_COLOR)
-            text_rect = button_text.get_rect(center=button_rect.center)
-            screen.blit(button_text, text_rect)
-        else:
-            # Automatic movement with delay
+        if simulation_started:
             # Automatic movement with reduced delay
-            if simulation_started:
-                current_time = pygame.time.get_ticks()
-                if current_time - last_move_time > 50:  # Reduced delay to 50ms for faster movement
-                    if not agent.moving and environment.task_locations:
-                        # Find the nearest task
-                        agent.find_nearest_task()
-                    elif agent.moving:
-                        agent.move()
-                    last_move_time = current_time
-
-
-        # Draw the algorithm toggle button
-        toggle_button_color = BUTTON_HOVER_COLOR if toggle_button_rect.collidepoint(pygame.mouse.get_pos()) else BUTTON_COLOR
-        pygame.draw.rect(screen, toggle_button_color, toggle_button_rect)
-        toggle_text = font.render("Toggle", True, BUTTON_TEXT_COLOR)
-        toggle_text_rect = toggle_text.get_rect(center=toggle_button_rect.center)
-        screen.blit(toggle_text, toggle_text_rect)
-
-        # Draw the status panel separator
-        pygame.draw.line(screen, (0, 0, 0), (WINDOW_WIDTH, 0), (WINDOW_WIDTH, WINDOW_HEIGHT))
-
-        # Update the display
-        pygame.display.flip()
+            current_time = pygame.time.get_ticks()
+            if current_time - last_move_time > 50:  # Reduced delay to 50ms for faster movement
+                if not agent.moving and environment.task_locations:
+                    # Find the nearest task
+                    agent.find_next_task()
+                elif agent.moving:
+                    agent.move()
+                last_move_time = current_time
+
+        # Draw only what changed since the last frame
+        start = time.perf_counter()
+        status = [
+            f"Algorithm: {algorithm}",
+            f"Tasks Completed: {agent.task_completed}",
+            f"Position: {agent.position}",
+            f"Completed Tasks: {agent.completed_tasks}",
+            f"Total Path Cost: {agent.total_path_cost}",
+            f"Nodes Expanded: {agent.total_nodes_expanded}",
+        ]
+        buttons = [(button_rect, "Start", not simulation_started), (toggle_button_rect, "Toggle", True)]
+        renderer.draw(status, buttons, pygame.mouse.get_pos())
+        frame_time += time.perf_counter() - start
+        frames += 1
+
+    if frames:
+        print(f"Mean frame time: {frame_time / frames * 1000:.3f} ms over {frames} frames")
 
     # Quit Pygame properly
     pygame.quit()
@@ -0,0 +1,273 @@
+from array import array
+import heapq
+import math
+
+UNVISITED = -1  # Marks cells that have no entry in the came-from map yet
+DIRECTIONS = [("up", (0, -1)), ("down", (0, 1)), ("left", (-1, 0)), ("right", (1, 0))]
+
+
+def cell_id(position, columns):
+    """Convert an (x, y) position into a flat cell id."""
+    x, y = position
+    return y * columns + x
+
+
+def cell_position(cell, columns):
+    """Convert a flat cell id back into an (x, y) position."""
+    return (cell % columns, cell // columns)
+
+
+def neighbor_function(environment):
+    """Build a function returning the walkable neighbor ids of a cell id."""
+    if environment.grid is not None:
+        return environment.grid.neighbor_table.__getitem__
+    columns, rows = environment.columns, environment.rows
+    barriers = environment.barrier_locations
+    steps = [(dx, dy, dy * columns + dx) for _, (dx, dy) in DIRECTIONS]
+
+    def neighbors(cell):
+        x, y = cell % columns, cell // columns
+        result = []
+        for dx, dy, offset in steps:
+            nx, ny = x + dx, y + dy
+            if 0 <= nx < columns and 0 <= ny < rows and (nx, ny) not in barriers:
+                result.append(cell + offset)
+        return result
+
+    return neighbors
+
+
+def cost_function(environment):
+    """Build a function returning the cost of entering a cell id, or None if uniform."""
+    if environment.has_uniform_costs():
+        return None
+    if environment.grid is not None:
+        return environment.grid.cost_table.__getitem__
+    columns = environment.columns
+    costs = {cell_id(position, columns): cost for position, cost in environment.cell_costs.items()}
+    return lambda cell: costs.get(cell, 1)
+
+
+def reconstruct_path(came_from, goal, columns):
+    """Walk the came-from map back from the goal and return the (x, y) path."""
+    path = []
+    cell = goal
+    while True:
+        path.append(cell_position(cell, columns))
+        parent = came_from[cell]
+        if parent == cell:  # The start cell is its own parent
+            break
+        cell = parent
+    path.reverse()
+    return path
+
+
+def goal_ranks(goals, columns):
+    """Map goal cell ids to their position in the goal order (used for ties)."""
+    rank = {}
+    for index, goal in enumerate(goals):
+        rank.setdefault(cell_id(goal, columns), index)
+    return rank
+
+
+def breadth_first_search(environment, start, goals):
+    """Expand level by level from start and return the path to the nearest goal.
+
+    Goals at the same distance are resolved in the order they are given.
+    Only valid when every step costs the same. Returns (path, nodes_expanded),
+    with path None when no goal is reachable.
+    """
+    columns = environment.columns
+    rank = goal_ranks(goals, columns)
+    if not rank:
+        return None, 0
+    neighbors = neighbor_function(environment)
+    came_from = array("i", [UNVISITED]) * (columns * environment.rows)
+    start_id = cell_id(start, columns)
+    came_from[start_id] = start_id
+    frontier = [start_id]
+    best = None
+    expanded = 0
+
+    while frontier:
+        next_frontier = []
+        for cell in frontier:
+            if cell in rank:
+                if best is None or rank[cell] < rank[best]:
+                    best = cell
+                continue
+            if best is not None:
+                continue  # Only finish checking the current level
+            expanded += 1
+            for neighbor in neighbors(cell):
+                if came_from[neighbor] == UNVISITED:
+                    came_from[neighbor] = cell
+                    next_frontier.append(neighbor)
+        if best is not None:
+            return reconstruct_path(came_from, best, columns), expanded
+        frontier = next_frontier
+    return None, expanded
+
+
+def astar_search(environment, start, goals, weight=1.0):
+    """Run A* from start and return the path to the nearest goal.
+
+    Entering a cell costs ``environment.cost`` of that cell. The heuristic
+    is the Manhattan distance to the closest goal scaled by the cheapest
+    step, so a single search handles one goal or many; ``weight`` inflates
+    it for weighted A* and ``weight=0`` gives Dijkstra. Heap entries are
+    (f, h, counter, cell): ties prefer the node closer to a goal, then
+    insertion order. Superseded entries stay in the heap and are skipped
+    when popped, and a cell is closed when it is popped.
+
+    Returns (path, nodes_expanded), with path None when no goal is reachable.
+    """
+    columns = environment.columns
+    rank = goal_ranks(goals, columns)
+    if not rank:
+        return None, 0
+    neighbors = neighbor_function(environment)
+    step_cost = cost_function(environment)
+    min_step = min(1, environment.min_cost())
+    scale = weight * min_step
+    goal_positions = [cell_position(goal, columns) for goal in rank]
+
+    def heuristic(cell):
+        if not scale:
+            return 0
+        x, y = cell % columns, cell // columns
+        return scale * min(abs(x - gx) + abs(y - gy) for gx, gy in goal_positions)
+
+    size = columns * environment.rows
+    came_from = array("i", [UNVISITED]) * size
+    g_score = array("d", [math.inf]) * size
+    closed = bytearray(size)
+    start_id = cell_id(start, columns)
+    came_from[start_id] = start_id
+    g_score[start_id] = 0
+    counter = 0  # Breaks ties in insertion order
+    h = heuristic(start_id)
+    open_set = [(h, h, counter, start_id)]
+    best = None
+    expanded = 0
+
+    while open_set:
+        f, _, _, cell = heapq.heappop(open_set)
+        if closed[cell]:
+            continue  # Stale entry for a cell that was reached more cheaply
+        if best is not None and f > g_score[best]:
+            break  # Nothing left can reach a goal any sooner
+        closed[cell] = 1
+
+        if cell in rank:
+            if best is None or rank[cell] < rank[best]:
+                best = cell
+            if rank[best] == 0:
+                break  # No other goal can win a tie against the first one
+            continue
+
+        expanded += 1
+        g = g_score[cell]
+        for neighbor in neighbors(cell):
+            if closed[neighbor]:
+                continue
+            new_g = g + (step_cost(neighbor) if step_cost else 1)
+            if new_g < g_score[neighbor]:
+                g_score[neighbor] = new_g
+                came_from[neighbor] = cell
+                counter += 1
+                h = heuristic(neighbor)
+                heapq.heappush(open_set, (new_g + h, h, counter, neighbor))
+    if best is None:
+        return None, expanded
+    return reconstruct_path(came_from, best, columns), expanded
+
+
+def distance_field(environment, target):
+    """Compute the cost of the cheapest path from every cell to target.
+
+    Runs breadth-first search on uniform grids and Dijkstra otherwise,
+    expanding outward from the target over reversed steps. Returns
+    (distances, nodes_expanded) where distances is an array('i') indexed
+    by cell id and -1 marks cells that cannot reach the target.
+    """
+    columns = environment.columns
+    neighbors = neighbor_function(environment)
+    step_cost = cost_function(environment)
+    distances = array("i", [UNVISITED]) * (columns * environment.rows)
+    target_id = cell_id(target, columns)
+    distances[target_id] = 0
+    expanded = 0
+
+    if step_cost is None:
+        frontier = [target_id]
+        while frontier:
+            next_frontier = []
+            for cell in frontier:
+                expanded += 1
+                distance = distances[cell] + 1
+                for neighbor in neighbors(cell):
+                    if distances[neighbor] == UNVISITED:
+                        distances[neighbor] = distance
+                        next_frontier.append(neighbor)
+            frontier = next_frontier
+        return distances, expanded
+
+    closed = bytearray(columns * environment.rows)
+    open_set = [(0, target_id)]
+    while open_set:
+        distance, cell = heapq.heappop(open_set)
+        if closed[cell]:
+            continue
+        closed[cell] = 1
+        expanded += 1
+        distance += step_cost(cell)  # Every neighbor pays to enter this cell
+        for neighbor in neighbors(cell):
+            if not closed[neighbor] and (distances[neighbor] == UNVISITED or distance < distances[neighbor]):
+                distances[neighbor] = distance
+                heapq.heappush(open_set, (distance, neighbor))
+    return distances, expanded
+
+
+def field_distance(environment, distances, start):
+    """Return the cost from start to a distance field's target, or UNVISITED if it cannot reach it.
+
+    Fields are built backwards and only cover walkable cells, so a start
+    standing on a barrier is scored from its cheapest step into a walkable
+    neighbor, the way a forward search would leave it.
+    """
+    cell = cell_id(start, environment.columns)
+    if distances[cell] != UNVISITED or not environment.is_barrier(*start):
+        return distances[cell]
+    step_cost = cost_function(environment)
+    best = UNVISITED
+    for neighbor in neighbor_function(environment)(cell):
+        if distances[neighbor] != UNVISITED:
+            distance = distances[neighbor] + (step_cost(neighbor) if step_cost else 1)
+            if best == UNVISITED or distance < best:
+                best = distance
+    return best
+
+
+def follow_distance_field(environment, distances, start):
+    """Walk downhill through a distance field from start and return the (x, y) path.
+
+    Returns None when start cannot reach the field's target.
+    """
+    columns = environment.columns
+    neighbors = neighbor_function(environment)
+    step_cost = cost_function(environment)
+    cell = cell_id(start, columns)
+    distance = field_distance(environment, distances, start)
+    if distance == UNVISITED:
+        return None
+    path = [cell_position(cell, columns)]
+    while distance:
+        for neighbor in neighbors(cell):
+            remaining = distances[neighbor]
+            if remaining != UNVISITED and remaining + (step_cost(neighbor) if step_cost else 1) == distance:
+                cell = neighbor
+                break
+        distance = distances[cell]
+        path.append(cell_position(cell, columns))
+    return path
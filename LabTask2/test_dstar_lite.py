@@ -0,0 +1,58 @@
+import random
+import pytest
+import search
+from agent import Agent
+from dstar_lite import DStarLite
+from environment import Environment
+
+SEEDS = range(10)
+
+
+def blocked_start_environment(seed, use_grid):
+    random.seed(seed)
+    environment = Environment(20, 15, 1, num_tasks=5, num_barriers=15, max_cell_cost=3, use_grid=use_grid)
+    environment.task_locations.pop((0, 0), None)
+    environment.add_barrier(0, 0)
+    return environment
+
+
+def path_cost(environment, path):
+    return sum(environment.cost(*cell) for cell in path[1:])
+
+
+def forward_path(environment, start, goal):
+    path, _ = search.astar_search(environment, start, [goal], weight=0)
+    return path
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+@pytest.mark.parametrize("use_grid", [False, True])
+def test_replan_leaves_a_blocked_start(seed, use_grid):
+    environment = blocked_start_environment(seed, use_grid)
+    edits = random.Random(seed)
+    for goal in environment.task_locations:
+        planner = DStarLite(environment, (0, 0), goal)
+        for _ in range(3):
+            expected = forward_path(environment, (0, 0), goal)
+            path = planner.replan()
+            assert (path is None) == (expected is None)
+            if expected is not None:
+                assert path[0] == (0, 0) and path[-1] == goal
+                assert path_cost(environment, path) == path_cost(environment, expected)
+            cell = (edits.randrange(environment.columns), edits.randrange(environment.rows))
+            if cell != (0, 0) and not environment.remove_barrier(*cell):
+                environment.add_barrier(*cell)
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+@pytest.mark.parametrize("use_grid", [False, True])
+def test_repair_keeps_a_path_from_a_blocked_start(seed, use_grid):
+    environment = blocked_start_environment(seed, use_grid)
+    goal = next((task for task in environment.task_locations if forward_path(environment, (0, 0), task)), None)
+    if goal is None:
+        pytest.skip("no reachable task")
+    agent = Agent(environment, 1)
+    agent.path = forward_path(environment, (0, 0), goal)[1:]
+    agent.repair_path()
+    assert agent.path and agent.path[-1] == goal
+    assert path_cost(environment, [(0, 0)] + agent.path) == path_cost(environment, forward_path(environment, (0, 0), goal))
@@ -0,0 +1,100 @@
+import random
+import pytest
+import search
+import tour
+from agent import Agent
+from environment import Environment
+from path_cache import PathCache
+
+SEEDS = range(10)
+VARIANT = ("UCS", 1.0)
+
+
+def make_environment(seed, use_grid=False, blocked_start=False):
+    random.seed(seed)
+    environment = Environment(20, 15, 1, num_tasks=5, num_barriers=15, max_cell_cost=3, use_grid=use_grid)
+    if blocked_start:
+        environment.task_locations.pop((0, 0), None)
+        environment.add_barrier(0, 0)
+    return environment
+
+
+def path_cost(environment, path):
+    return sum(environment.cost(*cell) for cell in path[1:])
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+@pytest.mark.parametrize("use_grid", [False, True])
+def test_field_path_from_blocked_start_matches_forward_search(seed, use_grid):
+    environment = make_environment(seed, use_grid, blocked_start=True)
+    goals = tuple(environment.task_locations)
+    fields = tour.DistanceCache(environment)
+    for goal in goals:
+        fields.field(goal)
+    found, path = PathCache(environment).get((0, 0), goals, VARIANT, fields)
+    expected, _ = search.astar_search(environment, (0, 0), goals, weight=0)
+    assert found
+    assert (path is None) == (expected is None)
+    if expected is not None:
+        assert path[0] == (0, 0) and path[-1] in goals
+        assert path_cost(environment, path) == path_cost(environment, expected)
+
+
+def nearest_path(environment, start, goals):
+    path, _ = search.astar_search(environment, start, goals, weight=0)
+    return path
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_smaller_goal_set_after_a_completion_is_a_hit(seed):
+    environment = make_environment(seed)
+    agent = Agent(environment, 1)
+    agent.find_nearest_task()
+    assert agent.path_cache.misses == 1
+    nearest = agent.path[-1]
+    completed = next(task for task in environment.task_locations if task != nearest)
+    environment.task_locations.pop(completed)  # Completed elsewhere, e.g. by another agent
+    for _ in range(min(2, len(agent.path))):  # From the start, then from the next cell on the cached path
+        goals = tuple(environment.task_locations)
+        expected = nearest_path(environment, tuple(agent.position), goals)
+        hits = agent.path_cache.hits + agent.path_cache.suffix_hits
+        path = agent.find_path_to_nearest(goals)
+        assert agent.path_cache.hits + agent.path_cache.suffix_hits == hits + 1
+        assert agent.nodes_expanded == 0
+        assert path[-1] == nearest
+        assert path_cost(environment, path) == path_cost(environment, expected)
+        agent.move()
+    assert agent.path_cache.misses == 1
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_single_goal_query_reuses_a_multi_goal_path(seed):
+    environment = make_environment(seed)
+    cache = PathCache(environment)
+    goals = tuple(environment.task_locations)
+    path = nearest_path(environment, (0, 0), goals)
+    cache.put((0, 0), goals, VARIANT, path, optimal=True)
+    assert cache.get((0, 0), (path[-1],), VARIANT) == (True, tuple(path))
+    assert cache.get(path[1], (path[-1],), VARIANT) == (True, tuple(path[1:]))
+    if len(goals) > 1:
+        other = next(goal for goal in goals if goal != path[-1])
+        assert cache.get((0, 0), (other,), VARIANT) == (False, None)  # Not the answer for that goal
+
+
+def test_unreachable_goals_answer_their_subsets():
+    environment = make_environment(0)
+    cache = PathCache(environment)
+    cache.put((0, 0), ((3, 3), (4, 4)), VARIANT, None)
+    assert cache.get((0, 0), ((4, 4),), VARIANT) == (True, None)
+    assert cache.get((0, 0), ((4, 4), (5, 5)), VARIANT) == (False, None)
+
+
+def test_barrier_edit_drops_every_entry():
+    environment = make_environment(0)
+    cache = PathCache(environment)
+    goals = tuple(environment.task_locations)
+    path = nearest_path(environment, (0, 0), goals)
+    cache.put((0, 0), goals, VARIANT, path, optimal=True)
+    assert any(environment.add_barrier(x, 14) for x in range(19, 0, -1))
+    assert cache.get((0, 0), goals, VARIANT) == (False, None)
+    assert len(cache) == 0
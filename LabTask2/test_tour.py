@@ -0,0 +1,47 @@
+import random
+import pytest
+import search
+import tour
+from agent import Agent
+from environment import Environment
+from headless import run_episode
+
+SEEDS = range(10)
+
+
+def blocked_start_environment(seed, use_grid):
+    """A seeded map whose agent starts on a barrier, as generated layouts sometimes do."""
+    random.seed(seed)
+    environment = Environment(20, 15, 1, num_tasks=5, num_barriers=15, max_cell_cost=3, use_grid=use_grid)
+    environment.task_locations.pop((0, 0), None)
+    environment.add_barrier(0, 0)
+    return environment
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+@pytest.mark.parametrize("use_grid", [False, True])
+def test_distance_from_blocked_start_matches_forward_search(seed, use_grid):
+    environment = blocked_start_environment(seed, use_grid)
+    cache = tour.DistanceCache(environment)
+    for task in environment.task_locations:
+        path, _ = search.astar_search(environment, (0, 0), [task], weight=0)
+        followed = cache.path((0, 0), task)
+        if path is None:
+            assert followed is None
+            continue
+        cost = sum(environment.cost(*cell) for cell in path[1:])
+        assert cache.distance((0, 0), task) == cost
+        assert followed[0] == (0, 0) and followed[-1] == task
+        assert sum(environment.cost(*cell) for cell in followed[1:]) == cost
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+@pytest.mark.parametrize("use_grid", [False, True])
+def test_tour_planner_leaves_a_blocked_start(seed, use_grid):
+    completed = {}
+    for planner in ["nearest", "tour"]:
+        environment = blocked_start_environment(seed, use_grid)
+        agent = Agent(environment, 1, planner=planner)
+        run_episode(agent)
+        completed[planner] = agent.task_completed
+    assert completed["tour"] == completed["nearest"] > 0
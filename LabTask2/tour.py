@@ -0,0 +1,162 @@
+import math
+import search
+
+EXACT_TOUR_LIMIT = 10  # Largest task count planned exactly with Held-Karp
+
+
+class DistanceCache:
+    """Cache of one distance field per target position.
+
+    ``distance(source, target)`` and ``path(source, target)`` read from the
+    target's field, so once a field exists any later query towards that
+    target costs a lookup (or a walk down the field) instead of a search.
+    """
+
+    def __init__(self, environment):
+        self.environment = environment
+        self.version = environment.version()  # Barrier and cost edits the fields reflect
+        self.fields = {}
+        self.nodes_expanded = 0  # Nodes expanded while building fields
+
+    def field(self, target):
+        """Return the distance field towards target, computing it once."""
+        if self.version != self.environment.version():
+            self.clear()  # Barriers or costs changed since the fields were built
+        distances = self.fields.get(target)
+        if distances is None:
+            distances, expanded = search.distance_field(self.environment, target)
+            self.nodes_expanded += expanded
+            self.fields[target] = distances
+        return distances
+
+    def cached_field(self, target):
+        """Return the distance field towards target if it was already computed, else None."""
+        if self.version != self.environment.version():
+            self.clear()
+        return self.fields.get(target)
+
+    def distance(self, source, target):
+        """Return the cheapest cost from source to target, or math.inf if unreachable."""
+        distance = search.field_distance(self.environment, self.field(target), source)
+        return math.inf if distance == search.UNVISITED else distance
+
+    def path(self, source, target):
+        """Return the cheapest (x, y) path from source to target, or None."""
+        return search.follow_distance_field(self.environment, self.field(target), source)
+
+    def clear(self):
+        """Forget every cached field."""
+        self.fields.clear()
+        self.version = self.environment.version()
+
+
+def distance_matrix(cache, start, tasks):
+    """Build the cost matrix between start (index 0) and each task (index i + 1)."""
+    nodes = [start] + list(tasks)
+    return [[0 if source == target else cache.distance(source, target) for target in nodes] for source in nodes]
+
+
+def tour_cost(matrix, order):
+    """Sum the matrix costs along an order of node indices."""
+    return sum(matrix[a][b] for a, b in zip(order, order[1:]))
+
+
+def held_karp(matrix):
+    """Return the cheapest open tour from node 0 through every other node.
+
+    Exact dynamic programming over subsets, O(2^n * n^2); only meant for
+    small task counts.
+    """
+    count = len(matrix) - 1
+    if count == 0:
+        return [0]
+    # best[(mask, last)] = (cost, previous) for tours over the tasks in mask ending at last
+    best = {(1 << i, i): (matrix[0][i + 1], None) for i in range(count)}
+    for mask in range(1, 1 << count):
+        for last in range(count):
+            if (mask, last) not in best:
+                continue
+            cost = best[(mask, last)][0]
+            for following in range(count):
+                if mask & (1 << following):
+                    continue
+                key = (mask | (1 << following), following)
+                new_cost = cost + matrix[last + 1][following + 1]
+                if key not in best or new_cost < best[key][0]:
+                    best[key] = (new_cost, last)
+    full = (1 << count) - 1
+    last = min(range(count), key=lambda i: best[(full, i)][0])
+    order = []
+    mask = full
+    while last is not None:
+        order.append(last + 1)
+        previous = best[(mask, last)][1]
+        mask &= ~(1 << last)
+        last = previous
+    order.append(0)
+    order.reverse()
+    return order
+
+
+def nearest_neighbour_tour(matrix):
+    """Build an open tour from node 0 by always visiting the closest unvisited node."""
+    order = [0]
+    remaining = set(range(1, len(matrix)))
+    while remaining:
+        current = order[-1]
+        following = min(remaining, key=lambda node: (matrix[current][node], node))
+        order.append(following)
+        remaining.remove(following)
+    return order
+
+
+def two_opt(matrix, order):
+    """Improve an open tour with 2-opt segment reversals until none helps.
+
+    Entry costs make the matrix asymmetric, but any path cost splits into a
+    symmetric part (the mean of both directions) plus a term that depends
+    only on its two ends. Reversing a segment therefore changes the cost
+    only at the segment's boundary edges, and at the tour's end when the
+    segment reaches it.
+    """
+    order = list(order)
+    start = order[0]
+
+    def symmetric(a, b):
+        return (matrix[a][b] + matrix[b][a]) / 2
+
+    def end_term(node):
+        return (matrix[start][node] - matrix[node][start]) / 2
+
+    improved = True
+    while improved:
+        improved = False
+        for i in range(1, len(order) - 1):
+            for j in range(i + 1, len(order)):
+                before, first, last = order[i - 1], order[i], order[j]
+                delta = symmetric(before, last) - symmetric(before, first)
+                if j + 1 < len(order):
+                    after = order[j + 1]
+                    delta += symmetric(first, after) - symmetric(last, after)
+                else:
+                    delta += end_term(first) - end_term(last)
+                if delta < -1e-9:
+                    order[i:j + 1] = reversed(order[i:j + 1])
+                    improved = True
+    return order
+
+
+def plan_tour(cache, start, tasks, exact_limit=EXACT_TOUR_LIMIT):
+    """Plan the order to visit tasks from start using cached distance fields.
+
+    Up to exact_limit reachable tasks are ordered exactly with Held-Karp;
+    larger sets use a nearest-neighbour tour improved by 2-opt. Tasks that
+    cannot be reached are left out. Returns the tasks in visiting order.
+    """
+    reachable = [task for task in tasks if cache.distance(start, task) < math.inf]
+    matrix = distance_matrix(cache, start, reachable)
+    if len(reachable) <= exact_limit:
+        order = held_karp(matrix)
+    else:
+        order = two_opt(matrix, nearest_neighbour_tour(matrix))
+    return [reachable[node - 1] for node in order[1:]]
@@ -3,15 +3,28 @@ class Student:
         self.id = student_id
         self.availability = availability
         self.preferences = preferences
-        self.schedule = []
+        self.schedule = {}  # class -> slot it starts in
+        self.classes_at = [[] for _ in availability]  # slot -> classes starting there, for O(1) lookups
 
     def assign_class(self, cls, slot):
         """Assign a class to this student's schedule."""
         if self.availability[slot]:
-            self.schedule.append({"class": cls, "slot": slot})
+            self.schedule[cls] = slot
+            self.classes_at[slot].append(cls)
             return True
         return False
 
+    def remove_class(self, cls):
+        """Take a class off this student's schedule."""
+        slot = self.schedule.pop(cls)
+        self.classes_at[slot].remove(cls)
+
+    def occupant(self, slot):
+        """Return a class starting in slot, or None if there is none."""
+        classes = self.classes_at[slot]
+        return classes[0] if classes else None
+
     def clear_schedule(self):
         """Clear the student's schedule for a new generation."""
-        self.schedule = []
+        self.schedule = {}
+        self.classes_at = [[] for _ in self.availability]
@@ -0,0 +1,401 @@
+# bench.py
+import os
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import argparse
+import random
+import sys
+import time
+import math
+import tracemalloc
+from cache import CACHE_SIZE, FitnessCache
+from environment import Environment
+from objective import ConstraintObjective
+from ga import (crossover, encode_population, evaluate_fitness, evaluate_population, initialize_population, mutate,
+                next_generation, score_population)
+from selection import SELECTION_STRATEGIES, make_selection
+from memetic import LocalSearch
+from solver import solve_bounded, solve_exact
+
+
+def timed(function, *args):
+    """Return (seconds, result) for one call."""
+    start = time.perf_counter()
+    result = function(*args)
+    return time.perf_counter() - start, result
+
+
+def bench_fitness(args):
+    """Compare per-schedule fitness evaluation with the vectorized gather by population size."""
+    random.seed(args.seed)
+    env = Environment(args.slots, args.students, args.classes)
+    print(f"{'population':>10} {'loop (s)':>9} {'encode (s)':>10} {'gather (s)':>10} {'speedup':>8} {'equal':>6}")
+    for size in args.sizes:
+        population = initialize_population(env, size)
+        encode_time, (slots, students) = timed(encode_population, population)
+        gather_time, vectorized = timed(evaluate_population, env, slots, students)
+        if size <= args.loop_limit:
+            loop_time, scores = timed(lambda: [evaluate_fitness(env, schedule) for schedule in population])
+            equal = "yes" if vectorized.tolist() == scores else "NO"
+            speedup = f"{loop_time / gather_time:.0f}x"
+            loop_time = f"{loop_time:.4f}"
+        else:
+            loop_time = speedup = equal = "-"
+        print(f"{size:>10} {loop_time:>9} {encode_time:>10.4f} {gather_time:>10.4f} {speedup:>8} {equal:>6}")
+
+
+def dict_schedule(env, schedule):
+    """Rebuild the original list-of-dicts form of a schedule, for comparison."""
+    return [{"class": env.classes[class_index], "slot": slot, "student": student}
+            for class_index, slot, student in schedule]
+
+
+def traced_bytes(build):
+    """Return the bytes still allocated after calling build, and its result."""
+    tracemalloc.start()
+    result = build()
+    allocated, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return allocated, result
+
+
+def bench_memory(args):
+    """Report memory per individual for list-of-dict schedules and the compact genome."""
+    random.seed(args.seed)
+    print(f"{'classes':>7} {'dicts (B)':>10} {'compact (B)':>11} {'ratio':>6}")
+    for num_classes in args.classes:
+        env = Environment(args.slots, args.students, num_classes)
+        schedules = initialize_population(env, args.population)
+        compact, _ = traced_bytes(lambda: [schedule.copy() for schedule in schedules])
+        dicts, _ = traced_bytes(lambda: [dict_schedule(env, schedule) for schedule in schedules])
+        per_dict, per_compact = dicts / args.population, compact / args.population
+        print(f"{num_classes:>7} {per_dict:>10.0f} {per_compact:>11.0f} {per_dict / per_compact:>5.1f}x")
+
+
+def rejection_schedule(env):
+    """Reference sampler that retries random (slot, student) pairs until one is available."""
+    genes = []
+    for _ in env.classes:
+        while True:
+            slot = random.randint(0, env.num_slots - 1)
+            student = random.randint(0, env.num_students - 1)
+            if env.students[student]["availability"][slot]:
+                genes.append((slot, student))
+                break
+    return genes
+
+
+def bench_init(args):
+    """Compare rejection sampling with the availability index as availability gets sparse."""
+    print(f"{'available':>9} {'rejection (s)':>13} {'indexed (s)':>11} {'vectorized (s)':>14}")
+    for density in args.densities:
+        random.seed(args.seed)
+        env = Environment(args.slots, args.students, args.classes)
+        for student in env.students:
+            student["availability"] = [random.random() < density for _ in range(env.num_slots)]
+        env.build_availability_index()
+        if not env.available_genes:
+            print(f"{density:>9.3f} {'no student is available in any slot':>40}")
+            continue
+        rejection, _ = timed(lambda: [rejection_schedule(env) for _ in range(args.population)])
+        indexed, _ = timed(lambda: [env.generate_random_schedule() for _ in range(args.population)])
+        vectorized, _ = timed(initialize_population, env, args.population)
+        print(f"{density:>9.3f} {rejection:>13.4f} {indexed:>11.4f} {vectorized:>14.4f}")
+
+
+def bench_delta(args):
+    """Check delta fitness against full re-evaluation and compare their cost; exits with 1 on a mismatch."""
+    print(f"{'classes':>7} {'moves':>7} {'mismatches':>10} {'full (us)':>9} {'delta (us)':>10}")
+    failed = False
+    for num_classes in args.classes:
+        random.seed(args.seed)
+        env = Environment(args.slots, args.students, num_classes)
+        objective = ConstraintObjective(env)
+        population = initialize_population(env, args.population)
+        vectorized = objective.evaluate_population(*encode_population(population)).tolist()
+        mismatches = sum(not math.isclose(score, objective.evaluate(schedule), abs_tol=1e-9)
+                         for score, schedule in zip(vectorized, population))
+        full_time = delta_time = 0.0
+        for schedule in population[:args.schedules]:
+            state = objective.state(schedule.copy())
+            for _ in range(args.moves):
+                # Any slot and student, so clashes, unavailability and overflow all get exercised
+                class_index = random.randrange(num_classes)
+                slot, student = random.randrange(env.num_slots), random.randrange(env.num_students)
+                start = time.perf_counter()
+                delta = state.delta(class_index, slot, student)
+                delta_time += time.perf_counter() - start
+                before = state.fitness
+                state.apply(class_index, slot, student)
+                start = time.perf_counter()
+                expected = objective.evaluate(state.schedule)
+                full_time += time.perf_counter() - start
+                if not (math.isclose(before + delta, expected, abs_tol=1e-9)
+                        and math.isclose(state.fitness, expected, abs_tol=1e-9)):
+                    mismatches += 1
+        moves = args.schedules * args.moves
+        print(f"{num_classes:>7} {moves:>7} {mismatches:>10} {full_time / moves * 1e6:>9.1f} "
+              f"{delta_time / moves * 1e6:>10.1f}")
+        failed = failed or mismatches > 0
+    if failed:
+        sys.exit(1)
+
+
+def per_child_generation(env, population, fitness_scores, mutation_rate):
+    """Reference generation that rebuilds roulette probabilities for every child, O(P^2) overall."""
+    new_population = []
+    while len(new_population) < len(population):
+        lowest = min(fitness_scores)
+        weights = [fitness - lowest + 1e-9 for fitness in fitness_scores] if lowest < 0 else fitness_scores
+        total_fitness = sum(weights)
+        probabilities = [fitness / total_fitness for fitness in weights]
+        parent1, parent2 = random.choices(population, weights=probabilities, k=2)
+        child = crossover(parent1, parent2)
+        mutate(child, mutation_rate, env)
+        new_population.append(child)
+    return new_population
+
+
+def generations_per_second(env, population, generations, breed):
+    """Run generations of scoring and breeding and return the rate and the best final fitness."""
+    start = time.perf_counter()
+    for _ in range(generations):
+        fitness_scores = score_population(env, population)
+        population = breed(population, fitness_scores)
+    elapsed = time.perf_counter() - start
+    return generations / elapsed, max(score_population(env, population))
+
+
+def bench_selection(args):
+    """Compare generations per second of the selection strategies by population size."""
+    strategies = {name: make_selection(name, args.tournament_size) for name in args.strategies}
+    print(f"{'population':>10} {'strategy':>10} {'elites':>6} {'gen/s':>9} {'best':>8}")
+    for size in args.sizes:
+        random.seed(args.seed)
+        env = Environment(args.slots, args.students, args.classes)
+        population = initialize_population(env, size)
+        if size <= args.loop_limit:
+            random.seed(args.seed)
+            rate, best = generations_per_second(
+                env, population, args.generations,
+                lambda population, scores: per_child_generation(env, population, scores, args.mutation_rate))
+            print(f"{size:>10} {'per-child':>10} {0:>6} {rate:>9.2f} {best:>8.2f}")
+        for name, selection in strategies.items():
+            random.seed(args.seed)
+            rate, best = generations_per_second(
+                env, population, args.generations,
+                lambda population, scores: next_generation(env, population, scores, args.mutation_rate,
+                                                           selection, args.elites))
+            print(f"{size:>10} {name:>10} {args.elites:>6} {rate:>9.2f} {best:>8.2f}")
+
+
+def bench_cache(args):
+    """Compare GA runs with and without the fitness cache, for vectorized and per-schedule objectives."""
+    print(f"{'mutation':>8} {'evaluation':>12} {'no cache (s)':>12} {'cache (s)':>9} {'hit rate':>8} {'equal':>6}")
+    for mutation_rate in args.mutation_rates:
+        random.seed(args.seed)
+        env = Environment(args.slots, args.students, args.classes)
+        objective = ConstraintObjective(env)
+        evaluations = {
+            "vectorized": lambda schedules: objective.evaluate_population(*encode_population(schedules)).tolist(),
+            "per-schedule": lambda schedules: [objective.evaluate(schedule) for schedule in schedules],
+        }
+        for name, evaluate in evaluations.items():
+            results = []
+            for cache in (None, FitnessCache(args.cache_size)):
+                score = evaluate if cache is None else (lambda schedules: cache.score(schedules, evaluate))
+                random.seed(args.seed)
+                population = initialize_population(env, args.population)
+                start = time.perf_counter()
+                for _ in range(args.generations):
+                    fitness_scores = score(population)
+                    population = next_generation(env, population, fitness_scores, mutation_rate, elites=args.elites)
+                results.append((time.perf_counter() - start, score(population)))
+            (plain_time, plain_scores), (cached_time, cached_scores) = results
+            equal = "yes" if plain_scores == cached_scores else "NO"
+            print(f"{mutation_rate:>8} {name:>12} {plain_time:>12.3f} {cached_time:>9.3f} "
+                  f"{cache.hit_rate():>8.1%} {equal:>6}")
+
+
+def bench_solver(args):
+    """Compare the exact assignment solvers with the GA on single-slot classes under the constraint objective."""
+    print(f"{'classes':>7} {'optimum':>10} {'dp (ms)':>8} {'hungarian (ms)':>14} {'GA best':>10} {'GA (s)':>7} {'gap':>9}")
+    for num_classes in args.classes:
+        random.seed(args.seed)
+        env = Environment(args.slots, args.students, num_classes)
+        for cls in env.classes:
+            cls["duration"] = 1  # Multi-slot classes are beyond the assignment model
+        objective = ConstraintObjective(env)
+        dp_time, (_, optimum) = timed(solve_exact, env, objective)
+        hungarian = "-"
+        if num_classes <= args.hungarian_limit:
+            hungarian_time, (_, fitness) = timed(solve_exact, env, objective, "hungarian")
+            hungarian = f"{hungarian_time * 1000:.1f}" + ("" if math.isclose(fitness, optimum) else " NO")
+        population = initialize_population(env, args.population)
+        best = -math.inf
+        start = time.perf_counter()
+        for _ in range(args.generations):
+            fitness_scores = score_population(env, population, objective)
+            best = max(best, max(fitness_scores))
+            population = next_generation(env, population, fitness_scores, args.mutation_rate, elites=args.elites)
+        ga_time = time.perf_counter() - start
+        print(f"{num_classes:>7} {optimum:>10.2f} {dp_time * 1000:>8.1f} {hungarian:>14} {best:>10.2f} "
+              f"{ga_time:>7.2f} {optimum - best:>9.2f}")
+
+
+def bench_bound(args):
+    """Compare the bounded greedy solver with the GA on generated instances, which mix one- and two-slot classes."""
+    print(f"{'classes':>7} {'bound':>10} {'greedy':>10} {'gap':>7} {'greedy (ms)':>11} {'GA best':>10} {'GA (s)':>7} "
+          f"{'GA gap':>7}")
+    for num_classes in args.classes:
+        random.seed(args.seed)
+        env = Environment(args.slots, args.students, num_classes)
+        objective = ConstraintObjective(env)
+        greedy_time, (_, fitness, bound) = timed(solve_bounded, env, objective)
+        population = initialize_population(env, args.population)
+        best = -math.inf
+        start = time.perf_counter()
+        for _ in range(args.generations):
+            fitness_scores = score_population(env, population, objective)
+            best = max(best, max(fitness_scores))
+            population = next_generation(env, population, fitness_scores, args.mutation_rate, elites=args.elites)
+        ga_time = time.perf_counter() - start
+        print(f"{num_classes:>7} {bound:>10.2f} {fitness:>10.2f} {bound - fitness:>7.2f} {greedy_time * 1000:>11.1f} "
+              f"{best:>10.2f} {ga_time:>7.2f} {bound - best:>7.2f}")
+
+
+def bench_memetic(args):
+    """Best fitness reached in a fixed wall time as more of each generation goes to local search."""
+    random.seed(args.seed)
+    env = Environment(args.slots, args.students, args.classes)
+    objective = ConstraintObjective(env)
+    print(f"{'budget (ms)':>11} {'generations':>11} {'best':>8} {'moves kept':>10}")
+    for budget in args.budgets:
+        random.seed(args.seed)
+        local_search = LocalSearch(env, objective, budget=budget / 1000, steps=None) if budget else None
+        population = initialize_population(env, args.population)
+        best, generations = -math.inf, 0
+        deadline = time.perf_counter() + args.time
+        while time.perf_counter() < deadline:
+            fitness_scores = score_population(env, population, objective)
+            best = max(best, max(fitness_scores))
+            population = next_generation(env, population, fitness_scores, args.mutation_rate, elites=args.elites,
+                                         local_search=local_search)
+            generations += 1
+        kept = f"{local_search.improvements / max(local_search.moves, 1):.1%}" if local_search else "-"
+        print(f"{budget:>11g} {generations:>11} {best:>8.2f} {kept:>10}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks for the Labtask3 genetic algorithm.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    fitness = subparsers.add_parser("fitness", help="vectorized versus per-schedule fitness evaluation")
+    fitness.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000, 100000])
+    fitness.add_argument("--slots", type=int, default=8)
+    fitness.add_argument("--students", type=int, default=5)
+    fitness.add_argument("--classes", type=int, default=5)
+    fitness.add_argument("--loop-limit", type=int, default=100000,
+                         help="largest population to also score one schedule at a time")
+    fitness.add_argument("--seed", type=int, default=0)
+    fitness.set_defaults(run=bench_fitness)
+
+    memory = subparsers.add_parser("memory", help="memory per individual before and after the compact genome")
+    memory.add_argument("--classes", type=int, nargs="+", default=[5, 20, 100])
+    memory.add_argument("--slots", type=int, default=8)
+    memory.add_argument("--students", type=int, default=5)
+    memory.add_argument("--population", type=int, default=10000)
+    memory.add_argument("--seed", type=int, default=0)
+    memory.set_defaults(run=bench_memory)
+
+    init = subparsers.add_parser("init", help="population initialization as availability gets sparse")
+    init.add_argument("--densities", type=float, nargs="+", default=[0.5, 0.1, 0.01],
+                      help="probability that a student is available in a slot")
+    init.add_argument("--population", type=int, default=10000)
+    init.add_argument("--slots", type=int, default=8)
+    init.add_argument("--students", type=int, default=50)
+    init.add_argument("--classes", type=int, default=20)
+    init.add_argument("--seed", type=int, default=0)
+    init.set_defaults(run=bench_init)
+
+    delta = subparsers.add_parser("delta", help="check and time incremental constraint fitness updates")
+    delta.add_argument("--classes", type=int, nargs="+", default=[5, 50, 500])
+    delta.add_argument("--slots", type=int, default=8)
+    delta.add_argument("--students", type=int, default=20)
+    delta.add_argument("--population", type=int, default=200, help="schedules checked against the vectorized objective")
+    delta.add_argument("--schedules", type=int, default=20, help="schedules to run single-gene moves on")
+    delta.add_argument("--moves", type=int, default=200, help="single-gene moves per schedule")
+    delta.add_argument("--seed", type=int, default=0)
+    delta.set_defaults(run=bench_delta)
+
+    selection = subparsers.add_parser("selection", help="generations per second of the selection strategies")
+    selection.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    selection.add_argument("--strategies", nargs="+", choices=sorted(SELECTION_STRATEGIES),
+                           default=["roulette", "rank", "tournament"])
+    selection.add_argument("--tournament-size", type=int, default=3)
+    selection.add_argument("--elites", type=int, default=2)
+    selection.add_argument("--generations", type=int, default=5)
+    selection.add_argument("--mutation-rate", type=float, default=0.1)
+    selection.add_argument("--slots", type=int, default=8)
+    selection.add_argument("--students", type=int, default=5)
+    selection.add_argument("--classes", type=int, default=5)
+    selection.add_argument("--loop-limit", type=int, default=10000,
+                           help="largest population to also run the per-child roulette reference on")
+    selection.add_argument("--seed", type=int, default=0)
+    selection.set_defaults(run=bench_selection)
+
+    cache = subparsers.add_parser("cache", help="GA runs with and without the fitness cache")
+    cache.add_argument("--mutation-rates", type=float, nargs="+", default=[0.01, 0.05, 0.2])
+    cache.add_argument("--population", type=int, default=500)
+    cache.add_argument("--generations", type=int, default=200)
+    cache.add_argument("--elites", type=int, default=2)
+    cache.add_argument("--cache-size", type=int, default=CACHE_SIZE)
+    cache.add_argument("--slots", type=int, default=8)
+    cache.add_argument("--students", type=int, default=20)
+    cache.add_argument("--classes", type=int, default=10)
+    cache.add_argument("--seed", type=int, default=0)
+    cache.set_defaults(run=bench_cache)
+
+    solver = subparsers.add_parser("solver", help="exact assignment solvers against the GA")
+    solver.add_argument("--classes", type=int, nargs="+", default=[5, 40, 200, 1000])
+    solver.add_argument("--slots", type=int, default=8)
+    solver.add_argument("--students", type=int, default=30)
+    solver.add_argument("--population", type=int, default=100)
+    solver.add_argument("--generations", type=int, default=300)
+    solver.add_argument("--mutation-rate", type=float, default=0.05)
+    solver.add_argument("--elites", type=int, default=2)
+    solver.add_argument("--hungarian-limit", type=int, default=300,
+                        help="largest class count to also solve with the Hungarian method")
+    solver.add_argument("--seed", type=int, default=0)
+    solver.set_defaults(run=bench_solver)
+
+    bound = subparsers.add_parser("bound", help="bounded greedy solver against the GA on multi-slot classes")
+    bound.add_argument("--classes", type=int, nargs="+", default=[5, 40, 200, 1000])
+    bound.add_argument("--slots", type=int, default=8)
+    bound.add_argument("--students", type=int, default=30)
+    bound.add_argument("--population", type=int, default=100)
+    bound.add_argument("--generations", type=int, default=300)
+    bound.add_argument("--mutation-rate", type=float, default=0.05)
+    bound.add_argument("--elites", type=int, default=2)
+    bound.add_argument("--seed", type=int, default=0)
+    bound.set_defaults(run=bench_bound)
+
+    memetic = subparsers.add_parser("memetic", help="GA with local search under a fixed time limit")
+    memetic.add_argument("--budgets", type=float, nargs="+", default=[0, 1, 5, 20, 100],
+                         help="milliseconds of local search per generation; 0 is the plain GA")
+    memetic.add_argument("--time", type=float, default=5, help="seconds per run")
+    memetic.add_argument("--population", type=int, default=50)
+    memetic.add_argument("--mutation-rate", type=float, default=0.05)
+    memetic.add_argument("--elites", type=int, default=2)
+    memetic.add_argument("--slots", type=int, default=8)
+    memetic.add_argument("--students", type=int, default=30)
+    memetic.add_argument("--classes", type=int, default=40)
+    memetic.add_argument("--seed", type=int, default=0)
+    memetic.set_defaults(run=bench_memetic)
+
+    args = parser.parse_args()
+    args.run(args)
+
+
+if __name__ == "__main__":
+    main()
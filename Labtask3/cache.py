@@ -0,0 +1,56 @@
+from collections import OrderedDict
+
+CACHE_SIZE = 100000  # Default number of schedules remembered
+
+
+class FitnessCache:
+    """Bounded LRU cache of schedule fitness, keyed by the raw gene bytes.
+
+    Once the GA converges most children repeat schedules that were already
+    scored, so only schedules that are new (or were evicted) reach the
+    objective. A cache belongs to one environment and objective.
+    """
+
+    def __init__(self, max_size=CACHE_SIZE):
+        self.max_size = max_size
+        self.entries = OrderedDict()  # Schedule.key() -> fitness, least recently used first
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def score(self, population, evaluate):
+        """Return the fitness of every schedule, calling evaluate(schedules) only for unseen ones."""
+        scores = [None] * len(population)
+        pending = {}  # key -> indices of population waiting for it
+        for index, schedule in enumerate(population):
+            key = schedule.key()
+            fitness = self.entries.get(key)
+            if fitness is not None:
+                self.entries.move_to_end(key)
+                scores[index] = fitness
+                self.hits += 1
+            elif key in pending:
+                pending[key].append(index)
+                self.hits += 1  # A duplicate within the batch is only evaluated once
+            else:
+                pending[key] = [index]
+                self.misses += 1
+        if pending:
+            fresh = evaluate([population[indices[0]] for indices in pending.values()])
+            for (key, indices), fitness in zip(pending.items(), fresh):
+                for index in indices:
+                    scores[index] = fitness
+                self.entries[key] = fitness
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+        return scores
+
+    def hit_rate(self):
+        """Return the fraction of lookups served without evaluating."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def stats(self):
+        return f"{self.hits} hits, {self.misses} misses ({self.hit_rate():.1%} hit rate), {len(self)} cached"
@@ -0,0 +1,118 @@
+import hashlib
+import math
+import os
+import struct
+from array import array
+from schedule import Schedule
+
+MAGIC = b"GACK"
+VERSION = 1
+# magic, version, slots, students, classes, seed, generation, best fitness, islands, population size
+HEADER = struct.Struct("<4sHIIIqIdII")
+MIN_SEED, MAX_SEED = -2 ** 63, 2 ** 63 - 1  # Seeds that fit the header's signed 64-bit field
+DIGEST_SIZE = 16
+RNG_WORDS = 625  # Mersenne Twister state words in random.getstate()
+RNG_TAIL = struct.Struct("<Id")  # State version and gauss_next (NaN for None)
+
+
+def environment_digest(env):
+    """Fingerprint the generated classes and students, to refuse resuming against a different environment."""
+    digest = hashlib.blake2b(digest_size=DIGEST_SIZE)
+    digest.update(env.preferences.tobytes())
+    for student in env.students:
+        digest.update(bytes(student["availability"]))
+    for cls in env.classes:
+        digest.update(struct.pack("<II", cls["duration"], cls["priority"]))
+    return digest.digest()
+
+
+def pack_rng_state(state):
+    version, words, gauss_next = state
+    return array("I", words).tobytes() + RNG_TAIL.pack(version, math.nan if gauss_next is None else gauss_next)
+
+
+def unpack_rng_state(data):
+    words = array("I")
+    words.frombytes(data[:4 * RNG_WORDS])
+    version, gauss_next = RNG_TAIL.unpack(data[4 * RNG_WORDS:])
+    return version, tuple(words), None if math.isnan(gauss_next) else gauss_next
+
+
+class Checkpoint:
+    """Everything needed to continue a run: populations, random states and the best schedule so far.
+
+    islands is a list of (population, rng_state); a single-population run
+    is one island. The environment is not stored: it is rebuilt from the
+    seed and sizes and checked against the digest.
+    """
+
+    def __init__(self, num_slots, num_students, num_classes, seed, generation, islands,
+                 best_schedule, best_fitness, digest):
+        self.num_slots = num_slots
+        self.num_students = num_students
+        self.num_classes = num_classes
+        self.seed = seed
+        self.generation = generation
+        self.islands = islands
+        self.best_schedule = best_schedule
+        self.best_fitness = best_fitness
+        self.digest = digest
+
+    def check_environment(self, env):
+        """Raise ValueError unless env is the environment the checkpoint was written for."""
+        if environment_digest(env) != self.digest:
+            raise ValueError("Checkpoint was written for a different environment")
+
+
+def save_checkpoint(path, env, seed, generation, islands, best_schedule, best_fitness):
+    """Write a checkpoint atomically, so a run killed mid-write keeps the previous one."""
+    population_size = len(islands[0][0])
+    chunks = [
+        HEADER.pack(MAGIC, VERSION, env.num_slots, env.num_students, env.num_classes, seed, generation,
+                    best_fitness, len(islands), population_size),
+        environment_digest(env),
+        best_schedule.slots.tobytes(),
+        best_schedule.students.tobytes(),
+    ]
+    for population, rng_state in islands:
+        chunks.append(pack_rng_state(rng_state))
+        chunks.extend(schedule.slots.tobytes() for schedule in population)
+        chunks.extend(schedule.students.tobytes() for schedule in population)
+    temporary = f"{path}.tmp"
+    with open(temporary, "wb") as file:
+        file.write(b"".join(chunks))
+    os.replace(temporary, path)
+
+
+def load_checkpoint(path):
+    """Read a checkpoint written by save_checkpoint."""
+    with open(path, "rb") as file:
+        data = file.read()
+    if len(data) < HEADER.size or not data.startswith(MAGIC):
+        raise ValueError(f"{path} is not a GA checkpoint")
+    (magic, version, num_slots, num_students, num_classes, seed, generation, best_fitness,
+     num_islands, population_size) = HEADER.unpack_from(data)
+    if version != VERSION:
+        raise ValueError(f"{path} is a version {version} checkpoint, expected version {VERSION}")
+    offset = HEADER.size
+    digest = data[offset:offset + DIGEST_SIZE]
+    offset += DIGEST_SIZE
+    width = 2 * num_classes  # Bytes per schedule in each gene buffer
+    best_schedule = Schedule.from_bytes(data[offset:offset + width], data[offset + width:offset + 2 * width])
+    offset += 2 * width
+    rng_size = 4 * RNG_WORDS + RNG_TAIL.size
+    islands = []
+    for _ in range(num_islands):
+        rng_state = unpack_rng_state(data[offset:offset + rng_size])
+        offset += rng_size
+        slots = offset
+        students = offset + population_size * width
+        population = [
+            Schedule.from_bytes(data[slots + index * width:slots + (index + 1) * width],
+                                data[students + index * width:students + (index + 1) * width])
+            for index in range(population_size)
+        ]
+        offset += 2 * population_size * width
+        islands.append((population, rng_state))
+    return Checkpoint(num_slots, num_students, num_classes, seed, generation, islands,
+                      best_schedule, best_fitness, digest)
@@ -1,4 +1,12 @@
 import random
+import numpy as np
+from schedule import Schedule
+
+
+def numpy_rng(rng=random):
+    """Return a NumPy generator seeded from rng (the random module by default), so seeded runs stay reproducible."""
+    return np.random.default_rng(rng.getrandbits(64))
+
 
 class Environment:
     def __init__(self, num_slots, num_students, num_classes):
@@ -7,6 +15,9 @@ class Environment:
         self.num_classes = num_classes
         self.classes = self.generate_classes()
         self.students = self.generate_students()
+        # preferences[student, slot], for gathering the fitness of many schedules at once
+        self.preferences = np.array([student["preferences"] for student in self.students], dtype=np.float64)
+        self.build_availability_index()
 
     def generate_classes(self):
         """Generate classes with random durations and priorities."""
@@ -30,15 +41,45 @@ class Environment:
             for i in range(self.num_students)
         ]
 
+    def build_availability_index(self):
+        """Index every available (slot, student) pair, overall and per slot."""
+        self.students_by_slot = [
+            [student_id for student_id, student in enumerate(self.students) if student["availability"][slot]]
+            for slot in range(self.num_slots)
+        ]
+        self.available_genes = [
+            (slot, student_id) for slot, student_ids in enumerate(self.students_by_slot) for student_id in student_ids
+        ]
+        self.gene_array = np.array(self.available_genes, dtype=np.uint16).reshape(-1, 2)
+
+    def random_gene(self):
+        """Pick an available (slot, student) pair uniformly at random."""
+        if not self.available_genes:
+            raise ValueError("No student is available in any slot")
+        return random.choice(self.available_genes)
+
+    def random_student(self, slot):
+        """Pick a student available in the given slot, or None if there is none."""
+        student_ids = self.students_by_slot[slot]
+        return random.choice(student_ids) if student_ids else None
+
     def generate_random_schedule(self):
         """Generate a random schedule assigning classes to time slots and students."""
-        schedule = []
-        for cls in self.classes:
-            assigned = False
-            while not assigned:
-                slot = random.randint(0, self.num_slots - 1)
-                student = random.randint(0, self.num_students - 1)
-                if self.students[student]["availability"][slot]:
-                    schedule.append({"class": cls, "slot": slot, "student": student})
-                    assigned = True
-        return schedule
+        genes = [self.random_gene() for _ in self.classes]
+        return Schedule([slot for slot, _ in genes], [student for _, student in genes])
+
+    def generate_random_population(self, population_size, rng=random):
+        """Generate many random schedules at once by sampling the availability index.
+
+        rng is a random.Random (or the module itself) that seeds the sampling.
+        """
+        if not self.available_genes:
+            raise ValueError("No student is available in any slot")
+        indices = numpy_rng(rng).integers(len(self.gene_array), size=(population_size, self.num_classes))
+        picks = self.gene_array[indices]
+        slots, students = picks[..., 0].tobytes(), picks[..., 1].tobytes()
+        width = 2 * self.num_classes  # Bytes per schedule in each buffer
+        return [
+            Schedule.from_bytes(slots[start:start + width], students[start:start + width])
+            for start in range(0, population_size * width, width)
+        ]
@@ -0,0 +1,96 @@
+import random
+import numpy as np
+from environment import numpy_rng
+from schedule import Schedule
+from selection import elite_indices, roulette_selection
+
+def initialize_population(env, population_size, rng=random):
+    """Generate an initial population of random schedules, drawing from rng."""
+    return env.generate_random_population(population_size, rng)
+
+def evaluate_fitness(env, schedule):
+    """Calculate the fitness of a schedule based on student preferences."""
+    fitness = 0
+    for _, slot, student in schedule:
+        fitness += env.students[student]["preferences"][slot]
+    return fitness
+
+def encode_population(population):
+    """Encode schedules as (population, classes) integer arrays of slots and students."""
+    shape = (len(population), len(population[0]) if population else 0)
+    # Schedules keep their genes in flat arrays, so joining the raw buffers is enough
+    slots = np.frombuffer(b"".join(schedule.slots for schedule in population), dtype=np.uint16)
+    students = np.frombuffer(b"".join(schedule.students for schedule in population), dtype=np.uint16)
+    return slots.reshape(shape).astype(np.intp), students.reshape(shape).astype(np.intp)
+
+def evaluate_population(env, slots, students):
+    """Calculate the fitness of every encoded schedule with one gather over the preference matrix."""
+    gathered = env.preferences[students, slots]
+    # A running sum adds the classes left to right like evaluate_fitness, so the scores match exactly
+    return gathered.cumsum(axis=1)[:, -1] if gathered.shape[1] else np.zeros(len(gathered))
+
+def crossover(parent1, parent2):
+    """Perform crossover between two parents to produce a child."""
+    crossover_point = len(parent1) // 2
+    # Slicing copies the gene buffers, so the child shares nothing with its parents
+    return Schedule(parent1.slots[:crossover_point] + parent2.slots[crossover_point:],
+                    parent1.students[:crossover_point] + parent2.students[crossover_point:])
+
+def mutate(schedule, mutation_rate, env):
+    """Mutate a schedule with a given mutation rate, only proposing available (slot, student) pairs."""
+    for class_index in range(len(schedule)):
+        if random.random() < mutation_rate:
+            schedule.assign(class_index, *env.random_gene())
+
+def score_population(env, population, objective=None, cache=None):
+    """Return the fitness of every schedule in the population as a list.
+
+    Uses the preference-only fitness unless an objective such as
+    ConstraintObjective is given. With a FitnessCache only schedules it has
+    not seen are evaluated.
+    """
+    if cache is not None:
+        return cache.score(population, lambda schedules: score_population(env, schedules, objective))
+    encoded = encode_population(population)
+    if objective is not None:
+        return objective.evaluate_population(*encoded).tolist()
+    return evaluate_population(env, *encoded).tolist()
+
+def population_stats(env, population, fitness_scores):
+    """Summarize a generation: best and mean fitness, and how diverse the genes still are.
+
+    diversity is the chance that two random schedules assign a class
+    differently, averaged over classes (0 once the population has
+    converged); unique is the fraction of distinct schedules.
+    """
+    slots, students = encode_population(population)
+    genes = env.num_slots * env.num_students
+    # One bincount over every class: gene codes are offset by class so the columns do not mix
+    codes = slots * env.num_students + students + np.arange(slots.shape[1]) * genes
+    frequencies = np.bincount(codes.ravel(), minlength=slots.shape[1] * genes).reshape(-1, genes) / len(population)
+    return {
+        "best": max(fitness_scores),
+        "mean": sum(fitness_scores) / len(fitness_scores),
+        "diversity": float((1 - (frequencies ** 2).sum(axis=1)).mean()) if slots.shape[1] else 0.0,
+        "unique": len({schedule.key() for schedule in population}) / len(population),
+    }
+
+def next_generation(env, population, fitness_scores, mutation_rate, selection=roulette_selection, elites=0,
+                    local_search=None):
+    """Breed a new population of the same size through selection, crossover and mutation.
+
+    selection is a strategy from selection.py; every parent of the
+    generation is drawn in one batch. The elites fittest individuals are
+    carried over unchanged. A memetic.LocalSearch given as local_search
+    then improves the children in place.
+    """
+    new_population = [population[index].copy() for index in elite_indices(fitness_scores, elites)]
+    children = len(population) - len(new_population)
+    parents = selection(fitness_scores, 2 * children, numpy_rng()).reshape(children, 2).tolist()
+    for first, second in parents:
+        child = crossover(population[first], population[second])
+        mutate(child, mutation_rate, env)
+        new_population.append(child)
+    if local_search is not None:
+        local_search(new_population[len(new_population) - children:])
+    return new_population
@@ -0,0 +1,95 @@
+import multiprocessing
+import random
+from ga import initialize_population, next_generation, score_population
+from selection import roulette_selection
+
+
+class Island:
+    """One sub-population with its own random state, so it evolves the same in any process."""
+
+    def __init__(self, index, population, rng_state):
+        self.index = index
+        self.population = population
+        self.rng_state = rng_state
+        self.fitness_scores = []
+
+    def best(self):
+        """Return (schedule, fitness) of the fittest individual."""
+        best_fitness = max(self.fitness_scores)
+        return self.population[self.fitness_scores.index(best_fitness)], best_fitness
+
+
+def evolve_island(task):
+    """Worker: evolve one island for a number of generations and hand it back."""
+    env, island, generations, mutation_rate, objective, selection, elites, local_search = task
+    random.setstate(island.rng_state)
+    for _ in range(generations):
+        island.fitness_scores = score_population(env, island.population, objective)
+        island.population = next_generation(env, island.population, island.fitness_scores, mutation_rate,
+                                            selection, elites, local_search)
+    island.fitness_scores = score_population(env, island.population, objective)
+    island.rng_state = random.getstate()
+    return island
+
+
+def migrate(islands, migrants):
+    """Copy the best individuals of each island over the worst of the next one (ring topology)."""
+    elites = []
+    for island in islands:
+        ranked = sorted(range(len(island.population)), key=island.fitness_scores.__getitem__, reverse=True)
+        elites.append([(island.population[i].copy(), island.fitness_scores[i]) for i in ranked[:migrants]])
+    for index, island in enumerate(islands):
+        incoming = elites[index - 1]  # From the previous island in the ring
+        ranked = sorted(range(len(island.population)), key=island.fitness_scores.__getitem__)
+        for slot, (schedule, fitness) in zip(ranked, incoming):
+            island.population[slot] = schedule
+            island.fitness_scores[slot] = fitness
+
+
+def run_islands(env, num_islands, population_size, generations, mutation_rate,
+                migration_interval, migrants, workers=None, seed=None, progress=print, objective=None,
+                selection=roulette_selection, elites=0, resume=None, on_epoch=None, local_search=None, initial=None):
+    """Evolve num_islands sub-populations across worker processes with periodic migration.
+
+    Island i draws its random numbers from seed + i (or a fresh seed when
+    seed is None), so a seeded run gives the same result for any worker
+    count. objective is passed to score_population, selection, elites and
+    local_search to next_generation. A schedule given as initial joins the
+    first island's population. A Checkpoint given as resume replaces the initial
+    islands; on_epoch(done, islands, best_schedule, best_fitness) is called
+    after every migration, e.g. to save one. Returns (best_schedule,
+    best_fitness) over every island.
+    """
+    if resume is not None:
+        islands = [Island(index, population, rng_state)
+                   for index, (population, rng_state) in enumerate(resume.islands)]
+        best_schedule, best_fitness = resume.best_schedule, resume.best_fitness
+        done = resume.generation
+    else:
+        islands = []
+        for index in range(num_islands):
+            rng = random.Random(None if seed is None else seed + index)  # Leaves the caller's random state alone
+            islands.append(Island(index, initialize_population(env, population_size, rng), rng.getstate()))
+        if initial is not None:
+            islands[0].population[0] = initial.copy()
+        best_schedule, best_fitness = None, float("-inf")
+        done = 0
+
+    with multiprocessing.Pool(min(workers or len(islands), len(islands))) as pool:
+        while done < generations:
+            epoch = min(migration_interval, generations - done)
+            islands = pool.map(evolve_island, [(env, island, epoch, mutation_rate, objective, selection, elites,
+                                                    local_search) for island in islands])
+            done += epoch
+            for island in islands:
+                schedule, fitness = island.best()
+                if fitness > best_fitness:
+                    best_schedule, best_fitness = schedule.copy(), fitness
+            if progress:
+                progress(f"Generation {done}: best fitness {best_fitness:.2f} "
+                         f"(islands: {', '.join(f'{island.best()[1]:.2f}' for island in islands)})")
+            # Also after the last epoch, so a saved run resumes exactly where a longer one would be
+            migrate(islands, migrants)
+            if on_epoch:
+                on_epoch(done, islands, best_schedule, best_fitness)
+    return best_schedule, best_fitness
@@ -0,0 +1,80 @@
+import random
+import time
+from agent import Student
+
+STEPS = 200  # Moves tried per child when no time budget is given
+CLOCK_EVERY = 16  # Moves between clock reads when a time budget is set
+
+
+class LocalSearch:
+    """Bounded hill climbing on freshly bred children: the memetic stage of the GA.
+
+    Each move picks a random class and a random available (slot,
+    student) cell. It prices moving the class there with
+    FitnessState.delta. If a Student index says another class starts in
+    that cell, it also prices swapping the two. The better of the two is
+    kept if it improves the fitness. The work per generation is capped by
+    steps per child, by a time budget in seconds shared by all children,
+    or by both. Without a budget a seeded run stays reproducible.
+    """
+
+    def __init__(self, env, objective, budget=None, steps=STEPS):
+        self.env = env
+        self.objective = objective
+        self.budget = budget
+        self.steps = steps
+        self.students = [Student(student["id"], student["availability"], student["preferences"])
+                         for student in env.students]
+        self.moves = 0
+        self.improvements = 0
+
+    def __call__(self, schedules):
+        """Improve the schedules in place within the step and time limits."""
+        deadline = time.perf_counter() + self.budget if self.budget else None
+        for index, schedule in enumerate(schedules):
+            child_deadline = None
+            if deadline is not None:
+                now = time.perf_counter()
+                if now >= deadline:
+                    break
+                child_deadline = now + (deadline - now) / (len(schedules) - index)  # Fair share of what is left
+            self.climb(schedule, child_deadline)
+
+    def relocate(self, state, class_index, slot, student):
+        """Move one class, keeping the fitness state and the student indexes in step."""
+        self.students[state.schedule.students[class_index]].remove_class(class_index)
+        state.apply(class_index, slot, student)
+        self.students[student].assign_class(class_index, slot)
+
+    def climb(self, schedule, deadline=None):
+        """Hill-climb one schedule until it runs out of steps or time."""
+        state = self.objective.state(schedule)
+        for class_index, slot, student in schedule:
+            self.students[student].assign_class(class_index, slot)
+        step = 0
+        while self.steps is None or step < self.steps:
+            if deadline is not None and step % CLOCK_EVERY == 0 and time.perf_counter() >= deadline:
+                break
+            step += 1
+            class_index = random.randrange(len(schedule))
+            slot, student = self.env.random_gene()
+            old_slot, old_student = schedule.slots[class_index], schedule.students[class_index]
+            if (slot, student) == (old_slot, old_student):
+                continue
+            gain = state.delta(class_index, slot, student)
+            other = self.students[student].occupant(slot)
+            if other is not None and self.students[old_student].availability[old_slot]:
+                # Price the swap with this class already moved, then keep the better option or undo it
+                self.relocate(state, class_index, slot, student)
+                swap_gain = gain + state.delta(other, old_slot, old_student)
+                if swap_gain > gain and swap_gain > 0:
+                    self.relocate(state, other, old_slot, old_student)
+                elif gain <= 0:
+                    self.relocate(state, class_index, old_slot, old_student)
+            elif gain > 0:
+                self.relocate(state, class_index, slot, student)
+            self.improvements += schedule.slots[class_index] != old_slot or schedule.students[class_index] != old_student
+        self.moves += step
+        for class_index in range(len(schedule)):
+            self.students[schedule.students[class_index]].remove_class(class_index)
+        return state.fitness
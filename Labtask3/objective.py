@@ -0,0 +1,135 @@
+import numpy as np
+
+# Default penalty weights, in the same units as a priority-weighted preference
+CLASH_PENALTY = 5.0  # Per extra class booked into the same (student, slot) cell
+UNAVAILABLE_PENALTY = 2.0  # Per occupied slot the student is not available in
+OVERFLOW_PENALTY = 5.0  # Per slot a multi-slot class runs past the last slot
+
+
+class ConstraintObjective:
+    """Penalty-based schedule fitness that accounts for durations, priorities and clashes.
+
+    A class assigned to (slot, student) occupies ``duration`` consecutive
+    slots of that student. Every occupied cell earns the student's
+    preference for that slot times the class priority. Penalties are
+    subtracted for double-booked cells (clashes between classes of the
+    same student, including overlapping multi-slot classes), cells where
+    the student is unavailable, and slots that run past the end of the day.
+    """
+
+    def __init__(self, env, clash_penalty=CLASH_PENALTY, unavailable_penalty=UNAVAILABLE_PENALTY,
+                 overflow_penalty=OVERFLOW_PENALTY):
+        self.env = env
+        self.num_slots = env.num_slots
+        self.num_students = env.num_students
+        self.clash_penalty = clash_penalty
+        self.unavailable_penalty = unavailable_penalty
+        self.overflow_penalty = overflow_penalty
+        self.durations = [cls["duration"] for cls in env.classes]
+        self.priorities = [cls["priority"] for cls in env.classes]
+        self.preferences = env.preferences.tolist()
+        self.available = [student["availability"] for student in env.students]
+
+    def gene_score(self, class_index, slot, student):
+        """Score one class on its own: weighted preferences minus availability and overflow penalties."""
+        score = 0.0
+        priority = self.priorities[class_index]
+        for occupied in range(slot, slot + self.durations[class_index]):
+            if occupied >= self.num_slots:
+                score -= self.overflow_penalty
+                continue
+            score += priority * self.preferences[student][occupied]
+            if not self.available[student][occupied]:
+                score -= self.unavailable_penalty
+        return score
+
+    def cells(self, class_index, slot, student):
+        """List the (student, slot) cell ids a class occupies inside the day."""
+        end = min(slot + self.durations[class_index], self.num_slots)
+        return [student * self.num_slots + occupied for occupied in range(slot, end)]
+
+    def evaluate(self, schedule):
+        """Calculate the fitness of one schedule from scratch."""
+        occupancy = [0] * (self.num_students * self.num_slots)
+        fitness = 0.0
+        for class_index, slot, student in schedule:
+            fitness += self.gene_score(class_index, slot, student)
+            for cell in self.cells(class_index, slot, student):
+                occupancy[cell] += 1
+        clashes = sum(count - 1 for count in occupancy if count > 1)
+        return fitness - self.clash_penalty * clashes
+
+    def evaluate_population(self, slots, students):
+        """Calculate the fitness of every encoded schedule at once."""
+        population, num_classes = slots.shape
+        durations = np.array(self.durations, dtype=np.intp)
+        priorities = np.array(self.priorities, dtype=np.float64)
+        available = np.array(self.available, dtype=bool)
+        fitness = np.zeros(population)
+        cells = []
+        for offset in range(int(durations.max(initial=1))):
+            active = offset < durations  # Classes long enough to reach this offset
+            occupied = slots + offset
+            inside = active & (occupied < self.num_slots)
+            clipped = np.minimum(occupied, self.num_slots - 1)
+            reward = priorities * self.env.preferences[students, clipped]
+            penalty = self.unavailable_penalty * ~available[students, clipped]
+            fitness += np.where(inside, reward - penalty, 0).sum(axis=1)
+            fitness -= self.overflow_penalty * (active & ~inside).sum(axis=1)
+            cells.append(np.where(inside, students * self.num_slots + clipped, -1))
+        # Count how many classes land in each (student, slot) cell of each individual
+        cells = np.concatenate(cells, axis=1)
+        width = self.num_students * self.num_slots
+        rows = np.broadcast_to(np.arange(population)[:, None], cells.shape)
+        valid = cells >= 0
+        counts = np.bincount(rows[valid] * width + cells[valid], minlength=population * width)
+        clashes = np.maximum(counts.reshape(population, width) - 1, 0).sum(axis=1)
+        return fitness - self.clash_penalty * clashes
+
+    def state(self, schedule):
+        """Track a schedule for O(1) fitness updates when single genes change."""
+        return FitnessState(self, schedule)
+
+
+class FitnessState:
+    """A schedule with its cell occupancy and fitness, updated incrementally.
+
+    ``delta`` prices a single-gene change and ``apply`` makes it; both only
+    touch the ``duration`` cells of the old and new assignment, so the cost
+    does not grow with the number of classes.
+    """
+
+    def __init__(self, objective, schedule):
+        self.objective = objective
+        self.schedule = schedule
+        self.occupancy = [0] * (objective.num_students * objective.num_slots)
+        for class_index, slot, student in schedule:
+            for cell in objective.cells(class_index, slot, student):
+                self.occupancy[cell] += 1
+        self.fitness = objective.evaluate(schedule)
+
+    def delta(self, class_index, slot, student):
+        """Return the fitness change of moving one class to (slot, student), without applying it."""
+        objective = self.objective
+        old_slot, old_student = self.schedule.slots[class_index], self.schedule.students[class_index]
+        change = objective.gene_score(class_index, slot, student) - objective.gene_score(class_index, old_slot, old_student)
+        removed = objective.cells(class_index, old_slot, old_student)
+        clashes = 0
+        for cell in removed:
+            if self.occupancy[cell] > 1:
+                clashes -= 1  # Leaving a shared cell removes one clash
+        for cell in objective.cells(class_index, slot, student):
+            # Cells the class keeps are already counted once for it
+            if self.occupancy[cell] - (cell in removed) >= 1:
+                clashes += 1
+        return change - objective.clash_penalty * clashes
+
+    def apply(self, class_index, slot, student):
+        """Move one class to (slot, student) and update the fitness in place."""
+        self.fitness += self.delta(class_index, slot, student)
+        objective = self.objective
+        for cell in objective.cells(class_index, self.schedule.slots[class_index], self.schedule.students[class_index]):
+            self.occupancy[cell] -= 1
+        for cell in objective.cells(class_index, slot, student):
+            self.occupancy[cell] += 1
+        self.schedule.assign(class_index, slot, student)
@@ -0,0 +1,18 @@
+import json
+import time
+
+
+class ProgressLog:
+    """Stream one JSON object per line, flushed as it is written, so a killed run keeps its log."""
+
+    def __init__(self, path, append=False):
+        self.file = open(path, "a" if append else "w")
+        self.start = time.perf_counter()
+
+    def write(self, generation, **stats):
+        row = {"generation": generation, **stats, "elapsed": round(time.perf_counter() - self.start, 6)}
+        self.file.write(json.dumps(row) + "\n")
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
@@ -1,145 +1,203 @@
-import pygame
+import argparse
+import os
 import random
+import time
+from cache import CACHE_SIZE, FitnessCache
+from checkpoint import MAX_SEED, MIN_SEED, load_checkpoint, save_checkpoint
 from environment import Environment
-
-def initialize_population(env, population_size):
-    """Generate an initial population of random schedules."""
-    return [env.generate_random_schedule() for _ in range(population_size)]
-
-def evaluate_fitness(env, schedule):
-    """Calculate the fitness of a schedule based on student preferences."""
-    fitness = 0
-    for entry in schedule:
-        student = entry["student"]
-        slot = entry["slot"]
-        fitness += env.students[student]["preferences"][slot]
-    return fitness
-
-def select_parents(population, fitness_scores):
-    """Select two parents using roulette wheel selection."""
-    total_fitness = sum(fitness_scores)
-    probabilities = [fitness / total_fitness for fitness in fitness_scores]
-    parents = random.choices(population, weights=probabilities, k=2)
-    return parents
-
-def crossover(parent1, parent2):
-    """Perform crossover between two parents to produce a child."""
-    child = []
-    crossover_point = len(parent1) // 2
-    child.extend(parent1[:crossover_point])
-    child.extend(parent2[crossover_point:])
-    return child
-
-def mutate(schedule, mutation_rate, env):
-    """Mutate a schedule with a given mutation rate."""
-    for entry in schedule:
-        if random.random() < mutation_rate:
-            entry["slot"] = random.randint(0, env.num_slots - 1)
-            entry["student"] = random.randint(0, env.num_students - 1)
-
-def visualize_schedule(env, schedule, generation, fitness, max_fitness):
-    """Visualize the schedule using Pygame."""
-    pygame.init()
-    screen = pygame.display.set_mode((1100, 700))
-    pygame.display.set_caption("Task Assignment Visualization")
-
-    screen.fill((200, 200, 200))
-    font = pygame.font.Font(None, 28)
-
-    # Display generation and fitness
-    gen_text = font.render(f"Generation: {generation}", True, (0, 0, 0))
-    fitness_text = font.render(f"Best Fitness (Current): {fitness:.2f}", True, (0, 0, 0))
-    max_fitness_text = font.render(f"Max Fitness Achieved: {max_fitness:.2f}", True, (0, 0, 0))
-    screen.blit(gen_text, (800, 10))
-    screen.blit(fitness_text, (800, 40))
-    screen.blit(max_fitness_text, (800, 70))
-
-    # Grid setup
-    cell_width = 60
-    cell_height = 60
-    margin = 0
-    x_offset = 200
-    y_offset = 150
-
-    # Draw slot headers
-    for slot in range(env.num_slots):
-        header_text = font.render(f"Slot {slot+1}", True, (0, 0, 0))
-        screen.blit(header_text, (x_offset + slot * (cell_width + margin), y_offset - 40))
-
-    # Draw grid and preferences
-    for student_id, student in enumerate(env.students):
-        for slot in range(env.num_slots):
-            x = x_offset + slot * (cell_width + margin)
-            y = y_offset + student_id * (cell_height + margin)
-
-            rect = pygame.Rect(x, y, cell_width, cell_height)
-            pygame.draw.rect(screen, (255, 255, 255), rect)
-            pygame.draw.rect(screen, (0, 0, 0), rect, 1)
-
-            # Display preferences
-            preference = student["preferences"][slot]
-            text = font.render(f"{preference:.2f}", True, (0, 0, 0))
-            screen.blit(text, (x + 5, y + 5))
-
-    # Fill grid with schedule
-    for entry in schedule:
-        cls = entry["class"]
-        slot = entry["slot"]
-        student = entry["student"]
-
-        x = x_offset + slot * (cell_width + margin)
-        y = y_offset + student * (cell_height + margin)
-
-        rect = pygame.Rect(x, y, cell_width, cell_height)
-        color = (0, 0, 255) if cls["priority"] >= 4 else (180, 180, 180)
-
-        pygame.draw.rect(screen, color, rect)
-        pygame.draw.rect(screen, (0, 0, 0), rect, 2)
-
-        text = font.render(f"{cls['id']} {cls['duration']}h", True, (255, 255, 255))
-        screen.blit(text, (x + 5, y + 25))
-
-    pygame.display.flip()
-    pygame.time.delay(1000)
+from ga import initialize_population, next_generation, population_stats, score_population
+from islands import run_islands
+from memetic import STEPS, LocalSearch
+from objective import ConstraintObjective
+from progress import ProgressLog
+from selection import SELECTION_STRATEGIES, TOURNAMENT_SIZE, make_selection
+from solver import exact_blocker, solve_bounded, solve_exact
+from visualizer import ScheduleVisualizer
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Evolve class schedules with a genetic algorithm.")
+    parser.add_argument("--slots", type=int, default=8, help="number of time slots")
+    parser.add_argument("--students", type=int, default=5, help="number of students")
+    parser.add_argument("--classes", type=int, default=5, help="number of classes")
+    parser.add_argument("--population", type=int, default=50, help="population size (per island)")
+    parser.add_argument("--mutation-rate", type=float, default=0.1)
+    parser.add_argument("--generations", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=None, help="seed for a reproducible run")
+    parser.add_argument("--islands", type=int, default=1, help="sub-populations evolved in parallel")
+    parser.add_argument("--migration-interval", type=int, default=10, help="generations between migrations")
+    parser.add_argument("--migrants", type=int, default=2, help="elites sent to the next island per migration")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="processes for the island model")
+    parser.add_argument("--solver", choices=["ga", "exact"], default="ga",
+                        help="evolve, or solve exactly as an assignment; when it cannot, bound the optimum "
+                             "and run the GA from a greedy schedule")
+    parser.add_argument("--exact-method", choices=["dp", "hungarian"], default="dp",
+                        help="assignment method for --solver exact: the dynamic program, or the Hungarian method "
+                             "(cubic in the class count)")
+    parser.add_argument("--objective", choices=["preference", "constraints"], default="preference",
+                        help="preference sums only, or penalize clashes, durations and availability")
+    parser.add_argument("--selection", choices=sorted(SELECTION_STRATEGIES), default="roulette",
+                        help="parent selection strategy")
+    parser.add_argument("--tournament-size", type=int, default=TOURNAMENT_SIZE, help="entrants per tournament")
+    parser.add_argument("--elites", type=int, default=0, help="fittest schedules carried over unchanged each generation")
+    parser.add_argument("--local-search", type=int, default=0, metavar="STEPS",
+                        help=f"hill-climbing moves per child after mutation (e.g. {STEPS}); needs --objective constraints")
+    parser.add_argument("--local-search-budget", type=float, default=None, metavar="SECONDS",
+                        help="cap hill climbing at this much time per generation (no step limit unless "
+                             "--local-search is also given); timed runs are not reproducible")
+    parser.add_argument("--cache-size", type=int, default=0,
+                        help=f"remember the fitness of this many schedules (e.g. {CACHE_SIZE}); 0 disables the cache")
+    parser.add_argument("--checkpoint", help="file to save the population, random state and best schedule to")
+    parser.add_argument("--checkpoint-every", type=int, default=100,
+                        help="generations between checkpoints (islands save after every migration)")
+    parser.add_argument("--resume", help="checkpoint file to continue from; sizes and seed are taken from it")
+    parser.add_argument("--log", help="JSONL file for per-generation best, mean and diversity")
+    parser.add_argument("--headless", action="store_true", help="evolve without opening a window")
+    parser.add_argument("--render-every", type=int, default=1, help="draw every Nth generation")
+    parser.add_argument("--fps", type=float, default=30, help="upper bound on frames drawn per second")
+    args = parser.parse_args()
+    if (args.local_search or args.local_search_budget) and args.objective != "constraints":
+        parser.error("--local-search needs --objective constraints")
+    if args.checkpoint and args.seed is not None and not MIN_SEED <= args.seed <= MAX_SEED:
+        parser.error(f"--checkpoint needs a --seed from {MIN_SEED} to {MAX_SEED}")
+    return args
 
 def main():
-    # Simulation parameters
-    num_slots = 8
-    num_students = 5
-    num_classes = 5
-    population_size = 50
-    mutation_rate = 0.1
-    num_generations = 100
-    delay = 1000  # ms
+    args = parse_args()
+    resume = load_checkpoint(args.resume) if args.resume else None
+    if resume is not None:
+        # The environment is rebuilt from the seed, so the sizes and seed must match the checkpoint
+        args.slots, args.students, args.classes = resume.num_slots, resume.num_students, resume.num_classes
+        args.seed, args.islands = resume.seed, len(resume.islands)
+        args.population = len(resume.islands[0][0])
+        print(f"Resuming {args.resume} at generation {resume.generation} (seed {args.seed})")
+    elif args.checkpoint and args.seed is None:
+        args.seed = random.randrange(2 ** 63)  # A checkpoint can only be resumed from a known seed
+    if args.seed is not None:
+        random.seed(args.seed)
 
     # Initialize environment
-    env = Environment(num_slots, num_students, num_classes)
-
-    # Initialize population
-    population = initialize_population(env, population_size)
-    max_fitness = 0
-
-    for generation in range(1, num_generations + 1):
-        # Evaluate fitness of each individual in the population
-        fitness_scores = [evaluate_fitness(env, schedule) for schedule in population]
-
-        # Find the best schedule
-        best_fitness = max(fitness_scores)
-        max_fitness = max(max_fitness, best_fitness)
-        best_schedule = population[fitness_scores.index(best_fitness)]
-
-        # Visualize the best schedule
-        visualize_schedule(env, best_schedule, generation, best_fitness, max_fitness)
-
-        # Create a new population
-        new_population = []
-        while len(new_population) < population_size:
-            parent1, parent2 = select_parents(population, fitness_scores)
-            child = crossover(parent1, parent2)
-            mutate(child, mutation_rate, env)
-            new_population.append(child)
-
-        population = new_population
+    env = Environment(args.slots, args.students, args.classes)
+    if resume is not None:
+        resume.check_environment(env)
+
+    objective = ConstraintObjective(env) if args.objective == "constraints" else None
+    selection = make_selection(args.selection, args.tournament_size)
+    local_search = None
+    if args.local_search or args.local_search_budget:
+        local_search = LocalSearch(env, objective, budget=args.local_search_budget, steps=args.local_search or None)
+    log = ProgressLog(args.log, append=resume is not None) if args.log else None
+
+    # Rendering is an optional observer; the evolution loop never waits for it
+    visualizer = None
+    if not args.headless:
+        visualizer = ScheduleVisualizer(env, every=args.render_every, fps=args.fps)
+
+    initial, upper_bound = None, None  # A schedule to start the GA from, and a bound on any schedule's fitness
+    if args.solver == "exact":
+        blocker = exact_blocker(env, objective)
+        solved = None
+        start = time.perf_counter()
+        if blocker is None:
+            solved = solve_exact(env, objective, args.exact_method)
+        elif objective is not None and env.available_genes and resume is None:
+            initial, initial_fitness, upper_bound = solve_bounded(env, objective)
+            print(f"Exact solver unavailable ({blocker}). Greedy schedule {initial_fitness:.2f}, "
+                  f"upper bound {upper_bound:.2f} (gap {upper_bound - initial_fitness:.2f})")
+            if upper_bound - initial_fitness <= 1e-9:
+                solved = initial, initial_fitness  # The bound proves the greedy schedule optimal
+        else:
+            print(f"Exact solver unavailable ({blocker}), running the GA instead")
+        if solved is not None:
+            best_schedule, max_fitness = solved
+            print(f"Optimal fitness {max_fitness:.2f} in {(time.perf_counter() - start) * 1000:.1f} ms")
+            if visualizer:
+                visualizer(0, best_schedule, max_fitness, max_fitness, force=True)
+                visualizer.wait_until_closed()
+                visualizer.close()
+            return
+
+    cache = None
+    first_generation = resume.generation + 1 if resume is not None else 1
+    generation = first_generation - 1
+    start = time.perf_counter()
+    if args.islands > 1:
+        def on_epoch(done, islands, best_schedule, best_fitness):
+            if log:
+                population = [schedule for island in islands for schedule in island.population]
+                fitness_scores = [fitness for island in islands for fitness in island.fitness_scores]
+                log.write(done, max_fitness=best_fitness, islands=[island.best()[1] for island in islands],
+                          **population_stats(env, population, fitness_scores))
+            if args.checkpoint:
+                save_checkpoint(args.checkpoint, env, args.seed, done,
+                                [(island.population, island.rng_state) for island in islands],
+                                best_schedule, best_fitness)
+
+        # Island model: evolve sub-populations across worker processes
+        best_schedule, max_fitness = run_islands(
+            env, args.islands, args.population, args.generations, args.mutation_rate,
+            args.migration_interval, args.migrants, args.workers, args.seed, objective=objective,
+            selection=selection, elites=args.elites, resume=resume, on_epoch=on_epoch, local_search=local_search,
+            initial=initial)
+        generation = max(generation, args.generations)
+    else:
+        if resume is not None:
+            (population, rng_state), = resume.islands
+            random.setstate(rng_state)
+            best_schedule, max_fitness = resume.best_schedule, resume.best_fitness
+        else:
+            # Initialize population
+            population = initialize_population(env, args.population)
+            if initial is not None:
+                population[0] = initial
+            best_schedule, max_fitness = None, float("-inf")
+        cache = FitnessCache(args.cache_size) if args.cache_size > 0 else None
+
+        for generation in range(first_generation, args.generations + 1):
+            # Evaluate fitness of each individual in the population
+            fitness_scores = score_population(env, population, objective, cache)
+
+            # Find the best schedule
+            best_fitness = max(fitness_scores)
+            current_best = population[fitness_scores.index(best_fitness)]
+            if best_fitness > max_fitness:
+                best_schedule, max_fitness = current_best.copy(), best_fitness
+            if log:
+                log.write(generation, max_fitness=max_fitness, **population_stats(env, population, fitness_scores))
+
+            # Let the visualizer draw the best schedule if a frame is due
+            if visualizer:
+                visualizer(generation, current_best, best_fitness, max_fitness)
+                if visualizer.closed:
+                    break
+
+            # Create a new population
+            population = next_generation(env, population, fitness_scores, args.mutation_rate, selection, args.elites,
+                                         local_search)
+
+            if args.checkpoint and (generation % args.checkpoint_every == 0 or generation == args.generations):
+                save_checkpoint(args.checkpoint, env, args.seed, generation, [(population, random.getstate())],
+                                best_schedule, max_fitness)
+
+    if initial is not None and initial_fitness > max_fitness:
+        best_schedule, max_fitness = initial, initial_fitness  # Islands may breed the starting schedule away
+    elapsed = time.perf_counter() - start
+    generations = generation - first_generation + 1
+    print(f"Best fitness {max_fitness:.2f} after {generation} generations in {elapsed:.2f} s "
+          f"({generations / elapsed:.0f} generations/s)")
+    if upper_bound is not None:
+        print(f"Upper bound {upper_bound:.2f}, at most {upper_bound - max_fitness:.2f} above the best schedule")
+    if cache is not None:
+        print(f"Fitness cache: {cache.stats()}")
+    if local_search is not None and args.islands == 1:
+        print(f"Local search: {local_search.improvements} of {local_search.moves} moves kept")
+    if log:
+        log.close()
+
+    if visualizer:
+        # Always show the best schedule found, then keep it up until the window is closed
+        visualizer(generation, best_schedule, max_fitness, max_fitness, force=True)
+        visualizer.wait_until_closed()
+        visualizer.close()
 
 if __name__ == "__main__":
     main()
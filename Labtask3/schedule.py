@@ -0,0 +1,54 @@
+from array import array
+
+GENE_TYPECODE = "H"  # Unsigned 16-bit slot and student indices
+
+
+class Schedule:
+    """Compact genome: the slot and student assigned to each class, by class index.
+
+    Genes live in two ``array('H')`` buffers instead of one dict per class,
+    and nothing is shared between schedules: ``copy`` and crossover build
+    new buffers, so mutating a child never touches its parents.
+    """
+
+    __slots__ = ("slots", "students")
+
+    def __init__(self, slots, students):
+        self.slots = array(GENE_TYPECODE, slots)
+        self.students = array(GENE_TYPECODE, students)
+
+    @classmethod
+    def from_bytes(cls, slots, students):
+        """Build a schedule straight from raw 16-bit gene buffers."""
+        schedule = cls.__new__(cls)
+        schedule.slots = array(GENE_TYPECODE)
+        schedule.slots.frombytes(slots)
+        schedule.students = array(GENE_TYPECODE)
+        schedule.students.frombytes(students)
+        return schedule
+
+    def __len__(self):
+        return len(self.slots)
+
+    def __iter__(self):
+        """Yield (class_index, slot, student) for every class."""
+        return zip(range(len(self.slots)), self.slots, self.students)
+
+    def __eq__(self, other):
+        return isinstance(other, Schedule) and self.slots == other.slots and self.students == other.students
+
+    def __repr__(self):
+        return f"Schedule(slots={self.slots.tolist()}, students={self.students.tolist()})"
+
+    def key(self):
+        """Return the genes as one compact, hashable bytes object."""
+        return self.slots.tobytes() + self.students.tobytes()
+
+    def copy(self):
+        """Return an independent copy of this schedule."""
+        return Schedule(self.slots, self.students)
+
+    def assign(self, class_index, slot, student):
+        """Change the slot and student of one class in place."""
+        self.slots[class_index] = slot
+        self.students[class_index] = student
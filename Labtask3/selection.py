@@ -0,0 +1,86 @@
+from functools import partial
+import numpy as np
+
+TOURNAMENT_SIZE = 3  # Individuals drawn per tournament
+
+
+def selection_weights(fitness_scores):
+    """Turn fitness scores into non-negative roulette weights.
+
+    Penalized objectives can go negative, so scores are shifted until the
+    weakest still has a small chance. When every weight is zero (e.g. all
+    fitnesses are 0) each individual is equally likely instead.
+    """
+    weights = np.asarray(fitness_scores, dtype=np.float64)
+    lowest = weights.min()
+    if lowest < 0:
+        weights = weights - lowest + 1e-9
+    if not weights.sum() > 0:
+        return np.ones(len(weights))
+    return weights
+
+
+def alias_table(weights):
+    """Build Vose's alias table for drawing indices in proportion to weights in O(1) each."""
+    count = len(weights)
+    scaled = (np.asarray(weights, dtype=np.float64) * (count / np.sum(weights))).tolist()
+    probability = [1.0] * count
+    alias = list(range(count))
+    small = [index for index, weight in enumerate(scaled) if weight < 1]
+    large = [index for index, weight in enumerate(scaled) if weight >= 1]
+    while small and large:
+        low, high = small.pop(), large[-1]
+        probability[low], alias[low] = scaled[low], high
+        # The large column donates what the small one is missing
+        scaled[high] -= 1 - scaled[low]
+        if scaled[high] < 1:
+            small.append(large.pop())
+    # Whatever is left is 1 up to rounding and keeps probability 1
+    return np.array(probability), np.array(alias, dtype=np.intp)
+
+
+def draw_alias(table, count, rng):
+    """Draw count indices from an alias table in one batch."""
+    probability, alias = table
+    columns = rng.integers(len(probability), size=count)
+    return np.where(rng.random(count) < probability[columns], columns, alias[columns])
+
+
+def roulette_selection(fitness_scores, count, rng):
+    """Fitness-proportionate selection: one alias table per generation, count draws in a batch."""
+    return draw_alias(alias_table(selection_weights(fitness_scores)), count, rng)
+
+
+def rank_selection(fitness_scores, count, rng):
+    """Linear rank selection: the i-th worst individual is drawn with weight i + 1."""
+    ranks = np.argsort(np.argsort(fitness_scores, kind="stable"), kind="stable")
+    return draw_alias(alias_table(ranks + 1.0), count, rng)
+
+
+def tournament_selection(fitness_scores, count, rng, size=TOURNAMENT_SIZE):
+    """Pick the fittest of size uniformly drawn individuals, count times at once."""
+    scores = np.asarray(fitness_scores, dtype=np.float64)
+    entrants = rng.integers(len(scores), size=(count, size))
+    return entrants[np.arange(count), scores[entrants].argmax(axis=1)]
+
+
+SELECTION_STRATEGIES = {
+    "roulette": roulette_selection,
+    "rank": rank_selection,
+    "tournament": tournament_selection,
+}
+
+
+def make_selection(name, tournament_size=TOURNAMENT_SIZE):
+    """Return the selection strategy called name; the result can be sent to worker processes."""
+    if name == "tournament":
+        return partial(tournament_selection, size=tournament_size)
+    return SELECTION_STRATEGIES[name]
+
+
+def elite_indices(fitness_scores, count):
+    """Return the indices of the count fittest individuals, best first."""
+    if count <= 0:
+        return []
+    order = np.argsort(-np.asarray(fitness_scores, dtype=np.float64), kind="stable")
+    return order[:count].tolist()
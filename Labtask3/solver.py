@@ -0,0 +1,240 @@
+import math
+from collections import Counter
+import numpy as np
+from ga import evaluate_fitness
+from memetic import LocalSearch
+from schedule import Schedule
+
+BOUND_ITERATIONS = 500  # Most price updates when bounding instances the exact solver cannot handle
+POLISH_STEPS = 20  # Local-search moves per class applied to the greedy schedule
+
+
+def hungarian(costs):
+    """Solve the rectangular assignment problem exactly (Hungarian method with potentials).
+
+    costs is a (rows, columns) array with rows <= columns. Returns the
+    column assigned to each row, minimizing the total cost. Runs in
+    O(rows^2 * columns), with every column update done as one NumPy
+    operation.
+    """
+    costs = np.asarray(costs, dtype=np.float64)
+    rows, columns = costs.shape
+    if rows > columns:
+        raise ValueError("The assignment needs at least as many columns as rows")
+    # 1-based as in the textbook formulation; column 0 is the virtual start of each augmenting path
+    row_potential = np.zeros(rows + 1)
+    column_potential = np.zeros(columns + 1)
+    owner = np.zeros(columns + 1, dtype=np.intp)  # Row matched to each column, 0 if none
+    way = np.zeros(columns + 1, dtype=np.intp)  # Previous column on the shortest augmenting path
+    for row in range(1, rows + 1):
+        owner[0] = row
+        column = 0
+        slack = np.full(columns + 1, math.inf)
+        used = np.zeros(columns + 1, dtype=bool)
+        while owner[column]:
+            used[column] = True
+            current = owner[column]
+            free = ~used
+            free[0] = False
+            reduced = costs[current - 1] - row_potential[current] - column_potential[1:]
+            better = free[1:] & (reduced < slack[1:])
+            slack[1:][better] = reduced[better]
+            way[1:][better] = column
+            candidates = np.flatnonzero(free)
+            nearest = candidates[np.argmin(slack[candidates])]
+            delta = slack[nearest]
+            row_potential[owner[used]] += delta
+            column_potential[used] -= delta
+            slack[free] -= delta
+            column = nearest
+        # Flip the augmenting path back to the start
+        while column:
+            previous = way[column]
+            owner[column] = owner[previous]
+            column = previous
+    assignment = np.empty(rows, dtype=np.intp)
+    matched = np.flatnonzero(owner[1:]) + 1
+    assignment[owner[matched] - 1] = matched - 1
+    return assignment
+
+
+def exact_blocker(env, objective=None):
+    """Return why the assignment model cannot solve this instance exactly, or None if it can."""
+    if not env.available_genes:
+        return "no student is available in any slot"
+    if objective is not None and any(duration > 1 for duration in objective.durations):
+        return "classes longer than one slot occupy several cells at once"
+    return None
+
+
+def assignment_costs(priorities, preferences, clash_penalty):
+    """Build the (classes, cells + classes) cost matrix of single-slot classes for the Hungarian method.
+
+    Column c < cells puts a class first into cell c (preferences sorted
+    from most preferred down); every further column is an "extra" slot in
+    the most preferred cell, which pays one clash penalty.
+    """
+    values = np.outer(priorities, preferences)  # Reward of each class as the first in each cell
+    extra = np.repeat(clash_penalty - values[:, :1], len(priorities), axis=1)
+    return np.concatenate([-values, extra], axis=1)
+
+
+def ranked_split(priorities, preferences, clash_penalty):
+    """Choose the cell of every class by dynamic programming over classes sorted by priority.
+
+    Given which classes are first in a cell, the best placement pairs them
+    in priority order with the cells in preference order; every other
+    class is an extra in the most preferred cell. best[k] is the best
+    total with k first classes so far, so each class is one vectorized
+    step and the whole split is O(classes^2).
+    """
+    count = len(priorities)
+    cell_values = np.full(count, -math.inf)
+    cell_values[:len(preferences)] = preferences[:count]
+    order = np.argsort(-np.asarray(priorities), kind="stable")
+    best = np.full(count + 1, -math.inf)
+    best[0] = 0.0
+    takes_cell = np.zeros((count, count + 1), dtype=bool)  # Whether the class is first in its cell, per count
+    for step, class_index in enumerate(order):
+        priority = priorities[class_index]
+        as_extra = best + (priority * preferences[0] - clash_penalty)
+        as_first = np.full(count + 1, -math.inf)
+        as_first[1:] = best[:-1] + priority * cell_values
+        takes_cell[step] = as_first > as_extra
+        best = np.where(takes_cell[step], as_first, as_extra)
+    cells = np.zeros(count, dtype=np.intp)
+    taken = int(np.argmax(best))
+    for step in range(count - 1, -1, -1):
+        if takes_cell[step, taken]:
+            taken -= 1
+            cells[order[step]] = taken
+    return cells
+
+
+def solve_exact(env, objective=None, method="dp"):
+    """Return the optimal (schedule, fitness) over available (slot, student) genes, or None.
+
+    With the preference fitness classes do not interact, so each takes
+    the available cell its student prefers most. With a
+    ConstraintObjective and single-slot classes, the first class in a
+    cell is free and every further one pays the clash penalty. Extra
+    classes may as well join the most preferred cell. A class is worth
+    priority times preference, so first classes only ever use the most
+    preferred cells, as many as there are classes. method "hungarian"
+    solves the assignment_costs matrix, and "dp" (much faster) uses
+    ranked_split; both are exact. Returns None when exact_blocker finds
+    a constraint the model cannot express; callers then fall back to the
+    GA.
+    """
+    if exact_blocker(env, objective) is not None:
+        return None
+    genes = env.gene_array.astype(np.intp)
+    preferences = env.preferences[genes[:, 1], genes[:, 0]]
+    # Most preferred cells first; ties keep the gene order
+    genes = genes[np.argsort(-preferences, kind="stable")[:env.num_classes]]
+    slots, students = genes[:, 0], genes[:, 1]
+    preferences = env.preferences[students, slots]
+    if objective is None:
+        schedule = Schedule([slots[0]] * env.num_classes, [students[0]] * env.num_classes)
+        return schedule, evaluate_fitness(env, schedule)
+
+    priorities = np.array(objective.priorities, dtype=np.float64)
+    if method == "hungarian":
+        columns = hungarian(assignment_costs(priorities, preferences, objective.clash_penalty))
+        cells = np.where(columns < len(preferences), columns, 0)  # Extra classes join the most preferred cell
+    else:
+        cells = ranked_split(priorities, preferences, objective.clash_penalty)
+    schedule = Schedule(slots[cells].tolist(), students[cells].tolist())
+    return schedule, objective.evaluate(schedule)
+
+
+def placement_table(env, objective, duration):
+    """Describe every available start gene for classes of one duration, as NumPy arrays.
+
+    Returns (cells, preferences, penalties). cells[g] lists the (student,
+    slot) cell ids the class occupies, with env.num_students *
+    env.num_slots standing in for slots past the end of the day. A class
+    of priority p starting at gene g scores p * preferences[g] -
+    penalties[g], as in ConstraintObjective.gene_score.
+    """
+    genes = env.gene_array.astype(np.intp)
+    slots, students = genes[:, :1], genes[:, 1:]
+    occupied = slots + np.arange(duration)
+    inside = occupied < env.num_slots
+    clipped = np.minimum(occupied, env.num_slots - 1)
+    available = np.array(objective.available, dtype=bool)[students, clipped]
+    preferences = np.where(inside, env.preferences[students, clipped], 0).sum(axis=1)
+    penalties = (objective.unavailable_penalty * (inside & ~available).sum(axis=1)
+                 + objective.overflow_penalty * (~inside).sum(axis=1))
+    cells = np.where(inside, students * env.num_slots + clipped, env.num_students * env.num_slots)
+    return cells, preferences, penalties
+
+
+def greedy_schedule(env, objective):
+    """Place classes one at a time, each in the available start gene that adds the most fitness so far.
+
+    Classes go in order of priority times duration, so the ones worth
+    most pick first.
+    """
+    tables = {duration: placement_table(env, objective, duration) for duration in set(objective.durations)}
+    occupied = np.zeros(env.num_students * env.num_slots + 1, dtype=bool)  # The last entry stays False
+    genes = env.gene_array
+    slots, students = [0] * env.num_classes, [0] * env.num_classes
+    order = sorted(range(env.num_classes), key=lambda index: -objective.priorities[index] * objective.durations[index])
+    for class_index in order:
+        cells, preferences, penalties = tables[objective.durations[class_index]]
+        clashes = occupied[cells].sum(axis=1)
+        values = objective.priorities[class_index] * preferences - penalties - objective.clash_penalty * clashes
+        gene = int(np.argmax(values))
+        occupied[cells[gene]] = True
+        occupied[-1] = False  # Slots past the end of the day never clash
+        slots[class_index], students[class_index] = int(genes[gene, 0]), int(genes[gene, 1])
+    return Schedule(slots, students)
+
+
+def lagrangian_bound(env, objective, target, iterations=BOUND_ITERATIONS):
+    """Return an upper bound on the fitness of any schedule over the available (slot, student) genes.
+
+    Every cell gets a price between 0 and the clash penalty. n classes in
+    a cell lose at most the price times (1 - n) to clashes, so the bound
+    splits into the total price plus each class's best placement at those
+    prices. Classes with the same duration and priority share their best
+    placement. Prices follow subgradient steps sized by how far the bound
+    is above target, the fitness of a known schedule. Every iteration
+    gives a valid bound and the smallest is returned. It meets target
+    when that schedule is optimal.
+    """
+    size = env.num_students * env.num_slots
+    groups = Counter(zip(objective.durations, objective.priorities))
+    tables = {duration: placement_table(env, objective, duration) for duration, _ in groups}
+    prices = np.zeros(size + 1)  # The last entry stands for slots past the end of the day and stays 0
+    best = math.inf
+    for _ in range(iterations):
+        bound = prices[:-1].sum()
+        usage = np.zeros(size + 1)
+        for (duration, priority), count in groups.items():
+            cells, preferences, penalties = tables[duration]
+            values = priority * preferences - penalties - prices[cells].sum(axis=1)
+            gene = int(np.argmax(values))
+            bound += count * values[gene]
+            np.add.at(usage, cells[gene], count)
+        best = min(best, bound)
+        gradient = 1 - usage[:-1]
+        norm = gradient @ gradient
+        if best - target <= 1e-9 or norm == 0:
+            break
+        prices[:-1] = np.clip(prices[:-1] - (bound - target) / norm * gradient, 0, objective.clash_penalty)
+    return best
+
+
+def solve_bounded(env, objective, steps=POLISH_STEPS):
+    """Return (schedule, fitness, upper bound) under a ConstraintObjective, including multi-slot classes.
+
+    The schedule is greedy_schedule polished by steps local-search moves
+    per class. The bound minus fitness is the most the schedule can be
+    short of the optimum.
+    """
+    schedule = greedy_schedule(env, objective)
+    LocalSearch(env, objective, steps=steps * env.num_classes).climb(schedule)
+    fitness = objective.evaluate(schedule)
+    return schedule, fitness, lagrangian_bound(env, objective, fitness)
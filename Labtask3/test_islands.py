@@ -0,0 +1,31 @@
+import random
+from environment import Environment
+from islands import run_islands
+from objective import ConstraintObjective
+
+
+def make_instance():
+    random.seed(0)
+    env = Environment(4, 6, 12)
+    return env, ConstraintObjective(env)
+
+
+def evolve(env, objective, seed):
+    return run_islands(env, 2, 8, 4, 0.1, 2, 1, workers=1, seed=seed, progress=None, objective=objective)
+
+
+def test_run_islands_leaves_the_callers_random_state_alone():
+    env, objective = make_instance()
+    random.seed(123)
+    state = random.getstate()
+    evolve(env, objective, seed=7)
+    assert random.getstate() == state
+
+
+def test_seeded_islands_are_reproducible():
+    env, objective = make_instance()
+    first_schedule, first_fitness = evolve(env, objective, seed=7)
+    random.seed(99)  # The caller's state has no say in a seeded run
+    second_schedule, second_fitness = evolve(env, objective, seed=7)
+    assert first_fitness == second_fitness
+    assert list(first_schedule) == list(second_schedule)
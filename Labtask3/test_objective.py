@@ -0,0 +1,65 @@
+import math
+import random
+import pytest
+from environment import Environment
+from ga import encode_population, initialize_population
+from objective import ConstraintObjective
+
+# (slots, students, classes): tiny grids force clashes, larger ones exercise the index arithmetic
+SIZES = [(3, 2, 6), (8, 20, 50), (8, 5, 120)]
+SEEDS = range(5)
+
+
+def make_objective(seed, size, **penalties):
+    random.seed(seed)
+    env = Environment(*size)
+    return env, ConstraintObjective(env, **penalties)
+
+
+def random_move(env, num_classes):
+    """Any class to any slot and student, so clashes, unavailable cells and overflow all occur."""
+    return random.randrange(num_classes), random.randrange(env.num_slots), random.randrange(env.num_students)
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+@pytest.mark.parametrize("size", SIZES)
+def test_evaluate_population_matches_evaluate(seed, size):
+    env, objective = make_objective(seed, size)
+    population = initialize_population(env, 30)
+    scores = objective.evaluate_population(*encode_population(population))
+    for score, schedule in zip(scores.tolist(), population):
+        assert math.isclose(score, objective.evaluate(schedule), abs_tol=1e-9)
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+@pytest.mark.parametrize("size", SIZES)
+@pytest.mark.parametrize("penalties", [{}, {"clash_penalty": 0.5, "unavailable_penalty": 0, "overflow_penalty": 9}])
+def test_delta_matches_full_evaluation(seed, size, penalties):
+    env, objective = make_objective(seed, size, **penalties)
+    state = objective.state(initialize_population(env, 1)[0])
+    for _ in range(300):
+        move = random_move(env, env.num_classes)
+        before = objective.evaluate(state.schedule)
+        delta = state.delta(*move)
+        state.apply(*move)
+        after = objective.evaluate(state.schedule)
+        assert math.isclose(before + delta, after, abs_tol=1e-9)
+        assert math.isclose(state.fitness, after, abs_tol=1e-9)
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_apply_keeps_occupancy_consistent(seed):
+    env, objective = make_objective(seed, (4, 3, 20))
+    state = objective.state(initialize_population(env, 1)[0])
+    for _ in range(200):
+        state.apply(*random_move(env, env.num_classes))
+    assert state.occupancy == objective.state(state.schedule.copy()).occupancy
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_delta_of_staying_put_is_zero(seed):
+    env, objective = make_objective(seed, (3, 2, 10))
+    schedule = initialize_population(env, 1)[0]
+    state = objective.state(schedule)
+    for class_index, slot, student in schedule:
+        assert state.delta(class_index, slot, student) == pytest.approx(0, abs=1e-9)
@@ -0,0 +1,61 @@
+import itertools
+import math
+import random
+import pytest
+from environment import Environment
+from objective import ConstraintObjective
+from schedule import Schedule
+from solver import placement_table, solve_bounded, solve_exact
+
+SEEDS = range(40)
+
+
+def make_instance(seed, single_slot=False):
+    """A tiny seeded instance, small enough to enumerate every schedule over the available genes."""
+    random.seed(seed)
+    env = Environment(3, 2, random.randint(1, 4))
+    if single_slot:
+        for cls in env.classes:
+            cls["duration"] = 1
+    return env, ConstraintObjective(env, clash_penalty=random.choice([0.5, 5.0]))
+
+
+def brute_force(env, objective):
+    return max(objective.evaluate(Schedule([slot for slot, _ in genes], [student for _, student in genes]))
+               for genes in itertools.product(env.available_genes, repeat=env.num_classes))
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+@pytest.mark.parametrize("method", ["dp", "hungarian"])
+def test_exact_matches_brute_force(seed, method):
+    env, objective = make_instance(seed, single_slot=True)
+    if not env.available_genes:
+        pytest.skip("no available genes")
+    _, fitness = solve_exact(env, objective, method)
+    assert math.isclose(fitness, brute_force(env, objective), abs_tol=1e-9)
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_bound_brackets_the_optimum(seed):
+    env, objective = make_instance(seed)
+    if not env.available_genes:
+        pytest.skip("no available genes")
+    schedule, fitness, bound = solve_bounded(env, objective)
+    optimum = brute_force(env, objective)
+    assert math.isclose(fitness, objective.evaluate(schedule), abs_tol=1e-9)
+    assert fitness <= optimum + 1e-9 <= bound + 2e-9
+
+
+@pytest.mark.parametrize("duration", [1, 2])
+def test_placement_table_matches_gene_score(duration):
+    random.seed(0)
+    env = Environment(6, 4, 10)
+    objective = ConstraintObjective(env)
+    _, preferences, penalties = placement_table(env, objective, duration)
+    for class_index in range(env.num_classes):
+        if objective.durations[class_index] != duration:
+            continue
+        priority = objective.priorities[class_index]
+        for gene, (slot, student) in enumerate(env.available_genes):
+            assert math.isclose(priority * preferences[gene] - penalties[gene],
+                                objective.gene_score(class_index, slot, student))
@@ -0,0 +1,121 @@
+import time
+import pygame
+
+# Window and grid layout
+WINDOW_SIZE = (1100, 700)
+CELL_WIDTH = 60
+CELL_HEIGHT = 60
+MARGIN = 0
+X_OFFSET = 200
+Y_OFFSET = 150
+BACKGROUND_COLOR = (200, 200, 200)
+TEXT_COLOR = (0, 0, 0)
+
+
+class ScheduleVisualizer:
+    """Optional observer that draws the best schedule of a generation.
+
+    The display, font and everything static (slot headers, grid and
+    preference values) are created once; each class label is rendered once
+    and cached. Calling the visualizer only draws when the generation is a
+    multiple of ``every`` and at least 1/``fps`` seconds have passed since
+    the last frame, so the evolution loop never waits on rendering.
+    """
+
+    def __init__(self, env, every=1, fps=None):
+        self.env = env
+        self.every = max(1, every)
+        self.min_interval = 1 / fps if fps else 0
+        self.last_frame = float("-inf")
+        self.closed = False  # Set when the user closes the window
+
+        pygame.init()
+        self.screen = pygame.display.set_mode(WINDOW_SIZE)
+        pygame.display.set_caption("Task Assignment Visualization")
+        self.font = pygame.font.Font(None, 28)
+        self.background = self.render_background()
+        self.labels = {}  # class index -> pre-rendered "P1 2h" surface
+
+    def render_background(self):
+        """Pre-render the slot headers and the preference grid."""
+        background = pygame.Surface(WINDOW_SIZE)
+        background.fill(BACKGROUND_COLOR)
+
+        # Draw slot headers
+        for slot in range(self.env.num_slots):
+            header_text = self.font.render(f"Slot {slot+1}", True, TEXT_COLOR)
+            background.blit(header_text, (X_OFFSET + slot * (CELL_WIDTH + MARGIN), Y_OFFSET - 40))
+
+        # Draw grid and preferences
+        for student_id, student in enumerate(self.env.students):
+            for slot in range(self.env.num_slots):
+                rect = self.cell_rect(slot, student_id)
+                pygame.draw.rect(background, (255, 255, 255), rect)
+                pygame.draw.rect(background, (0, 0, 0), rect, 1)
+
+                # Display preferences
+                preference = student["preferences"][slot]
+                text = self.font.render(f"{preference:.2f}", True, TEXT_COLOR)
+                background.blit(text, (rect.x + 5, rect.y + 5))
+        return background
+
+    def cell_rect(self, slot, student):
+        return pygame.Rect(X_OFFSET + slot * (CELL_WIDTH + MARGIN), Y_OFFSET + student * (CELL_HEIGHT + MARGIN),
+                           CELL_WIDTH, CELL_HEIGHT)
+
+    def label(self, class_index):
+        """Return the cached label surface of a class."""
+        surface = self.labels.get(class_index)
+        if surface is None:
+            cls = self.env.classes[class_index]
+            surface = self.font.render(f"{cls['id']} {cls['duration']}h", True, (255, 255, 255))
+            self.labels[class_index] = surface
+        return surface
+
+    def __call__(self, generation, schedule, fitness, max_fitness, force=False):
+        """Draw a generation if it is due; returns True when a frame was drawn."""
+        self.handle_events()
+        now = time.perf_counter()
+        if self.closed or not force and (generation % self.every or now - self.last_frame < self.min_interval):
+            return False
+        self.last_frame = now
+        self.draw(generation, schedule, fitness, max_fitness)
+        return True
+
+    def draw(self, generation, schedule, fitness, max_fitness):
+        """Draw one frame of the schedule on top of the cached background."""
+        self.screen.blit(self.background, (0, 0))
+
+        # Display generation and fitness
+        gen_text = self.font.render(f"Generation: {generation}", True, TEXT_COLOR)
+        fitness_text = self.font.render(f"Best Fitness (Current): {fitness:.2f}", True, TEXT_COLOR)
+        max_fitness_text = self.font.render(f"Max Fitness Achieved: {max_fitness:.2f}", True, TEXT_COLOR)
+        self.screen.blit(gen_text, (800, 10))
+        self.screen.blit(fitness_text, (800, 40))
+        self.screen.blit(max_fitness_text, (800, 70))
+
+        # Fill grid with schedule
+        for class_index, slot, student in schedule:
+            rect = self.cell_rect(slot, student)
+            color = (0, 0, 255) if self.env.classes[class_index]["priority"] >= 4 else (180, 180, 180)
+            pygame.draw.rect(self.screen, color, rect)
+            pygame.draw.rect(self.screen, (0, 0, 0), rect, 2)
+            self.screen.blit(self.label(class_index), (rect.x + 5, rect.y + 25))
+
+        pygame.display.flip()
+
+    def handle_events(self):
+        """Keep the window responsive and notice when it is closed."""
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                self.closed = True
+
+    def wait_until_closed(self):
+        """Keep the last frame on screen until the window is closed."""
+        clock = pygame.time.Clock()
+        while not self.closed:
+            self.handle_events()
+            clock.tick(30)
+
+    def close(self):
+        pygame.quit()
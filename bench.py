@@ -0,0 +1,277 @@
+# bench.py
+"""Seeded benchmarks of all three labs, with JSON output and baseline comparison.
+
+Every lab runs in its own subprocess with the lab directory as the
+working directory, since the labs share module names (agent.py,
+environment.py). Timings are only comparable on the same, otherwise idle
+machine, so save the baseline where the comparison will run. Examples:
+
+    python bench.py --output baseline.json
+    python bench.py --baseline baseline.json      # exits with 1 on a regression
+    python bench.py --quick --labs LabTask2 --profile profiles --tracemalloc
+"""
+import os
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")  # Never open a window
+
+import argparse
+import cProfile
+import json
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+LABS = ["LabTask1", "LabTask2", "Labtask3"]
+TOLERANCE = 0.25  # Slowdown against the baseline that counts as a regression
+MAX_LAYOUTS = 100  # Seeded barrier layouts tried before a LabTask2 scenario gives up on connecting its goals
+MIN_TIME = 0.05  # Short scenarios run again until a repeat has taken this long, so timings stay stable
+
+
+def lab1_scenarios(args):
+    """Agent moves per second of the batched world, by agent count."""
+    import numpy as np
+    from environment import Environment
+    from world import DIRECTIONS, AgentWorld
+
+    for count in [1000, 100000] if args.quick else [1, 1000, 100000, 1000000]:
+        ticks = 20
+
+        def prepare(count=count, ticks=ticks):
+            environment = Environment(600, 400)
+            world = AgentWorld(environment, count)
+            directions = np.random.default_rng(args.seed).integers(len(DIRECTIONS), size=(ticks, count))
+            return lambda: [world.move(directions[tick]) for tick in range(ticks)]
+
+        yield "movement", {"agents": count}, count * ticks, "agent moves", prepare
+
+
+def lab2_scenarios(args):
+    """Corner-to-corner UCS and A*, and the nearest of ten tasks, by grid size and barrier density.
+
+    Barrier layouts that cut the corners apart are drawn again from the
+    same seeded stream, so every query searches a real path.
+    """
+    import search as grid_search
+    from agent import Agent
+    from environment import Environment
+
+    def connected_environment(size, density, num_tasks):
+        random.seed(args.seed)
+        for _ in range(MAX_LAYOUTS):
+            environment = Environment(size, size, 1, num_tasks=num_tasks, num_barriers=int(size * size * density))
+            environment.barrier_locations.discard((0, 0))
+            environment.barrier_locations.discard((size - 1, size - 1))
+            distances, _ = grid_search.distance_field(environment, (0, 0))
+            reachable = [grid_search.cell_id(cell, size) for cell in [(size - 1, size - 1), *environment.task_locations]]
+            if all(distances[cell] != grid_search.UNVISITED for cell in reachable):
+                return environment
+        raise ValueError(f"No {size}x{size} layout at barrier density {density} connected every goal to the start")
+
+    def search(size, density, query, algorithm="UCS", num_tasks=0):
+        def prepare():
+            agent = Agent(connected_environment(size, density, num_tasks), 1, algorithm=algorithm)
+            agent.cache_paths = False  # Every repeat must search
+
+            def run():
+                path = query(agent)
+                return {"found": path is not None, "nodes_expanded": agent.nodes_expanded}
+
+            return run
+        return prepare
+
+    def nearest_task(agent):
+        return agent.find_path_to_nearest(agent.environment.task_locations.keys())
+
+    for size in [50, 200] if args.quick else [50, 200, 500]:
+        for density in [0.1, 0.3]:
+            params = {"size": size, "density": density}
+            corner = (size - 1, size - 1)
+            yield "ucs_path_to", params, 1, "searches", \
+                search(size, density, lambda agent, corner=corner: agent.ucs_path_to(corner))
+            yield "astar_path_to", params, 1, "searches", \
+                search(size, density, lambda agent, corner=corner: agent.astar_path_to(corner))
+            for algorithm in ["UCS", "A*"]:
+                yield "find_nearest_task", dict(params, algorithm=algorithm, tasks=10), 1, "searches", \
+                    search(size, density, nearest_task, algorithm, num_tasks=10)
+
+
+def lab3_scenarios(args):
+    """GA generations per second, by population size and objective."""
+    from environment import Environment
+    from ga import initialize_population, next_generation, score_population
+    from objective import ConstraintObjective
+
+    generations = 5
+    for population_size in [50, 500] if args.quick else [50, 500, 5000]:
+        for objective_name in ["preference", "constraints"]:
+
+            def prepare(population_size=population_size, objective_name=objective_name):
+                random.seed(args.seed)
+                env = Environment(8, 30, 40)
+                objective = ConstraintObjective(env) if objective_name == "constraints" else None
+                state = {"population": initialize_population(env, population_size)}
+
+                def run():
+                    for _ in range(generations):
+                        scores = score_population(env, state["population"], objective)
+                        state["population"] = next_generation(env, state["population"], scores, 0.05, elites=2)
+
+                return run
+
+            yield "generations", {"population": population_size, "objective": objective_name}, generations, \
+                "generations", prepare
+
+
+SCENARIOS = {"LabTask1": lab1_scenarios, "LabTask2": lab2_scenarios, "Labtask3": lab3_scenarios}
+
+
+def scenario_key(lab, name, params):
+    return f"{lab}/{name}/" + ",".join(f"{key}={value}" for key, value in params.items())
+
+
+def measure(lab, name, params, work, unit, prepare, args):
+    """Time one scenario (fresh, seeded state for every repeat) and run the optional profiling hooks.
+
+    seconds is the fastest repeat, per run of the scenario. A run may
+    return a dict of stats, such as nodes_expanded, that is added to the
+    result; a run reporting found False is rejected, since timing a query
+    that finds nothing says little.
+    """
+    key = scenario_key(lab, name, params)
+    times = []
+    for _ in range(args.repeats):
+        run = prepare()
+        runs, elapsed = 0, 0.0
+        while runs == 0 or elapsed < MIN_TIME:
+            start = time.perf_counter()
+            stats = run()
+            elapsed += time.perf_counter() - start
+            runs += 1
+        times.append(elapsed / runs)
+    stats = stats if isinstance(stats, dict) else {}
+    if stats.get("found") is False:
+        raise RuntimeError(f"{key}: the query found no path, so the scenario measures nothing")
+    result = {"key": key, "lab": lab, "scenario": name, "params": params, "seconds": min(times),
+              "median": statistics.median(times), "rate": work / min(times), "unit": f"{unit}/s", **stats}
+    if args.tracemalloc:
+        run = prepare()
+        tracemalloc.start()
+        run()
+        _, result["peak_bytes"] = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    if args.profile:
+        run = prepare()
+        profiler = cProfile.Profile()
+        profiler.runcall(run)
+        filename = key.replace("/", "_").replace(",", "_").replace("=", "-").replace("*", "star") + ".prof"
+        profiler.dump_stats(os.path.join(args.profile, filename))
+    return result
+
+
+def run_worker(args):
+    """Run the scenarios of one lab in this process and print the results as JSON."""
+    sys.path.insert(0, os.getcwd())  # The lab's modules, not the ones next to this file
+    results = []
+    for name, params, work, unit, prepare in SCENARIOS[args.worker](args):
+        if args.filter and args.filter not in scenario_key(args.worker, name, params):
+            continue
+        results.append(measure(args.worker, name, params, work, unit, prepare, args))
+        print(f"  {results[-1]['key']}: {results[-1]['seconds']:.4f} s", file=sys.stderr)
+    json.dump(results, sys.stdout)
+
+
+def run_lab(lab, args):
+    """Run one lab's scenarios in a subprocess and return its results."""
+    command = [sys.executable, os.path.abspath(__file__), "--worker", lab, "--repeats", str(args.repeats),
+               "--seed", str(args.seed)]
+    if args.quick:
+        command.append("--quick")
+    if args.tracemalloc:
+        command.append("--tracemalloc")
+    if args.profile:
+        command += ["--profile", os.path.abspath(args.profile)]
+    if args.filter:
+        command += ["--filter", args.filter]
+    print(f"{lab}:", file=sys.stderr)
+    completed = subprocess.run(command, cwd=os.path.join(ROOT, lab), stdout=subprocess.PIPE, check=True)
+    return json.loads(completed.stdout)
+
+
+def compare(results, baseline, tolerance):
+    """Print each scenario against the baseline and return the keys that got slower than tolerance allows."""
+    before = {result["key"]: result for result in baseline["results"]}
+    regressions = []
+    print(f"{'scenario':<60} {'baseline (s)':>12} {'now (s)':>9} {'change':>8}")
+    for result in results:
+        old = before.get(result["key"])
+        if old is None:
+            print(f"{result['key']:<60} {'-':>12} {result['seconds']:>9.4f} {'new':>8}")
+            continue
+        change = result["seconds"] / old["seconds"] - 1
+        flag = ""
+        if change > tolerance:
+            regressions.append(result["key"])
+            flag = "  REGRESSION"
+        print(f"{result['key']:<60} {old['seconds']:>12.4f} {result['seconds']:>9.4f} {change:>+8.1%}{flag}")
+    missing = before.keys() - {result["key"] for result in results}
+    if missing:
+        print(f"{len(missing)} baseline scenarios were not run")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark all labs without opening a window.")
+    parser.add_argument("--labs", nargs="+", choices=LABS, default=LABS)
+    parser.add_argument("--quick", action="store_true", help="smaller sizes, for a fast check")
+    parser.add_argument("--repeats", type=int, default=3, help="timed runs per scenario; the fastest counts")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--filter", help="only run scenarios whose key contains this text")
+    parser.add_argument("--output", help="write the results as JSON, e.g. to save a baseline")
+    parser.add_argument("--baseline", help="JSON results to compare against")
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE,
+                        help="slowdown that counts as a regression (0.25 is 25%% slower)")
+    parser.add_argument("--profile", metavar="DIR", help="write a cProfile .prof file per scenario to DIR")
+    parser.add_argument("--tracemalloc", action="store_true", help="also record peak traced memory per scenario")
+    parser.add_argument("--worker", choices=LABS, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        run_worker(args)
+        return
+    if args.profile:
+        os.makedirs(args.profile, exist_ok=True)
+    results = []
+    for lab in args.labs:
+        results.extend(run_lab(lab, args))
+    report = {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "seed": args.seed,
+        "quick": args.quick,
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=2)
+    if args.baseline:
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print(f"{len(regressions)} regressions beyond {args.tolerance:.0%}")
+            sys.exit(1)
+    else:
+        for result in results:
+            peak = f" {result['peak_bytes'] / 1e6:.1f} MB peak" if "peak_bytes" in result else ""
+            nodes = f" {result['nodes_expanded']} nodes" if "nodes_expanded" in result else ""
+            print(f"{result['key']:<60} {result['seconds']:>9.4f} s {result['rate']:>12.0f} {result['unit']}{nodes}{peak}")
+
+
+if __name__ == "__main__":
+    main()